@@ -5,84 +5,316 @@
 
 import os
 import math
-import random
+import time
+import unicodedata
+import itertools
+from collections import deque
 import numpy as np
 import pandas as pd
-from faker import Faker
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from aurora import kpis, pickup
+from aurora.carga import carregar, MOTORES
+from aurora.amostragem import Amostrador
+from aurora.cubos import Cubo, parcial, salvar_cubos, restaurar_cubos
+from aurora.disponibilidade import Disponibilidade
+from aurora.esbocos import novos_esbocos, parcial_hll, parcial_quantis, esboco_gasto, salvar_esbocos, restaurar_esbocos
+from aurora.escrita_csv import EscritorCSV, COMPRESSOES
+from aurora.estado import (carregar_estado, salvar_estado, validar_incremento, novo_estado,
+                           carregar_fidelidade, salvar_fidelidade, CUBOS_ARQUIVO, ESBOCOS_ARQUIVO)
+from aurora.export import EscritorColunar, export_colunar, FORMATOS_COLUNARES
+from aurora.grafo import Grafo
+from aurora.identidade import montar_pools, sortear, cpfs, telefones, emails
+from aurora.metricas import Etapas, perfilador, pico_rss_mb
+from aurora.particoes import particionar, PASTA as PASTA_PARTICOES, MANIFESTO
+from aurora.validacao import validar, relatorio
+from aurora.schema import tipar, concatenar, decimal_para_float
 
 # =========================
 # PARÂMETROS GERAIS
 # =========================
-SEED = 42
-np.random.seed(SEED)
-random.seed(SEED)
-fake = Faker("pt_BR")
+SEED = int(os.environ.get("AURORA_SEED", 42))
 
-OUTPUT_DIR = r"C:\Users\natan\OneDrive\Desktop\HotelDB\hoteldb_rede_output"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+OUTPUT_DIR = os.environ.get("AURORA_OUTPUT_DIR", r"C:\Users\natan\OneDrive\Desktop\HotelDB\hoteldb_rede_output")
 
 # Horizonte temporal
 DATE_START = pd.Timestamp("2019-01-01")
-DATE_END   = pd.Timestamp("2025-12-31")
+DATE_END   = pd.Timestamp(os.environ.get("AURORA_DATE_END", "2025-12-31"))
+
+# Modo incremental: lê o manifesto da execução anterior (OUTPUT_DIR/_estado.json) e gera só
+# o período novo (DATE_END anterior + 1 dia até DATE_END), continuando IDs e streams de RNG.
+# As dimensões não são regravadas; as fatos são anexadas aos CSVs e a Fidelidade é regravada
+MODO_INCREMENTAL    = os.environ.get("AURORA_INCREMENTAL", "0") == "1"
+
+# Escala (estilo TPC): todos os volumes derivam de SCALE_FACTOR. SF=1 é a base original
+# (5 hotéis, 20k clientes, 60k reservas); SF=100 -> 500 hotéis, 2M clientes, 6M reservas
+SCALE_FACTOR        = float(os.environ.get("AURORA_SF", 1))
 
-# Volumes (ajuste se quiser)
-N_HOTEIS            = 5
+# Volumes por unidade de escala (ajuste se quiser)
+HOTEIS_POR_SF       = 5
+CLIENTES_POR_SF     = 20000
+RESERVAS_POR_SF     = 60000     # 60k reservas em SF=1
+
+N_HOTEIS            = max(1, round(HOTEIS_POR_SF * SCALE_FACTOR))
 QUARTOS_POR_HOTEL   = 150
-N_CLIENTES          = 20000
-N_RESERVAS          = 60000     # 60k reservas
+N_CLIENTES          = max(1, round(CLIENTES_POR_SF * SCALE_FACTOR))
+N_RESERVAS          = max(1, round(RESERVAS_POR_SF * SCALE_FACTOR))
 PCT_CANCEL          = 0.12
 PCT_NOSHOW          = 0.03
 NOITES_MAX          = 14
 N_FUNCIONARIOS_POR_HOTEL = 80
 
-# Ocupação Diária: fração de reservas confirmadas a amostrar (para não explodir linhas)
-OCUPACAO_SAMPLE_FRAC      = 0.60
+# Paralelismo: shards de tamanho fixo (a saída não depende do nº de workers)
+N_WORKERS           = int(os.environ.get("AURORA_WORKERS", os.cpu_count() or 1))
+RESERVAS_POR_SHARD  = 50000
+CLIENTES_POR_SHARD  = 5000
+
+# Streaming: cada chunk (shard) das tabelas grandes é anexado ao CSV assim que fica pronto,
+# mantendo a memória constante à medida que N_RESERVAS cresce
+MODO_STREAMING      = os.environ.get("AURORA_STREAMING", "0") == "1"
+
+# Formatos de saída (separados por vírgula): "csv" (BULK INSERT) e/ou colunares
+# "parquet" / "feather" (Arrow IPC), com tipos do DDL e compressão zstd
+FORMATOS_SAIDA      = [f.strip() for f in os.environ.get("AURORA_FORMATOS", "csv").split(",") if f.strip()]
+ROW_GROUP_SIZE      = int(os.environ.get("AURORA_ROW_GROUP", 1_000_000))
+
+# CSV: compressão opcional ("gzip" ou "zstd") e divisão em partes de até N linhas, cada uma
+# com cabeçalho (0 = arquivo único), para BULK INSERT em lotes paralelos. A formatação é
+# vetorizada em blocos em CSV_THREADS threads e as tabelas são gravadas em paralelo
+CSV_COMPRESSAO      = os.environ.get("AURORA_CSV_COMPRESSAO", "")
+CSV_LINHAS_POR_ARQUIVO = int(os.environ.get("AURORA_CSV_LINHAS_POR_ARQUIVO", 0))
+CSV_THREADS         = int(os.environ.get("AURORA_CSV_THREADS", os.cpu_count() or 1))
+OPCOES_CSV          = {"compressao": CSV_COMPRESSAO, "linhas_por_arquivo": CSV_LINHAS_POR_ARQUIVO}
+
+# Métricas por etapa (início/fim, tempo, CPU, memória, linhas, bytes) em JSON lines;
+# usado pelo benchmark. Perfil opcional do processo principal: "cprofile" ou "pyinstrument"
+METRICAS_PATH       = os.environ.get("AURORA_METRICAS")
+PERFIL              = os.environ.get("AURORA_PERFIL", "")
+PERFIL_PATH         = os.environ.get("AURORA_PERFIL_PATH",
+                                     os.path.join(OUTPUT_DIR, "perfil.html" if PERFIL == "pyinstrument" else "perfil.prof"))
+
+# Carga opcional em banco local ao fim da geração: "sqlite" ou "duckdb" (ver aurora/carga.py)
+CARGA_MOTOR         = os.environ.get("AURORA_CARGA", "")
+CARGA_DB            = os.environ.get("AURORA_CARGA_DB", os.path.join(OUTPUT_DIR, f"aurora.{CARGA_MOTOR}"))
+
+# Relatórios de 05_analysis_queries.sql calculados em pandas (OUTPUT_DIR/kpis)
+CALCULAR_KPIS       = os.environ.get("AURORA_KPIS", "0") == "1"
+
+# Validação de PKs, FKs e datas da saída (aurora/validacao.py) ao fim da geração; com
+# violações, a execução falha antes das partições, da carga e dos KPIs
+VALIDAR             = os.environ.get("AURORA_VALIDAR", "0") == "1"
+
+# Tabela PickupHotelDia (diárias no livro por hotel x data de estadia x antecedência,
+# aurora/pickup.py), refeita de toda a tabela Reservas ao fim da geração, antes da validação
+CALCULAR_PICKUP     = os.environ.get("AURORA_PICKUP", "0") == "1"
+
+# Tabelas fato também em partições AnoMes x HotelID (OUTPUT_DIR/particionado) com manifesto
+# de hashes; partições iguais às da execução anterior não são regravadas (aurora/particoes.py)
+PARTICIONAR         = os.environ.get("AURORA_PARTICIONAR", "0") == "1"
+
+if set(FORMATOS_SAIDA) - {"csv", *FORMATOS_COLUNARES}:
+    raise ValueError(f"AURORA_FORMATOS inválido: {FORMATOS_SAIDA} (use csv, parquet, feather)")
+if CSV_COMPRESSAO not in COMPRESSOES:
+    raise ValueError(f"AURORA_CSV_COMPRESSAO inválido: {CSV_COMPRESSAO} (use gzip ou zstd)")
+if CARGA_MOTOR and CARGA_MOTOR not in MOTORES:
+    raise ValueError(f"AURORA_CARGA inválido: {CARGA_MOTOR} (use {', '.join(MOTORES)})")
+
+# =========================
+# RNG DETERMINÍSTICO POR TABELA / SHARD
+# =========================
+# Cada tabela tem seu próprio stream derivado de SEED via SeedSequence.spawn, e cada
+# shard (faixa de IDs ou hotel) um filho desse stream. Novas tabelas entram no FIM da
+# lista para não alterar os streams das existentes. Execuções incrementais usam a chave
+# (shard, janela) no lugar de (shard,): streams novos, sem repetir os das cargas anteriores.
+RNG_TABELAS = ["Hoteis", "Quartos", "Clientes", "CalendarioTarifas", "Reservas",
+               "Funcionarios", "Fornecedores", "EstoqueProdutos", "Manutencoes",
+               "Eventos", "Reclamacoes", "Identidades", "Escala"]
+# Dimensões pequenas já prontas (quartos, calendário...) e a janela incremental que os workers precisam.
+_CTX = {}
+
+_SEEDS_TABELAS = dict(zip(RNG_TABELAS, np.random.SeedSequence(SEED).spawn(len(RNG_TABELAS))))
+
+def seed_para(tabela, shard=None):
+    """SeedSequence da tabela (ou do shard da tabela)."""
+    ss = _SEEDS_TABELAS[tabela]
+    if shard is not None:
+        # mesmo filho que ss.spawn(shard + 1)[shard], sem depender de quantos já foram criados
+        janela = _CTX.get("janela", 0)
+        chave = (shard,) if janela == 0 else (shard, janela)
+        ss = np.random.SeedSequence(ss.entropy, spawn_key=ss.spawn_key + chave)
+    return ss
+
+def rng_para(tabela, shard=None):
+    return np.random.default_rng(seed_para(tabela, shard))
+
+_fake = None
+def fake_para(tabela, shard=None):
+    """Faker pt_BR (um por processo), re-semeado para a tabela/shard."""
+    global _fake
+    if _fake is None:
+        from faker import Faker  # importado só quando um nó precisa de identidades
+        _fake = Faker("pt_BR")
+    _fake.seed_instance(int(seed_para(tabela, shard).generate_state(1)[0]))
+    return _fake
 
 # =========================
 # HELPERS ROBUSTOS
 # =========================
-def norm_weights(weights):
-    """Normaliza pesos para somar 1 de forma estável."""
-    w = np.array(weights, dtype=float)
-    s = w.sum()
-    if s <= 0 or not np.isfinite(s):
-        # fallback: uniforme
-        return np.ones_like(w) / len(w)
-    return w / s
-
-def safe_choice(vals, weights=None):
-    """Escolha com pesos normalizados. Evita erro de soma != 1."""
-    if weights is None:
-        return random.choice(vals)
-    p = norm_weights(weights)
-    # numpy exige mesmo comprimento
-    if len(p) != len(vals):
-        # fallback uniforme
-        return random.choice(vals)
-    return np.random.choice(vals, p=p)
-
-def to_iso(df, cols):
-    """Converte colunas de data para ISO YYYY-MM-DD (string)."""
-    for c in cols:
-        if c in df.columns:
-            df[c] = pd.to_datetime(df[c], errors="coerce").dt.strftime("%Y-%m-%d")
+# data de referência das datas "até hoje" (cadastros, nascimentos, contratações); fixe com
+# AURORA_HOJE=AAAA-MM-DD para reproduzir uma execução de outro dia
+HOJE = pd.Timestamp(os.environ.get("AURORA_HOJE", "today")).normalize()
+
+def datas_ate_hoje(rng, n, dias_min, dias_max):
+    """n datas entre HOJE - dias_max e HOJE - dias_min (datetime64[D]), como o date_between do Faker."""
+    return (np.datetime64(HOJE.date(), "D") - rng.integers(dias_min, dias_max + 1, size=n)).astype("datetime64[D]")
 
 def add_year_month(df, date_col, prefix=""):
-    """Adiciona Ano, Mes, AnoMes a partir de uma coluna de data (string ou datetime)."""
-    s = pd.to_datetime(df[date_col], errors="coerce")
-    df[f"{prefix}Ano"] = s.dt.year
-    df[f"{prefix}Mes"] = s.dt.month
-    df[f"{prefix}AnoMes"] = s.dt.strftime("%Y-%m")
+    """Adiciona Ano, Mes (int16) e AnoMes (category "YYYY-MM") a partir de uma coluna de data."""
+    meses = df[date_col].to_numpy().astype("datetime64[M]").astype(np.int64)  # meses desde 1970-01
+    df[f"{prefix}Ano"] = (1970 + meses // 12).astype(np.int16)
+    df[f"{prefix}Mes"] = (meses % 12 + 1).astype(np.int16)
+    unicos, codigos = np.unique(meses, return_inverse=True)
+    rotulos = [f"{1970 + m // 12}-{m % 12 + 1:02d}" for m in unicos]
+    df[f"{prefix}AnoMes"] = pd.Categorical.from_codes(codigos.ravel(), rotulos)
 
-def export_csv(df, name):
-    path = os.path.join(OUTPUT_DIR, f"{name}.csv")
-    df.to_csv(path, index=False, encoding="utf-8")
-    print(f"OK -> {path}")
+_POOL_CSV = []
+
+def pool_csv():
+    """Threads que formatam os blocos de CSV (criadas no primeiro uso, só no processo principal)."""
+    if not _POOL_CSV:
+        _POOL_CSV.append(ThreadPoolExecutor(CSV_THREADS))
+    return _POOL_CSV[0]
+
+def escritor_csv(name, janela=0):
+    return EscritorCSV(name, OUTPUT_DIR, CSV_COMPRESSAO, CSV_LINHAS_POR_ARQUIVO, janela, pool_csv())
+
+def export_csv(df, name, bloco=500_000):
+    """Grava o CSV em blocos de linhas: o texto só existe bloco a bloco."""
+    escritor = escritor_csv(name)
+    for ini in range(0, max(len(df), 1), bloco):
+        escritor.add(df.iloc[ini:ini + bloco])
+    print(f"OK -> {escritor.descricao()}")
+    return escritor.paths
+
+def export_tabela(df, name):
+    """Exporta nos FORMATOS_SAIDA configurados; retorna os caminhos gravados."""
+    paths = []
+    if "csv" in FORMATOS_SAIDA:
+        paths += export_csv(df, name)
+    for fmt in FORMATOS_SAIDA:
+        if fmt in FORMATOS_COLUNARES:
+            paths.append(export_colunar(df, name, OUTPUT_DIR, fmt, ROW_GROUP_SIZE))
+            print(f"OK -> {paths[-1]}")
+    return paths
 
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
+# =========================
+# EXECUÇÃO EM SHARDS (pool de processos)
+# =========================
+def _init_worker(ctx):
+    _CTX.update(ctx)
+
+def _shard_com_pico(func, spec):
+    """func(spec) no worker, com o pico de RSS do worker (o getrusage do main não o enxerga)."""
+    return func(spec), pico_rss_mb()
+
+def iter_shards(pool, func, specs, etapas=None):
+    """Gera func(spec) de cada shard na ordem dos specs, com no máximo 2 x N_WORKERS em voo.
+
+    Com `etapas`, o pico de RSS de cada worker entra nas métricas das etapas (observar_pico).
+    """
+    if pool is None:
+        for spec in specs:
+            yield func(spec)
+        return
+    specs = iter(specs)
+    pendentes = deque(pool.submit(_shard_com_pico, func, spec) for spec in itertools.islice(specs, 2 * N_WORKERS))
+    while pendentes:
+        res, pico = pendentes.popleft().result()
+        if etapas is not None:
+            etapas.observar_pico(pico)
+        for spec in itertools.islice(specs, 1):
+            pendentes.append(pool.submit(_shard_com_pico, func, spec))
+        yield res
+
+def id_shards(total, por_shard, inicio=1):
+    """Divide IDs inicio..inicio+total-1 em faixas fixas: [(shard, id_ini, id_fim_exclusivo), ...]."""
+    fim = inicio + total
+    return [(k, ini, min(ini + por_shard, fim))
+            for k, ini in enumerate(range(inicio, fim, por_shard))]
+
+class SaidaTabela:
+    """Destino de uma tabela produzida em chunks (shards), na ordem.
+
+    Numera id_col de forma contínua entre chunks (independe do nº de workers). Em
+    MODO_STREAMING cada chunk é anexado ao CSV (e aos arquivos colunares abertos) assim
+    que chega; senão, fica em memória e é gravado chunk a chunk no fim (sem concatenar).
+    Com `janela` > 0 (MODO_INCREMENTAL) os IDs continuam de id_base, o CSV existente recebe
+    as linhas novas sem cabeçalho e os colunares vão para arquivos do incremento.
+    """
+    def __init__(self, nome, id_col=None, id_base=0, janela=0):
+        self.nome = nome
+        self.id_col = id_col
+        self.id_base = id_base
+        self.janela = janela
+        self.linhas = 0
+        self.chunks = 0
+        self.gravados = 0
+        self.partes = []
+        self.csv = None
+        self.colunares = []
+
+    def _gravar(self, df):
+        """Anexa um chunk em todos os FORMATOS_SAIDA; retorna os bytes de CSV gravados."""
+        if self.gravados == 0:
+            arquivo = f"{self.nome}.{self.janela:03d}" if self.janela else None
+            if "csv" in FORMATOS_SAIDA:
+                self.csv = escritor_csv(self.nome, self.janela)
+            self.colunares = [EscritorColunar(self.nome, OUTPUT_DIR, fmt, ROW_GROUP_SIZE, arquivo)
+                              for fmt in FORMATOS_SAIDA if fmt in FORMATOS_COLUNARES]
+        self.gravados += 1
+        for escritor in self.colunares:
+            escritor.add(df)
+        return self.csv.add(df) if self.csv else 0
+
+    def add(self, df):
+        """Recebe o próximo chunk; retorna os bytes de CSV gravados agora (0 fora do streaming)."""
+        if self.id_col is not None:
+            ini = self.id_base + self.linhas + 1
+            df.insert(0, self.id_col, np.arange(ini, ini + len(df), dtype=np.int32))
+        gravados = 0
+        if MODO_STREAMING:
+            gravados = self._gravar(df)
+        else:
+            self.partes.append(df)
+        self.linhas += len(df)
+        self.chunks += 1
+        return gravados
+
+    def frame(self):
+        """Tabela completa (apenas fora do MODO_STREAMING)."""
+        return concatenar(self.partes)
+
+    def exportar(self):
+        """Finaliza a tabela; retorna os bytes gravados nesta etapa (o CSV em streaming já contou no add)."""
+        gravados = 0
+        if not MODO_STREAMING:
+            for df in self.partes:
+                gravados += self._gravar(df)
+        if self.gravados == 0:
+            # tabela vazia: ainda gera os arquivos
+            gravados += self._gravar(concatenar(self.partes))
+        if self.csv:
+            print(f"OK -> {self.csv.descricao()} ({self.chunks} chunks)")
+        for escritor in self.colunares:
+            escritor.fechar()
+            gravados += os.path.getsize(escritor.path)
+            print(f"OK -> {escritor.path} ({self.chunks} chunks)")
+        return gravados
+
 # =========================
 # DIMENSÕES BÁSICAS
 # =========================
@@ -94,6 +326,32 @@ hoteis_cidades = [
     ("Hotel Aurora Pampulha",     "Belo Horizonte", "MG", "Brasil"),
     ("Hotel Aurora Cambuí",       "Campinas",       "SP", "Brasil"),
 ]
+# Cidades dos hotéis gerados além dos 5 originais (SCALE_FACTOR > 1)
+cidades_expansao = [
+    ("Salvador","BA"), ("Recife","PE"), ("Porto Alegre","RS"), ("Curitiba","PR"), ("Florianópolis","SC"),
+    ("Brasília","DF"), ("Manaus","AM"), ("Belém","PA"), ("Goiânia","GO"), ("Natal","RN"),
+    ("Maceió","AL"), ("João Pessoa","PB"), ("Vitória","ES"), ("São Luís","MA"), ("Campo Grande","MS"),
+    ("Cuiabá","MT"), ("Teresina","PI"), ("Aracaju","SE"), ("Foz do Iguaçu","PR"), ("Gramado","RS"),
+    ("Armação dos Búzios","RJ"), ("Santos","SP"), ("Ribeirão Preto","SP"), ("Porto Seguro","BA"), ("Bonito","MS"),
+]
+
+def catalogo_hoteis(n):
+    """Os hotéis originais e, além deles, hotéis gerados (cidades em ciclo, numerados)."""
+    hoteis = list(hoteis_cidades[:n])
+    for k in range(len(hoteis), n):
+        cidade, uf = cidades_expansao[(k - len(hoteis_cidades)) % len(cidades_expansao)]
+        hoteis.append((f"Hotel Aurora {cidade} {k + 1}", cidade, uf, "Brasil"))
+    return hoteis
+
+def pesos_hoteis(n):
+    """Pesos originais dos 5 hotéis; os gerados recebem pesos lognormais com a mesma média."""
+    base = [0.22,0.33,0.16,0.14,0.15]
+    if n <= len(base):
+        return base[:n]
+    extras = rng_para("Escala").lognormal(0.0, 0.35, size=n - len(base))
+    return base + (extras * np.mean(base) / extras.mean()).tolist()
+
+sorteio_hotel = Amostrador(range(N_HOTEIS), pesos_hoteis(N_HOTEIS))
 
 # Sazonalidade por mês (fator de demanda/preço)
 seasonality = {
@@ -112,17 +370,17 @@ canais = [
     ("OTA - Expedia", 0.12),
     ("Corporativo",   0.06),
 ]
-canal_pesos = norm_weights([w for _, w in canais])
 
 # Formas de pagamento
 formas_pagto = ["Cartão Crédito", "Cartão Débito", "Pix", "Boleto", "Dinheiro"]
-fp_pesos = norm_weights([0.55, 0.12, 0.22, 0.06, 0.05])
+sorteio_fp = Amostrador(formas_pagto, [0.55, 0.12, 0.22, 0.06, 0.05])
 
 # Tipos de quarto e tarifa base
 room_types = ["Standard", "Casal", "Executivo", "Luxo", "Suíte"]
 base_rates = {"Standard": 220, "Casal": 320, "Executivo": 420, "Luxo": 600, "Suíte": 900}
 capacidade_map = {"Standard": 2, "Casal": 2, "Executivo": 2, "Luxo": 3, "Suíte": 4}
-tipo_quarto_pesos = norm_weights([0.35, 0.24, 0.18, 0.15, 0.08])
+sorteio_tipo_quarto = Amostrador(room_types, [0.35, 0.24, 0.18, 0.15, 0.08])
+sorteio_categoria_hotel = Amostrador(["4 estrelas","5 estrelas"], [0.7,0.3])
 
 # Serviços extras
 servicos_dim = [
@@ -133,7 +391,9 @@ servicos_dim = [
     {"ServicoID": 5, "NomeServico": "Bar",            "Descricao": "Consumo no bar", "Preco": 75.0},
     {"ServicoID": 6, "NomeServico": "Transfer",       "Descricao": "Traslado aeroporto-hotel", "Preco": 120.0},
 ]
-df_servicos = pd.DataFrame(servicos_dim)
+df_servicos = tipar(pd.DataFrame(servicos_dim), "Servicos")
+servico_ids = np.array([s["ServicoID"] for s in servicos_dim])
+servico_precos = np.array([s["Preco"] for s in servicos_dim])
 
 # Departamentos
 departamentos_dim = [
@@ -144,235 +404,493 @@ departamentos_dim = [
     {"DepartamentoID": 5, "NomeDepartamento": "Comercial"},
     {"DepartamentoID": 6, "NomeDepartamento": "Administrativo/Financeiro"},
 ]
-df_departamentos = pd.DataFrame(departamentos_dim)
+df_departamentos = tipar(pd.DataFrame(departamentos_dim), "Departamentos")
 
 # =========================
-# HOTÉIS
+# CANAIS DE VENDA
 # =========================
-hoteis = []
-for i, (nome, cidade, uf, pais) in enumerate(hoteis_cidades[:N_HOTEIS], start=1):
-    hoteis.append({
-        "HotelID": i,
-        "Rede": rede_nome,
-        "NomeHotel": nome,
-        "Cidade": cidade,
-        "UF": uf,
-        "Pais": pais,
-        "Categoria": safe_choice(["4 estrelas","5 estrelas"], [0.7,0.3]),
-        "Telefone": fake.phone_number(),
-        "Email": f"contato@{nome.lower().replace(' ', '').replace('í','i').replace('ã','a')}.com",
-        "DataAbertura": fake.date_between(start_date="-15y", end_date="-5y"),
-        "TotalQuartos": QUARTOS_POR_HOTEL
-    })
-df_hoteis = pd.DataFrame(hoteis)
-to_iso(df_hoteis, ["DataAbertura"])
+df_canais = tipar(pd.DataFrame([{"CanalID": i+1, "NomeCanal": c} for i, (c, _) in enumerate(canais)]), "CanaisVenda")
+sorteio_canal = Amostrador(df_canais["CanalID"].values, [w for _, w in canais])
 
 # =========================
-# QUARTOS
+# HOTÉIS
 # =========================
-quartos = []
-global_quarto_id = 1
-for h in df_hoteis.itertuples(index=False):
-    for i in range(1, QUARTOS_POR_HOTEL + 1):
-        t = safe_choice(room_types, tipo_quarto_pesos)
-        andar = 1 + (i // 10)
-        tarifa = base_rates[t] * np.random.normal(1.0, 0.06)
-        quartos.append({
-            "QuartoID": global_quarto_id,
-            "HotelID": h.HotelID,
-            "Numero": f"{andar:02d}{(i%100):02d}",
-            "Tipo": t,
-            "PrecoBase": round(max(tarifa, base_rates[t]*0.8), 2),
-            "Andar": andar,
-            "Capacidade": capacidade_map[t],
-            "Status": "Ativo"
+def gerar_hoteis():
+    rng, fake = rng_para("Hoteis"), fake_para("Hoteis")
+    hoteis = []
+    for i, (nome, cidade, uf, pais) in enumerate(catalogo_hoteis(N_HOTEIS), start=1):
+        slug = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode().lower().replace(" ", "")
+        hoteis.append({
+            "HotelID": i,
+            "Rede": rede_nome,
+            "NomeHotel": nome,
+            "Cidade": cidade,
+            "UF": uf,
+            "Pais": pais,
+            "Categoria": sorteio_categoria_hotel.um(rng),
+            "Telefone": fake.phone_number(),
+            "Email": f"contato@{slug}.com",
+            "DataAbertura": fake.date_between(start_date="-15y", end_date="-5y"),
+            "TotalQuartos": QUARTOS_POR_HOTEL
         })
-        global_quarto_id += 1
-df_quartos = pd.DataFrame(quartos)
-
-quartos_por_hotel = {
-    hid: df_quartos.loc[df_quartos["HotelID"] == hid, "QuartoID"].values
-    for hid in df_hoteis["HotelID"].tolist()
-}
+    return tipar(pd.DataFrame(hoteis), "Hoteis")
 
 # =========================
-# CANAIS DE VENDA
+# QUARTOS
 # =========================
-df_canais = pd.DataFrame([{"CanalID": i+1, "NomeCanal": c} for i, (c, _) in enumerate(canais)])
+def gerar_quartos(df_hoteis):
+    """Quartos de todos os hotéis de uma vez (contíguos por hotel)."""
+    rng = rng_para("Quartos")
+    n = len(df_hoteis) * QUARTOS_POR_HOTEL
+    i = np.tile(np.arange(1, QUARTOS_POR_HOTEL + 1), len(df_hoteis))
+    tipos = pd.Series(sorteio_tipo_quarto.sortear(rng, n))
+    base = tipos.map(base_rates).to_numpy()
+    tarifa = base * rng.normal(1.0, 0.06, size=n)
+    andar = 1 + (i // 10)
+    return tipar(pd.DataFrame({
+        "QuartoID": np.arange(1, n + 1),
+        "HotelID": np.repeat(df_hoteis["HotelID"].to_numpy(), QUARTOS_POR_HOTEL),
+        "Numero": pd.Series(andar * 100 + i % 100).astype(str).str.zfill(4),
+        "Tipo": tipos,
+        "PrecoBase": np.round(np.maximum(tarifa, base * 0.8), 2),
+        "Andar": andar,
+        "Capacidade": tipos.map(capacidade_map),
+        "Status": "Ativo"
+    }), "Quartos")
 
 # =========================
-# CLIENTES
+# CLIENTES (shards por faixa de ClienteID)
 # =========================
 domains = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com.br", "uol.com.br"]
-clientes = []
-for i in range(1, N_CLIENTES + 1):
-    first = fake.first_name()
-    last  = fake.last_name()
-    email = f"{first}.{last}{np.random.randint(0,9999)}@{safe_choice(domains)}".lower().replace(" ", "")
-    clientes.append({
-        "ClienteID": i,
-        "Nome": first,
-        "Sobrenome": last,
-        "Email": email,
-        "Telefone": fake.phone_number(),
-        "Cidade": fake.city(),
-        "UF": fake.estado_sigla(),
+sorteio_genero = Amostrador(["M","F"], [0.49,0.51])
+
+def gerar_clientes_shard(spec):
+    """Clientes montados a partir dos pools de identidade (sem Faker por linha)."""
+    shard, id_ini, id_fim = spec
+    rng, pools = rng_para("Clientes", shard), _CTX["pools"]
+    n = id_fim - id_ini
+    i_nome = rng.integers(0, len(pools["nomes"]), size=n)
+    i_sobrenome = rng.integers(0, len(pools["sobrenomes"]), size=n)
+    return tipar(pd.DataFrame({
+        "ClienteID": np.arange(id_ini, id_fim),
+        "Nome": pools["nomes"][i_nome],
+        "Sobrenome": pools["sobrenomes"][i_sobrenome],
+        "Email": emails(rng, i_nome, i_sobrenome, pools, np.array(domains, dtype=object)),
+        "Telefone": telefones(rng, n),
+        "Cidade": sortear(rng, pools["cidades"], n),
+        "UF": sortear(rng, pools["ufs"], n),
         "Pais": "Brasil",
-        "DataNascimento": fake.date_of_birth(minimum_age=18, maximum_age=85),
-        "Genero": safe_choice(["M","F"], [0.49,0.51]),
-        "Documento": fake.cpf(),
-        "DataCadastro": fake.date_between(start_date="-8y", end_date="today")
-    })
-df_clientes = pd.DataFrame(clientes)
-to_iso(df_clientes, ["DataNascimento", "DataCadastro"])
+        "DataNascimento": datas_ate_hoje(rng, n, 18 * 365 + 5, 86 * 365 + 20),
+        "Genero": sorteio_genero.sortear(rng, n),
+        "Documento": cpfs(rng, n),
+        "DataCadastro": datas_ate_hoje(rng, n, 0, 8 * 365 + 2)
+    }), "Clientes")
 
 # =========================
 # FUNÇÕES DE TARIFA E DATAS
 # =========================
-def nightly_rate(date_ts: pd.Timestamp, base: float) -> float:
-    f_season = seasonality[int(date_ts.month)]
-    f_weekday = weekday_factor[int(date_ts.weekday())]
-    noise = np.random.normal(1.0, 0.03)
-    return max(100.0, base * f_season * f_weekday * noise)
-
-noites_vals = list(range(1, NOITES_MAX+1))
-noites_pesos = norm_weights([0.22,0.20,0.15,0.10,0.07,0.06,0.05,0.04,0.03,0.03,0.02,0.015,0.015,0.01])
-
-def sample_booking_dates():
-    """Retorna (data_reserva, checkin, checkout) coerentes."""
-    # A CORREÇÃO ESTÁ AQUI: garantindo que 'checkout' seja um Timestamp
-    checkout = pd.Timestamp(fake.date_between_dates(date_start=DATE_START, date_end=DATE_END))
-    los = safe_choice(noites_vals, noites_pesos)
-    checkin = checkout - timedelta(days=int(los))
-    
-    if checkin < DATE_START:  # A comparação agora funciona
-        checkin = DATE_START
-        checkout = checkin + timedelta(days=int(los))
-    
+sorteio_noites = Amostrador(range(1, NOITES_MAX+1),
+                            [0.22,0.20,0.15,0.10,0.07,0.06,0.05,0.04,0.03,0.03,0.02,0.015,0.015,0.01])
+
+N_DIAS = (DATE_END - DATE_START).days + 1
+tipo_idx = {t: i for i, t in enumerate(room_types)}
+
+def gerar_calendario():
+    """Calendário de tarifas (memoizado): um fator por dia (offset desde DATE_START) x tipo de quarto.
+
+    Sazonalidade, dia da semana e ruído são sorteados uma única vez; toda tarifa de noite
+    (Reservas, multas de No-Show, OcupacaoDiaria) é lida daqui por índice, então a mesma
+    noite tem sempre o mesmo preço em todas as tabelas fato.
+    """
+    rng = rng_para("CalendarioTarifas")
+    cal_datas = pd.date_range(DATE_START, DATE_END, freq="D")
+    season_arr = np.array([seasonality[m] for m in range(1, 13)])
+    weekday_arr = np.array([weekday_factor[d] for d in range(7)])
+    cal_season = season_arr[cal_datas.month.values - 1]
+    cal_weekday = weekday_arr[cal_datas.weekday.values]
+    cal_ruido = rng.normal(1.0, 0.03, size=(N_DIAS, len(room_types)))
+    # arredondado a 6 casas: é exatamente o valor exportado em CalendarioTarifas
+    fator_tarifa = np.round((cal_season * cal_weekday)[:, None] * cal_ruido, 6)
+
+    df_calendario = tipar(pd.DataFrame({
+        "Data": np.repeat(cal_datas.values, len(room_types)),
+        "Tipo": np.tile(room_types, N_DIAS),
+        "FatorSazonal": np.repeat(cal_season, len(room_types)),
+        "FatorDiaSemana": np.repeat(cal_weekday, len(room_types)),
+        "FatorTarifa": fator_tarifa.ravel(),
+        "TarifaReferencia": np.round(np.tile([base_rates[t] for t in room_types], N_DIAS) * fator_tarifa.ravel(), 2)
+    }), "CalendarioTarifas")
+    return fator_tarifa, df_calendario
+
+def montar_contexto(df_hoteis, df_quartos, fator_tarifa):
+    """Arrays das dimensões usados pelos shards (enviados uma vez a cada worker)."""
+    hotel_ids = df_hoteis["HotelID"].values
+    q_hotel = df_quartos["HotelID"].values
+    # quartos de cada hotel são contíguos em df_quartos
+    q_ini = np.searchsorted(q_hotel, hotel_ids, side="left")
+    q_qtd = np.searchsorted(q_hotel, hotel_ids, side="right") - q_ini
+    quarto_pos_por_id = np.zeros(df_quartos["QuartoID"].max() + 1, dtype=np.int64)
+    quarto_pos_por_id[df_quartos["QuartoID"].values] = np.arange(len(df_quartos))
+    return {
+        "hotel_ids": hotel_ids,
+        "q_ini": q_ini,
+        "q_qtd": q_qtd,
+        "q_id": df_quartos["QuartoID"].values,
+        "q_tipo": df_quartos["Tipo"].astype(str).map(tipo_idx).to_numpy(),
+        "q_preco": decimal_para_float(df_quartos["PrecoBase"], "Quartos", "PrecoBase"),
+        "quarto_pos_por_id": quarto_pos_por_id,
+        "fator_tarifa": fator_tarifa,
+        "canal_ids": df_canais["CanalID"].to_numpy(),
+        # mês (posição em MESES) de cada dia do horizonte, para o cubo mensal; vai até
+        # ATRASO_PAGTO_MAX dias depois de DATE_END por causa dos pagamentos (esboços)
+        "mes_do_dia": (np.arange(N_DIAS + ATRASO_PAGTO_MAX).astype("timedelta64[D]")
+                       + np.datetime64(DATE_START.date(), "D")).astype("datetime64[M]").astype(np.int64)
+                      - MESES[0].astype(np.int64),
+    }
+
+def tarifa_noite(ctx, quarto_pos, dia):
+    """Tarifa da noite `dia` (offset) no quarto de posição `quarto_pos` — gather no calendário."""
+    q_tipo, q_preco = ctx["q_tipo"], ctx["q_preco"]
+    return np.round(np.maximum(100.0, q_preco[quarto_pos] * ctx["fator_tarifa"][dia, q_tipo[quarto_pos]]), 2)
+
+# Grade mensal (2019-2025) usada por Movimentos, Manutenções e Eventos: construída uma vez
+MESES   = np.arange(np.datetime64(DATE_START.date(), "M"), np.datetime64(DATE_END.date(), "M") + 1)
+N_MESES = len(MESES)
+MES_INI = MESES.astype("datetime64[D]")
+MES_FIM = (MESES + 1).astype("datetime64[D]") - 1
+
+def grade_mensal(n_entidades, por_celula=1, mes0=0):
+    """Índice cartesiano (entidade, mês), com a entidade (produto, quarto...) mais externa.
+
+    Cobre os meses mes0..N_MESES-1 (mes0 > 0 no modo incremental). por_celula repete cada
+    célula: escalar ou array com n_entidades * (N_MESES - mes0) contagens.
+    """
+    ent = np.repeat(np.arange(n_entidades), N_MESES - mes0)
+    mes = np.tile(np.arange(mes0, N_MESES), n_entidades)
+    if np.ndim(por_celula) == 0 and por_celula == 1:
+        return ent, mes
+    rep = np.broadcast_to(por_celula, ent.shape)
+    return np.repeat(ent, rep), np.repeat(mes, rep)
+
+def offsets_to_dates(off):
+    """Converte offsets em dias (desde DATE_START) para datetime64[D]."""
+    return np.datetime64(DATE_START.date(), "D") + np.asarray(off).astype("timedelta64[D]")
+
+def sample_booking_dates_batch(rng, n, dia_ini=0):
+    """Retorna arrays (data_reserva, checkin, checkout, noites) coerentes, em offsets de dias.
+
+    Check-outs caem em [dia_ini, N_DIAS] e as noites em [dia_ini, N_DIAS): dia_ini > 0
+    restringe as estadias ao período novo do modo incremental (a data de reserva ainda pode
+    ser anterior a ele).
+    """
+    checkout = rng.integers(dia_ini, N_DIAS, size=n)
+    los = sorteio_noites.sortear(rng, n)
+    checkin = checkout - los
+
+    # estadias que começariam antes do horizonte (ou da janela) são empurradas para o início
+    # dele; em janelas menores que NOITES_MAX a estadia é encurtada para terminar no horizonte
+    antes = checkin < dia_ini
+    checkin[antes] = dia_ini
+    checkout[antes] = np.minimum(dia_ini + los[antes], N_DIAS)
+    los[antes] = checkout[antes] - dia_ini
+
     # lead time ~ gamma com teto 120 dias
-    lead = int(np.clip(np.random.gamma(shape=2.0, scale=10.0), 0, 120))
-    data_reserva = checkin - timedelta(days=lead)
-    if data_reserva < DATE_START:
-        data_reserva = DATE_START
-        
-    return data_reserva, checkin, checkout, int(los)
+    lead = np.clip(rng.gamma(shape=2.0, scale=10.0, size=n), 0, 120).astype(np.int64)
+    data_reserva = np.maximum(checkin - lead, 0)
+
+    return data_reserva, checkin, checkout, los
+
+def explode_stays(checkin, noites):
+    """Explode (checkin, noites) em uma linha por noite: (índice da reserva, offset do dia)."""
+    idx = np.repeat(np.arange(len(noites)), noites)
+    primeira = np.cumsum(noites) - noites
+    dia = np.asarray(checkin)[idx] + (np.arange(len(idx)) - primeira[idx])
+    return idx, dia
 
 # =========================
-# RESERVAS, PAGAMENTOS, SERVIÇOS, FEEDBACK
+# RESERVAS, PAGAMENTOS, SERVIÇOS, FEEDBACK, OCUPAÇÃO (shards vetorizados)
 # =========================
-reservas = []
-pagamentos = []
-reserva_servicos = []
-feedback = []
-
+# Cada shard cobre uma faixa fixa de ReservaID e é sorteado de uma vez como arrays NumPy;
+# as tabelas filhas saem de máscaras (status, probabilidades) e explosões com np.repeat.
+# PagamentoID/FeedbackID/ReclamacaoID são atribuídos depois, na gravação ordenada dos shards.
 status_choices = ["Confirmada", "Cancelada", "No-Show"]
-status_pesos   = norm_weights([1 - PCT_CANCEL - PCT_NOSHOW, PCT_CANCEL, PCT_NOSHOW])
-
-pay_id = 1
-fb_id  = 1
-
-for res_id in range(1, N_RESERVAS + 1):
-    hotel_id = int(safe_choice(df_hoteis["HotelID"].tolist(), [0.22,0.33,0.16,0.14,0.15][:N_HOTEIS]))
-    quarto_id = int(safe_choice(quartos_por_hotel[hotel_id]))
-    cliente_id = int(np.random.randint(1, N_CLIENTES + 1))
-
-    data_reserva, checkin, checkout, noites = sample_booking_dates()
-    status = safe_choice(status_choices, status_pesos)
-    canal_id = int(safe_choice(df_canais["CanalID"].tolist(), canal_pesos))
-
-    base = float(df_quartos.loc[df_quartos["QuartoID"] == quarto_id, "PrecoBase"].iloc[0])
-    dates = pd.date_range(checkin, periods=noites, freq="D")
-    valor_estadia = float(np.sum([nightly_rate(d, base) for d in dates]))
-
-    reservas.append({
-        "ReservaID": res_id,
-        "HotelID": hotel_id,
-        "QuartoID": quarto_id,
-        "ClienteID": cliente_id,
-        "CanalID": canal_id,
-        "DataReserva": data_reserva,
-        "DataCheckIn": checkin,
-        "DataCheckOut": checkout,
-        "Noites": noites,
-        "Status": status
+sorteio_status = Amostrador(status_choices, [1 - PCT_CANCEL - PCT_NOSHOW, PCT_CANCEL, PCT_NOSHOW])
+sorteio_itens = Amostrador([1,2,3], [0.65,0.27,0.08])
+sorteio_qtd_servico = Amostrador([1,2,3,4], [0.6,0.25,0.1,0.05])
+sorteio_atraso_pagto = Amostrador([0,0,0,1,1,2,3], [0.35,0.25,0.15,0.12,0.07,0.04,0.02])
+ATRASO_PAGTO_MAX = int(sorteio_atraso_pagto.valores.max())
+
+# Reclamações
+motivos = ["Atraso no check-in","Quarto sujo","Barulho","Ar-condicionado com problema","Atendimento demorado","Cobrança indevida"]
+sorteio_motivo = Amostrador(motivos, [0.18,0.22,0.15,0.16,0.17,0.12])
+status_reclamacao = ["Aberta","Em Tratativa","Resolvida"]
+sorteio_status_reclamacao = Amostrador(status_reclamacao, [0.15,0.25,0.60])
+
+# =========================
+# CUBOS (agregados aditivos para os painéis)
+# =========================
+# CuboHotelDia: hotel x dia (ocupação por noite; check-ins, cancelamentos e no-shows na data
+# de check-in). CuboHotelMes: hotel x mês do check-in x tipo de quarto x canal. Valores em centavos.
+MEDIDAS_CUBO_DIA = ["DiariasOcupadas", "ReceitaDiarias", "CheckIns", "Cancelamentos", "NoShows"]
+MEDIDAS_CUBO_MES = ["Reservas", "Confirmadas", "Cancelamentos", "NoShows", "DiariasOcupadas",
+                    "ReceitaDiarias", "ReceitaTotal"]
+
+def parciais_cubos(ctx, hotel_pos, quarto_pos, r_canal, r_checkin, r_noites, r_status,
+                   estadia_centavos, pag_centavos, occ_res, occ_dia, occ_tarifa):
+    n_hot = len(ctx["hotel_ids"])
+    confirmada = r_status == "Confirmada"
+    cancelada = r_status == "Cancelada"
+    no_show = r_status == "No-Show"
+
+    # hotel x dia: noites ocupadas + eventos de chegada (uma linha por reserva)
+    n_occ, n_res = len(occ_res), len(r_checkin)
+    cubo_dia = parcial((n_hot, N_DIAS),
+                       (np.concatenate([hotel_pos[occ_res], hotel_pos]), np.concatenate([occ_dia, r_checkin])), {
+        "DiariasOcupadas": np.r_[np.ones(n_occ), np.zeros(n_res)],
+        "ReceitaDiarias": np.r_[occ_tarifa, np.zeros(n_res)],
+        "CheckIns": np.r_[np.zeros(n_occ), confirmada],
+        "Cancelamentos": np.r_[np.zeros(n_occ), cancelada],
+        "NoShows": np.r_[np.zeros(n_occ), no_show],
+    })
+    # hotel x mês x tipo x canal: uma linha por reserva
+    canal_pos = np.searchsorted(ctx["canal_ids"], r_canal)
+    coords = (hotel_pos, ctx["mes_do_dia"][r_checkin], ctx["q_tipo"][quarto_pos], canal_pos)
+    cubo_mes = parcial((n_hot, N_MESES, len(room_types), len(ctx["canal_ids"])), coords, {
+        "Reservas": 1,
+        "Confirmadas": confirmada,
+        "Cancelamentos": cancelada,
+        "NoShows": no_show,
+        "DiariasOcupadas": np.where(confirmada, r_noites, 0),
+        "ReceitaDiarias": np.where(confirmada, estadia_centavos, 0),
+        "ReceitaTotal": pag_centavos,
     })
+    return {"CuboHotelDia": cubo_dia, "CuboHotelMes": cubo_mes}
 
-    if status == "Confirmada":
-        # Consumos de serviços (prob ~55%)
-        extras = 0.0
-        if np.random.rand() < 0.55:
-            n_itens = safe_choice([1,2,3], [0.65,0.27,0.08])
-            serv_ids = np.random.choice(df_servicos["ServicoID"].values, size=int(n_itens), replace=True)
-            for sid in serv_ids:
-                qtd = int(safe_choice([1,2,3,4], [0.6,0.25,0.1,0.05]))
-                preco = float(df_servicos.loc[df_servicos["ServicoID"] == sid, "Preco"].iloc[0])
-                total = float(preco * qtd)
-                reserva_servicos.append({
-                    "ReservaID": res_id,
-                    "ServicoID": int(sid),
-                    "Quantidade": qtd,
-                    "ValorTotal": round(total, 2)
-                })
-                extras += total
-
-        valor_total = valor_estadia + extras
-        # Data de pagamento: no dia do check-in ou alguns dias depois
-        dt_pag = pd.Timestamp(checkin) + pd.Timedelta(days=int(safe_choice([0,0,0,1,1,2,3], [0.35,0.25,0.15,0.12,0.07,0.04,0.02])))
-        pagamentos.append({
-            "PagamentoID": pay_id,
-            "ReservaID": res_id,
-            "Valor": round(valor_total, 2),
-            "FormaPagamento": safe_choice(formas_pagto, fp_pesos),
-            "DataPagamento": dt_pag
-        })
-        pay_id += 1
-
-        # Feedback (prob ~35%)
-        if np.random.rand() < 0.35:
-            nota = int(clamp(round(np.random.normal(4.3, 0.7)), 1, 5))
-            feedback.append({
-                "FeedbackID": fb_id,
-                "ReservaID": res_id,
-                "Nota": nota,
-                "Comentario": fake.sentence(nb_words=12),
-                "DataFeedback": pd.Timestamp(checkout) + pd.Timedelta(days=int(np.random.randint(0,7)))
-            })
-            fb_id += 1
-
-    elif status == "No-Show":
-        # multa 1 diária em ~40%
-        if np.random.rand() < 0.40:
-            multa = float(nightly_rate(pd.Timestamp(checkin), base))
-            pagamentos.append({
-                "PagamentoID": pay_id,
-                "ReservaID": res_id,
-                "Valor": round(multa, 2),
-                "FormaPagamento": safe_choice(formas_pagto, fp_pesos),
-                "DataPagamento": checkin
-            })
-            pay_id += 1
-
-df_reservas = pd.DataFrame(reservas)
-df_pagamentos = pd.DataFrame(pagamentos)
-df_reserva_servicos = pd.DataFrame(reserva_servicos)
-df_feedback = pd.DataFrame(feedback)
-
-to_iso(df_reservas, ["DataReserva","DataCheckIn","DataCheckOut"])
-to_iso(df_pagamentos, ["DataPagamento"])
-to_iso(df_feedback, ["DataFeedback"])
-
-add_year_month(df_pagamentos, "DataPagamento", prefix="")
-add_year_month(df_reservas, "DataCheckIn",   prefix="CheckIn")
-add_year_month(df_reservas, "DataReserva",   prefix="Reserva")
-
-# =========================
-# FUNCIONÁRIOS
+def novos_cubos(hotel_ids):
+    """Cubos vazios com as dimensões do horizonte atual (DATE_START..DATE_END)."""
+    return {
+        "CuboHotelDia": Cubo("CuboHotelDia", {
+            "HotelID": hotel_ids,
+            "Data": np.arange(np.datetime64(DATE_START.date(), "D"), np.datetime64(DATE_END.date(), "D") + 1),
+        }, MEDIDAS_CUBO_DIA),
+        "CuboHotelMes": Cubo("CuboHotelMes", {
+            "HotelID": hotel_ids,
+            "AnoMes": np.datetime_as_string(MESES),
+            "TipoQuarto": np.array(room_types),
+            "CanalID": df_canais["CanalID"].to_numpy(),
+        }, MEDIDAS_CUBO_MES),
+    }
+
+def frames_cubos(cubos, ctx):
+    """Cubos no esquema das tabelas CuboHotelDia / CuboHotelMes (hotel x dia com todos os dias)."""
+    dia = cubos["CuboHotelDia"].frame(todas=True)
+    pos_hotel = np.searchsorted(ctx["hotel_ids"], dia["HotelID"].to_numpy())
+    dia.insert(2, "QuartosDisponiveis", ctx["q_qtd"][pos_hotel])
+    mes = cubos["CuboHotelMes"].frame()
+    for df in (dia, mes):
+        for col in ("ReceitaDiarias", "ReceitaTotal"):
+            if col in df:
+                df[col] = df[col] / 100
+    return tipar(dia, "CuboHotelDia"), tipar(mes, "CuboHotelMes")
+
+# =========================
+# ESBOÇOS (distintos e quantis aproximados, mescláveis por hotel x mês)
+# =========================
+# ClientesDistintos (HyperLogLog): hotel x mês do check-in. TarifaEfetiva: hotel x mês x
+# tipo de quarto, por noite ocupada. ValorPagamento: hotel x mês do pagamento. Centavos.
+# Pagamentos vão até ATRASO_PAGTO_MAX dias depois de DATE_END: a grade de meses dos esboços
+# vai até o mês de DATE_END + ATRASO_PAGTO_MAX (meses sem dados não aparecem nas consultas).
+MESES_ESBOCOS = np.arange(MESES[0], np.datetime64((DATE_END + timedelta(days=ATRASO_PAGTO_MAX)).date(), "M") + 1)
+
+def parciais_esbocos(ctx, hotel_pos, quarto_pos, r_cliente, r_checkin, occ_res, occ_dia, occ_tarifa,
+                     pag_res, pag_dia, pag_valor):
+    n_hot, n_meses, mes_do_dia = len(ctx["hotel_ids"]), len(MESES_ESBOCOS), ctx["mes_do_dia"]
+    return {
+        "ClientesDistintos": parcial_hll((n_hot, n_meses), (hotel_pos, mes_do_dia[r_checkin]), r_cliente),
+        "TarifaEfetiva": parcial_quantis((n_hot, n_meses, len(room_types)),
+                                         (hotel_pos[occ_res], mes_do_dia[occ_dia], ctx["q_tipo"][quarto_pos[occ_res]]),
+                                         occ_tarifa),
+        "ValorPagamento": parcial_quantis((n_hot, n_meses), (hotel_pos[pag_res], mes_do_dia[pag_dia]), pag_valor),
+    }
+
+def sortear_reservas(ctx, shard, n_res):
+    """Sorteios iniciais de um shard (hotel, quarto preferido, cliente, datas, status, canal).
+
+    Roda duas vezes com o mesmo stream: no processo principal, para alocar os quartos, e no
+    worker, que segue sorteando as tabelas filhas a partir do mesmo rng.
+    """
+    rng = rng_para("Reservas", shard)
+    hotel_pos = sorteio_hotel.indices(rng, n_res)
+    quarto_pos = ctx["q_ini"][hotel_pos] + (rng.random(n_res) * ctx["q_qtd"][hotel_pos]).astype(np.int64)
+    r_cliente = rng.integers(1, N_CLIENTES + 1, size=n_res)
+    r_data_reserva, r_checkin, r_checkout, r_noites = sample_booking_dates_batch(rng, n_res, ctx["dia_ini"])
+    r_status = sorteio_status.sortear(rng, n_res)
+    r_canal = sorteio_canal.sortear(rng, n_res)
+    return rng, (hotel_pos, quarto_pos, r_cliente, r_data_reserva, r_checkin, r_checkout, r_noites, r_status, r_canal)
+
+def alocar_quartos(disp, ctx, spec):
+    """Spec do shard com os quartos das confirmadas alocados no bitmap (processo principal).
+
+    Só estadias confirmadas ocupam quarto; a preferência é o quarto sorteado. Confirmadas
+    sem quarto livre (hotel lotado em alguma noite) voltam como índices a cancelar; elas
+    são contadas em "recusadas" na etapa Disponibilidade, separadas do PCT_CANCEL sorteado.
+    """
+    shard, id_ini, id_fim = spec
+    _, (hotel_pos, quarto_pos, _, _, r_checkin, _, r_noites, r_status, _) = sortear_reservas(ctx, shard, id_fim - id_ini)
+    conf = np.flatnonzero(r_status == "Confirmada")
+    q_ini = ctx["q_ini"][hotel_pos[conf]]
+    local = disp.alocar(hotel_pos[conf], r_checkin[conf], r_noites[conf], quarto_pos[conf] - q_ini)
+    alocada = local >= 0
+    quarto_pos[conf[alocada]] = q_ini[alocada] + local[alocada]
+    return shard, id_ini, id_fim, quarto_pos, conf[~alocada]
+
+def gerar_reservas_shard(spec):
+    shard, id_ini, id_fim, quarto_pos, lotadas = spec
+    ctx = _CTX
+    n_res = id_fim - id_ini
+    res_ids = np.arange(id_ini, id_fim)
+
+    # Hotel, cliente, datas e status (mesmos sorteios da alocação); quarto já alocado
+    rng, (hotel_pos, _, r_cliente, r_data_reserva, r_checkin, r_checkout, r_noites, r_status, r_canal) = \
+        sortear_reservas(ctx, shard, n_res)
+    r_status[lotadas] = "Cancelada"
+
+    r_hotel  = ctx["hotel_ids"][hotel_pos]
+    r_quarto = ctx["q_id"][quarto_pos]
+
+    # Valor da estadia: uma linha por noite, tarifa lida do calendário, somada por reserva
+    noite_res, noite_dia = explode_stays(r_checkin, r_noites)
+    valor_estadia = np.bincount(noite_res, weights=tarifa_noite(ctx, quarto_pos[noite_res], noite_dia), minlength=n_res)
+
+    df_reservas = tipar(pd.DataFrame({
+        "ReservaID": res_ids,
+        "HotelID": r_hotel,
+        "QuartoID": r_quarto,
+        "ClienteID": r_cliente,
+        "CanalID": r_canal,
+        "DataReserva": offsets_to_dates(r_data_reserva),
+        "DataCheckIn": offsets_to_dates(r_checkin),
+        "DataCheckOut": offsets_to_dates(r_checkout),
+        "Noites": r_noites,
+        "Status": r_status
+    }), "Reservas")
+
+    confirmada = r_status == "Confirmada"
+    no_show    = r_status == "No-Show"
+
+    # Consumos de serviços (prob ~55% das confirmadas), 1-3 itens por reserva
+    idx_extra = np.flatnonzero(confirmada & (rng.random(n_res) < 0.55))
+    n_itens = sorteio_itens.sortear(rng, len(idx_extra))
+    rs_res = np.repeat(idx_extra, n_itens)
+    serv_pos = rng.integers(0, len(servico_ids), size=len(rs_res))
+    rs_qtd = sorteio_qtd_servico.sortear(rng, len(rs_res))
+    rs_total = servico_precos[serv_pos] * rs_qtd
+    extras = np.bincount(rs_res, weights=rs_total, minlength=n_res)
+    # o mesmo serviço sorteado duas vezes na reserva vira uma linha (PK ReservaID, ServicoID)
+    _, primeira, inv = np.unique(rs_res * len(servico_ids) + serv_pos, return_index=True, return_inverse=True)
+    rs_qtd = np.bincount(inv.ravel(), weights=rs_qtd).astype(np.int64)[np.argsort(primeira)]
+    primeira = np.sort(primeira)
+    rs_res, serv_pos = rs_res[primeira], serv_pos[primeira]
+    rs_total = servico_precos[serv_pos] * rs_qtd
+
+    df_reserva_servicos = tipar(pd.DataFrame({
+        "ReservaID": res_ids[rs_res],
+        "ServicoID": servico_ids[serv_pos],
+        "Quantidade": rs_qtd,
+        "ValorTotal": np.round(rs_total, 2)
+    }), "ReservaServicos")
+
+    # Pagamento das confirmadas: no dia do check-in ou alguns dias depois
+    idx_conf = np.flatnonzero(confirmada)
+    pag_conf_dia = r_checkin[idx_conf] + sorteio_atraso_pagto.sortear(rng, len(idx_conf))
+    pag_conf_valor = valor_estadia[idx_conf] + extras[idx_conf]
+
+    # No-Show: multa de 1 diária em ~40%, paga no check-in
+    idx_multa = np.flatnonzero(no_show & (rng.random(n_res) < 0.40))
+    multa = tarifa_noite(ctx, quarto_pos[idx_multa], r_checkin[idx_multa])
+
+    # No máximo um pagamento por reserva: a ordem segue a das reservas
+    pag_res = np.concatenate([idx_conf, idx_multa])
+    ordem = np.argsort(pag_res, kind="stable")
+    pag_res = pag_res[ordem]
+    pag_valor = np.concatenate([pag_conf_valor, multa])[ordem]
+    pag_dia = np.concatenate([pag_conf_dia, r_checkin[idx_multa]])[ordem]
+
+    df_pagamentos = tipar(pd.DataFrame({
+        "ReservaID": res_ids[pag_res],
+        "Valor": np.round(pag_valor, 2),
+        "FormaPagamento": sorteio_fp.sortear(rng, len(pag_res)),
+        "DataPagamento": offsets_to_dates(pag_dia)
+    }), "Pagamentos")
+
+    # Feedback (prob ~35% das confirmadas)
+    idx_fb = np.flatnonzero(confirmada & (rng.random(n_res) < 0.35))
+    notas = np.clip(np.round(rng.normal(4.3, 0.7, size=len(idx_fb))), 1, 5).astype(np.int64)
+    df_feedback = tipar(pd.DataFrame({
+        "ReservaID": res_ids[idx_fb],
+        "Nota": notas,
+        "Comentario": sortear(rng, ctx["pools"]["frases"], len(idx_fb)),
+        "DataFeedback": offsets_to_dates(r_checkout[idx_fb] + rng.integers(0, 7, size=len(idx_fb)))
+    }), "Feedback")
+
+    # Ocupação diária: uma linha por noite de toda reserva confirmada (explosão de
+    # (checkin, noites) com np.repeat + offsets), tarifa do mesmo calendário
+    t_occ = time.perf_counter()
+    occ_res, occ_dia = explode_stays(r_checkin[idx_conf], r_noites[idx_conf])
+    occ_res = idx_conf[occ_res]
+    df_ocupacao = tipar(pd.DataFrame({
+        "HotelID": r_hotel[occ_res],
+        "QuartoID": r_quarto[occ_res],
+        "Data": offsets_to_dates(occ_dia),
+        "TarifaEfetiva": tarifa_noite(ctx, quarto_pos[occ_res], occ_dia)
+    }), "OcupacaoDiaria")
+    t_occ = time.perf_counter() - t_occ
+
+    # Agregados parciais dos cubos e dos esboços (só as células que este shard toca)
+    t_cub = time.perf_counter()
+    pag_centavos = np.bincount(pag_res, weights=df_pagamentos["Valor"].to_numpy(), minlength=n_res)
+    cubos = parciais_cubos(ctx, hotel_pos, quarto_pos, r_canal, r_checkin, r_noites, r_status,
+                           np.rint(valor_estadia * 100), pag_centavos,
+                           occ_res, occ_dia, df_ocupacao["TarifaEfetiva"].to_numpy())
+    t_cub = time.perf_counter() - t_cub
+    t_esb = time.perf_counter()
+    esbocos = parciais_esbocos(ctx, hotel_pos, quarto_pos, r_cliente, r_checkin, occ_res, occ_dia,
+                               df_ocupacao["TarifaEfetiva"].to_numpy(), pag_res, pag_dia, df_pagamentos["Valor"].to_numpy())
+    t_esb = time.perf_counter() - t_esb
+
+    # Reclamações: ~6% das reservas, datadas no check-out (geralmente após a estadia)
+    rng_rec = rng_para("Reclamacoes", shard)
+    idx_rec = rng_rec.choice(n_res, size=int(round(0.06 * n_res)), replace=False)
+    df_reclamacoes = tipar(pd.DataFrame({
+        "ReservaID": res_ids[idx_rec],
+        "HotelID": r_hotel[idx_rec],
+        "DataReclamacao": offsets_to_dates(r_checkout[idx_rec]),
+        "Motivo": sorteio_motivo.sortear(rng_rec, len(idx_rec)),
+        "Status": sorteio_status_reclamacao.sortear(rng_rec, len(idx_rec))
+    }), "Reclamacoes")
+
+    return {
+        "Reservas": df_reservas,
+        "Pagamentos": df_pagamentos,
+        "ReservaServicos": df_reserva_servicos,
+        "Feedback": df_feedback,
+        "Reclamacoes": df_reclamacoes,
+        "OcupacaoDiaria": df_ocupacao,
+        # segundos gastos no worker em etapas que não têm laço próprio no main (os parciais
+        # dos cubos têm nome próprio: "Cubos" mede a montagem dos frames em no_cubos)
+        "_tempos": {"OcupacaoDiaria": t_occ, "Cubos:parciais": t_cub, "Esbocos": t_esb},
+        "_cubos": cubos,
+        "_esbocos": esbocos,
+    }
+
+# =========================
+# FUNCIONÁRIOS (shards por hotel)
 # =========================
 cargos = ["Recepcionista","Supervisor Recepção","Camareira","Governanta",
           "Técnico Manutenção","Cozinheiro","Garçom","Bartender",
           "Gerente A&B","Comercial","Controller","Gerente Geral"]
 # pesos coerentes por distribuição
-cargos_pesos = norm_weights([0.14,0.04,0.22,0.03,0.08,0.06,0.08,0.05,0.02,0.06,0.06,0.016])
+sorteio_cargo = Amostrador(cargos, [0.14,0.04,0.22,0.03,0.08,0.06,0.08,0.05,0.02,0.06,0.06,0.016])
 salarios = {
     "Recepcionista":2600, "Supervisor Recepção":3800, "Camareira":2300, "Governanta":3400,
     "Técnico Manutenção":3000, "Cozinheiro":3200, "Garçom":2400, "Bartender":2800,
@@ -387,164 +905,125 @@ def cargo_to_dep(cg):
     if "Comercial" in cg: return 5
     return 6
 
-funcionarios = []
-fid = 1
-for h in df_hoteis.itertuples(index=False):
-    for _ in range(N_FUNCIONARIOS_POR_HOTEL):
-        cg = safe_choice(cargos, cargos_pesos)
-        funcionarios.append({
-            "FuncionarioID": fid,
-            "HotelID": h.HotelID,
-            "Nome": fake.first_name(),
-            "Sobrenome": fake.last_name(),
-            "Cargo": cg,
-            "DepartamentoID": cargo_to_dep(cg),
-            "DataAdmissao": fake.date_between(start_date="-7y", end_date="today"),
-            "Salario": salarios[cg]
-        })
-        fid += 1
-df_funcionarios = pd.DataFrame(funcionarios)
-to_iso(df_funcionarios, ["DataAdmissao"])
-
-# =========================
-# FORNECEDORES
-# =========================
-forn_categorias = ["Alimentos","Bebidas","Lavanderia","Limpeza","Manutenção","TI/Sistemas","Eventos"]
-fornecedores = []
-fornid = 1
-for h in df_hoteis.itertuples(index=False):
-    n = np.random.randint(8, 12)  # 8 a 11 fornecedores por hotel
-    for _ in range(n):
-        cat = safe_choice(forn_categorias)
-        fornecedores.append({
-            "FornecedorID": fornid,
-            "HotelID": h.HotelID,
-            "RazaoSocial": f"{fake.company()} Ltda",
-            "Categoria": cat,
-            "Telefone": fake.phone_number(),
-            "Email": f"contato@{fake.domain_name()}",
-            "Cidade": h.Cidade,
-            "UF": h.UF,
-            "Pais": "Brasil",
-        })
-        fornid += 1
-df_fornecedores = pd.DataFrame(fornecedores)
+def gerar_funcionarios_hotel(spec):
+    shard, h = spec
+    rng, pools = rng_para("Funcionarios", shard), _CTX["pools"]
+    n = N_FUNCIONARIOS_POR_HOTEL
+    cg = pd.Series(sorteio_cargo.sortear(rng, n))
+    return tipar(pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "Nome": sortear(rng, pools["nomes"], n),
+        "Sobrenome": sortear(rng, pools["sobrenomes"], n),
+        "Cargo": cg,
+        "DepartamentoID": cg.map({c: cargo_to_dep(c) for c in cargos}),
+        "DataAdmissao": datas_ate_hoje(rng, n, 0, 7 * 365 + 2),
+        "Salario": cg.map(salarios)
+    }), "Funcionarios")
 
 # =========================
-# ESTOQUE (CATÁLOGO DE PRODUTOS) & MOVIMENTOS
+# FORNECEDORES (shards por hotel)
 # =========================
-prod_categorias = ["Bebidas","Alimentos","Amenities","Rouparia","Limpeza"]
+sorteio_forn_categoria = Amostrador(["Alimentos","Bebidas","Lavanderia","Limpeza","Manutenção","TI/Sistemas","Eventos"])
+
+def gerar_fornecedores_hotel(spec):
+    shard, h = spec
+    rng, pools = rng_para("Fornecedores", shard), _CTX["pools"]
+    n = int(rng.integers(8, 12))  # 8 a 11 fornecedores por hotel
+    return tipar(pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "RazaoSocial": sortear(rng, pools["empresas"], n) + " Ltda",
+        "Categoria": sorteio_forn_categoria.sortear(rng, n),
+        "Telefone": telefones(rng, n),
+        "Email": "contato@" + sortear(rng, pools["dominios"], n),
+        "Cidade": h["Cidade"],
+        "UF": h["UF"],
+        "Pais": "Brasil",
+    }), "Fornecedores")
+
+# =========================
+# ESTOQUE (CATÁLOGO DE PRODUTOS) & MOVIMENTOS (shards por hotel)
+# =========================
+PRODUTOS_POR_HOTEL = 30
+sorteio_prod_categoria = Amostrador(["Bebidas","Alimentos","Amenities","Rouparia","Limpeza"])
 unidades = {"Bebidas":"UN","Alimentos":"KG","Amenities":"UN","Rouparia":"UN","Limpeza":"LT"}
 
-produtos = []
-movimentos = []
-prod_id = 1
-mov_id = 1
-for h in df_hoteis.itertuples(index=False):
+def gerar_estoque_hotel(spec):
+    """Catálogo e movimentos de um hotel; ProdutoID local (0..n-1) é ajustado na concatenação."""
+    shard, h = spec
+    rng, pools = rng_para("EstoqueProdutos", shard), _CTX["pools"]
     # Catálogo por hotel (30 itens)
-    for _ in range(30):
-        cat = safe_choice(prod_categorias)
-        produtos.append({
-            "ProdutoID": prod_id,
-            "HotelID": h.HotelID,
-            "NomeProduto": f"{cat} {fake.word().capitalize()}",
-            "Categoria": cat,
-            "Unidade": unidades[cat],
-            "CustoMedio": round(abs(np.random.normal(20 if cat!='Rouparia' else 80, 10)), 2)
-        })
-        # Movimentos mensais por 2019-2025
-        meses = pd.period_range(DATE_START, DATE_END, freq="M")
-        for p in meses:
-            # entrada e saída controladas
-            entrada_qt = int(np.clip(round(abs(np.random.normal(50, 20))), 5, 200))
-            saida_qt   = int(np.clip(round(abs(np.random.normal(45, 18))), 5, 200))
-            data_ent = pd.Timestamp(p.start_time) + pd.Timedelta(days=int(np.random.randint(0,10)))
-            data_sai = pd.Timestamp(p.end_time)   - pd.Timedelta(days=int(np.random.randint(0,10)))
-
-            movimentos.append({
-                "MovimentoID": mov_id,
-                "HotelID": h.HotelID,
-                "ProdutoID": prod_id,
-                "TipoMovimento": "Entrada",
-                "Quantidade": entrada_qt,
-                "DataMovimento": data_ent
-            })
-            mov_id += 1
-            movimentos.append({
-                "MovimentoID": mov_id,
-                "HotelID": h.HotelID,
-                "ProdutoID": prod_id,
-                "TipoMovimento": "Saida",
-                "Quantidade": saida_qt,
-                "DataMovimento": data_sai
-            })
-            mov_id += 1
-        prod_id += 1
-
-df_estoque = pd.DataFrame(produtos)
-df_movimentos = pd.DataFrame(movimentos)
-to_iso(df_movimentos, ["DataMovimento"])
-
-# =========================
-# MANUTENÇÕES
-# =========================
-tipos_manut = ["Preventiva","Corretiva","Inspeção"]
-status_manut = ["Aberta","Em Andamento","Concluída"]
-manutencoes = []
-man_id = 1
-for h in df_hoteis.itertuples(index=False):
-    quartos_h = df_quartos.loc[df_quartos["HotelID"]==h.HotelID, "QuartoID"].values
+    cat = pd.Series(sorteio_prod_categoria.sortear(rng, PRODUTOS_POR_HOTEL))
+    produtos = pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "NomeProduto": cat + " " + pd.Series(sortear(rng, pools["palavras"], len(cat))).str.capitalize(),
+        "Categoria": cat,
+        "Unidade": cat.map(unidades),
+        "CustoMedio": np.round(np.abs(rng.normal(np.where(cat == "Rouparia", 80, 20), 10)), 2)
+    })
+    # Movimentos mensais (2019-2025): uma Entrada e uma Saída por produto x mês
+    prod, mes = grade_mensal(PRODUTOS_POR_HOTEL, mes0=_CTX["mes0"])
+    n = len(prod)
+    entrada_qt = np.clip(np.round(np.abs(rng.normal(50, 20, size=n))), 5, 200)
+    saida_qt   = np.clip(np.round(np.abs(rng.normal(45, 18, size=n))), 5, 200)
+    data_ent = MES_INI[mes] + rng.integers(0, 10, size=n)
+    data_sai = MES_FIM[mes] - rng.integers(0, 10, size=n)
+    movimentos = pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "ProdutoID": np.repeat(prod, 2),
+        "TipoMovimento": np.tile(["Entrada", "Saida"], n),
+        "Quantidade": np.column_stack([entrada_qt, saida_qt]).ravel().astype(np.int64),
+        "DataMovimento": np.column_stack([data_ent, data_sai]).ravel()
+    })
+    return tipar(produtos, "EstoqueProdutos"), tipar(movimentos, "MovimentosEstoque")
+
+# =========================
+# MANUTENÇÕES (shards por hotel)
+# =========================
+sorteio_tipo_manut = Amostrador(["Preventiva","Corretiva","Inspeção"], [0.5,0.35,0.15])
+sorteio_status_manut = Amostrador(["Aberta","Em Andamento","Concluída"], [0.1,0.2,0.7])
+
+def gerar_manutencoes_hotel(spec):
+    shard, h = spec
+    rng = rng_para("Manutencoes", shard)
+    ini, qtd = _CTX["q_ini"][shard], _CTX["q_qtd"][shard]
+    quartos_h = _CTX["q_id"][ini:ini + qtd]
     # 8-12 manutenções por mês por hotel (volume razoável)
-    meses = pd.period_range(DATE_START, DATE_END, freq="M")
-    for p in meses:
-        n_m = np.random.randint(8, 13)
-        for _ in range(n_m):
-            qid = int(safe_choice(quartos_h))
-            dt_ini = pd.Timestamp(p.start_time) + pd.Timedelta(days=int(np.random.randint(0,20)))
-            dur = int(np.clip(round(abs(np.random.normal(2,1))), 1, 7))
-            dt_fim = dt_ini + pd.Timedelta(days=dur)
-            custo = round(abs(np.random.normal(350, 180)), 2)
-            manutencoes.append({
-                "ManutencaoID": man_id,
-                "HotelID": h.HotelID,
-                "QuartoID": qid,
-                "Tipo": safe_choice(tipos_manut, [0.5,0.35,0.15]),
-                "DataInicio": dt_ini,
-                "DataFim": dt_fim,
-                "Status": safe_choice(status_manut, [0.1,0.2,0.7]),
-                "Custo": custo
-            })
-            man_id += 1
-df_manutencoes = pd.DataFrame(manutencoes)
-to_iso(df_manutencoes, ["DataInicio","DataFim"])
-
-# =========================
-# EVENTOS (receita adicional)
-# =========================
-tipos_evento = ["Conferência","Casamento","Workshop","Lançamento","Reunião Executiva"]
-eventos = []
-evt_id = 1
-for h in df_hoteis.itertuples(index=False):
+    mes0 = _CTX["mes0"]
+    _, mes = grade_mensal(1, rng.integers(8, 13, size=N_MESES - mes0), mes0)
+    n = len(mes)
+    dt_ini = MES_INI[mes] + rng.integers(0, 20, size=n)
+    dur = np.clip(np.round(np.abs(rng.normal(2, 1, size=n))), 1, 7).astype(np.int64)
+    return tipar(pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "QuartoID": quartos_h[rng.integers(0, len(quartos_h), size=n)],
+        "Tipo": sorteio_tipo_manut.sortear(rng, n),
+        "DataInicio": dt_ini,
+        "DataFim": dt_ini + dur,
+        "Status": sorteio_status_manut.sortear(rng, n),
+        "Custo": np.round(np.abs(rng.normal(350, 180, size=n)), 2)
+    }), "Manutencoes")
+
+# =========================
+# EVENTOS (receita adicional, shards por hotel)
+# =========================
+sorteio_tipo_evento = Amostrador(["Conferência","Casamento","Workshop","Lançamento","Reunião Executiva"])
+
+def gerar_eventos_hotel(spec):
+    shard, h = spec
+    rng = rng_para("Eventos", shard)
     # 2-6 eventos por mês
-    meses = pd.period_range(DATE_START, DATE_END, freq="M")
-    for p in meses:
-        n_e = np.random.randint(2, 7)
-        for _ in range(n_e):
-            dt_ini = pd.Timestamp(p.start_time) + pd.Timedelta(days=int(np.random.randint(0,20)))
-            dur = int(np.clip(round(abs(np.random.normal(1.5,0.8))), 1, 5))
-            dt_fim = dt_ini + pd.Timedelta(days=dur)
-            receita = round(abs(np.random.normal(25000, 12000)), 2)
-            eventos.append({
-                "EventoID": evt_id,
-                "HotelID": h.HotelID,
-                "TipoEvento": safe_choice(tipos_evento),
-                "DataInicio": dt_ini,
-                "DataFim": dt_fim,
-                "ReceitaEvento": receita
-            })
-            evt_id += 1
-df_eventos = pd.DataFrame(eventos)
-to_iso(df_eventos, ["DataInicio","DataFim"])
+    mes0 = _CTX["mes0"]
+    _, mes = grade_mensal(1, rng.integers(2, 7, size=N_MESES - mes0), mes0)
+    n = len(mes)
+    dt_ini = MES_INI[mes] + rng.integers(0, 20, size=n)
+    dur = np.clip(np.round(np.abs(rng.normal(1.5, 0.8, size=n))), 1, 5).astype(np.int64)
+    return tipar(pd.DataFrame({
+        "HotelID": h["HotelID"],
+        "TipoEvento": sorteio_tipo_evento.sortear(rng, n),
+        "DataInicio": dt_ini,
+        "DataFim": dt_ini + dur,
+        "ReceitaEvento": np.round(np.abs(rng.normal(25000, 12000, size=n)), 2)
+    }), "Eventos")
 
 # =========================
 # AVALIAÇÕES (REVIEWS) já geradas parcialmente; reforço por eventos/épocas?
@@ -555,112 +1034,415 @@ to_iso(df_eventos, ["DataInicio","DataFim"])
 # PROGRAMA DE FIDELIDADE
 # =========================
 # Pontos ~ 1 ponto a cada R$10 pagos; Nível por faixas
-if not df_pagamentos.empty:
-    pag_por_cliente = df_reservas.merge(df_pagamentos[["ReservaID","Valor"]], on="ReservaID", how="inner") \
-                                     .groupby("ClienteID", as_index=False)["Valor"].sum()
-    pag_por_cliente["Pontos"] = (pag_por_cliente["Valor"] / 10.0).round().astype(int)
-    def nivel(p):
-        if p >= 20000: return "Diamante"
-        if p >= 10000: return "Ouro"
-        if p >= 4000:  return "Prata"
-        return "Bronze"
-    pag_por_cliente["Nivel"] = pag_por_cliente["Pontos"].apply(nivel)
-    df_fidelidade = pag_por_cliente.rename(columns={"Valor":"ValorAcumulado"})
-else:
-    df_fidelidade = pd.DataFrame(columns=["ClienteID","ValorAcumulado","Pontos","Nivel"])
-
-# =========================
-# RECLAMAÇÕES
+class AcumuladorFidelidade:
+    """Valor pago por cliente, mantido incrementalmente a cada chunk de reservas.
+
+    Memória O(N_CLIENTES), independente do número de reservas. O acumulado é salvo ao lado
+    do manifesto, e o modo incremental parte dele em vez de reler os pagamentos antigos.
+    """
+    def __init__(self, n_clientes):
+        self.centavos = np.zeros(n_clientes + 1, dtype=np.int64)
+        self.tem_pagamento = np.zeros(n_clientes + 1, dtype=bool)
+
+    def atualizar(self, df_reservas, df_pagamentos):
+        # ReservaID é crescente dentro do chunk: searchsorted acha a reserva de cada pagamento
+        pos = np.searchsorted(df_reservas["ReservaID"].values, df_pagamentos["ReservaID"].values)
+        cli = df_reservas["ClienteID"].values[pos]
+        # Valor já está em centavos (int64): a soma é exata
+        soma = np.bincount(cli, weights=df_pagamentos["Valor"].values, minlength=len(self.centavos))
+        self.centavos += np.rint(soma).astype(np.int64)
+        self.tem_pagamento[cli] = True
+
+    def frame(self):
+        ids = np.flatnonzero(self.tem_pagamento)
+        valor = self.centavos[ids] / 100
+        pontos = np.round(valor / 10.0).astype(int)
+        nivel = np.select([pontos >= 20000, pontos >= 10000, pontos >= 4000],
+                          ["Diamante", "Ouro", "Prata"], "Bronze")
+        return tipar(pd.DataFrame({"ClienteID": ids, "ValorAcumulado": valor, "Pontos": pontos, "Nivel": nivel}),
+                     "Fidelidade")
+
 # =========================
-motivos = ["Atraso no check-in","Quarto sujo","Barulho","Ar-condicionado com problema","Atendimento demorado","Cobrança indevida"]
-reclamacoes = []
-rec_id = 1
-# ~6% das reservas geram reclamação
-if not df_reservas.empty:
-    sample_recs = df_reservas.sample(frac=0.06, random_state=SEED)
-    for r in sample_recs.itertuples(index=False):
-        reclamacoes.append({
-            "ReclamacaoID": rec_id,
-            "ReservaID": r.ReservaID,
-            "HotelID": r.HotelID,
-            "DataReclamacao": r.DataCheckOut,  # geralmente após a estadia
-            "Motivo": safe_choice(motivos, [0.18,0.22,0.15,0.16,0.17,0.12]),
-            "Status": safe_choice(["Aberta","Em Tratativa","Resolvida"], [0.15,0.25,0.60])
-        })
-        rec_id += 1
-df_reclamacoes = pd.DataFrame(reclamacoes)
-to_iso(df_reclamacoes, ["DataReclamacao"])
-
-# =========================
-# OCUPAÇÃO DIÁRIA (amostrada)
-# =========================
-print("Gerando OcupacaoDiaria (amostra controlada para manter performance)...")
-occ_rows = []
-confirmadas = df_reservas[df_reservas["Status"]=="Confirmada"]
-if not confirmadas.empty:
-    confirmadas = confirmadas.sample(frac=OCUPACAO_SAMPLE_FRAC, random_state=SEED)
-    for r in confirmadas.itertuples(index=False):
-        start = pd.to_datetime(r.DataCheckIn)
-        end   = pd.to_datetime(r.DataCheckOut)
-        base  = float(df_quartos.loc[df_quartos["QuartoID"]==r.QuartoID, "PrecoBase"].iloc[0])
-        for d in pd.date_range(start, end - pd.Timedelta(days=1), freq="D"):
-            tarifa = nightly_rate(d, base)
-            occ_rows.append({
-                "HotelID": r.HotelID,
-                "QuartoID": r.QuartoID,
-                "Data": d.strftime("%Y-%m-%d"),
-                "TarifaEfetiva": round(tarifa, 2)
-            })
-df_ocupacao = pd.DataFrame(occ_rows)
-
-# =========================
-# CANAIS & SERVIÇOS (dimensões já prontas)
-# =========================
-
-# =========================
-# EXPORTA TUDO
-# =========================
-print("\n=== EXPORTANDO ARQUIVOS ===")
-export_csv(df_hoteis,          "Hoteis")
-export_csv(df_quartos,         "Quartos")
-export_csv(df_canais,          "CanaisVenda")
-export_csv(df_servicos,        "Servicos")
-export_csv(df_departamentos,   "Departamentos")
-export_csv(df_clientes,        "Clientes")
-export_csv(df_reservas,        "Reservas")
-export_csv(df_pagamentos,      "Pagamentos")
-export_csv(df_reserva_servicos,"ReservaServicos")
-export_csv(df_feedback,        "Feedback")
-export_csv(df_funcionarios,    "Funcionarios")
-export_csv(df_fornecedores,    "Fornecedores")
-export_csv(df_estoque,         "EstoqueProdutos")
-export_csv(df_movimentos,      "MovimentosEstoque")
-export_csv(df_manutencoes,     "Manutencoes")
-export_csv(df_eventos,         "Eventos")
-export_csv(df_fidelidade,      "Fidelidade")
-export_csv(df_reclamacoes,     "Reclamacoes")
-export_csv(df_ocupacao,        "OcupacaoDiaria")
-
-# =========================
-# RESUMO FINAL (sanidade)
-# =========================
-print("\n=== RESUMO ===")
-def count(df, name): print(f"{name:22s}: {len(df):>8,d}")
-count(df_hoteis, "Hoteis")
-count(df_quartos, "Quartos")
-count(df_clientes, "Clientes")
-count(df_reservas, "Reservas")
-count(df_pagamentos, "Pagamentos")
-count(df_reserva_servicos, "ReservaServicos")
-count(df_feedback, "Feedback")
-count(df_funcionarios, "Funcionarios")
-count(df_fornecedores, "Fornecedores")
-count(df_estoque, "EstoqueProdutos")
-count(df_movimentos, "MovimentosEstoque")
-count(df_manutencoes, "Manutencoes")
-count(df_eventos, "Eventos")
-count(df_fidelidade, "Fidelidade")
-count(df_reclamacoes, "Reclamacoes")
-count(df_ocupacao, "OcupacaoDiaria")
-print(f"\nArquivos gerados em: {OUTPUT_DIR}")
-print("Pronto para BULK INSERT no SQL Server e modelagem no Power BI.")
\ No newline at end of file
+# GRAFO DE TABELAS
+# =========================
+# Cada nó gera uma ou mais tabelas e declara de quais nós depende; a Execucao avalia só o
+# subgrafo pedido, uma vez cada nó. main() avalia todos (na ordem de NOS); gerar_tabelas()
+# — usada por aurora.grafo.generate — só os necessários para as tabelas pedidas.
+class Execucao(Grafo):
+    """Uma geração (completa ou incremental): saídas por tabela, contexto, pool e métricas."""
+    def __init__(self, estado=None):
+        super().__init__(NOS)
+        # Incremental: janela = nº da carga (0 = completa); dia_ini/mes0 = primeiro dia/mês novo
+        self.estado = estado
+        self.janela, self.dia_ini, self.mes0, self.ultimo_id = 0, 0, 0, {}
+        self.reservas_por_dia = N_RESERVAS / N_DIAS
+        if estado:
+            fim_anterior = pd.Timestamp(estado["date_end"])
+            self.janela = estado["janela"] + 1
+            self.dia_ini = (fim_anterior - DATE_START).days + 1
+            self.mes0 = int(np.searchsorted(MESES, np.datetime64(fim_anterior.date(), "M"), side="right"))
+            self.ultimo_id = estado["ultimo_id"]
+            self.reservas_por_dia = estado["reservas_por_dia"]
+        self.n_reservas = max(1, round(self.reservas_por_dia * (N_DIAS - self.dia_ini))) if estado else N_RESERVAS
+        self.inicio_janela = DATE_START + pd.Timedelta(days=self.dia_ini)
+
+        # Cada etapa registra início/fim, tempo, CPU, memória, linhas e bytes (em MODO_STREAMING
+        # a escrita dos chunks entra na etapa que os produz)
+        self.etapas = Etapas(METRICAS_PATH, sf=SCALE_FACTOR, workers=N_WORKERS, streaming=MODO_STREAMING,
+                             janela=self.janela)
+        self.saidas = {nome: SaidaTabela(nome, id_col, self.ultimo_id.get(nome, 0), self.janela) for nome, id_col in [
+            ("Clientes", None),
+            ("Reservas", None),
+            ("Pagamentos", "PagamentoID"),
+            ("ReservaServicos", None),
+            ("Feedback", "FeedbackID"),
+            ("Reclamacoes", "ReclamacaoID"),
+            ("OcupacaoDiaria", None),
+            ("Funcionarios", "FuncionarioID"),
+            ("Fornecedores", "FornecedorID"),
+            ("EstoqueProdutos", "ProdutoID"),
+            ("MovimentosEstoque", "MovimentoID"),
+            ("Manutencoes", "ManutencaoID"),
+            ("Eventos", "EventoID"),
+            ("CalendarioTarifas", None),
+        ]}
+        self.fidelidade = AcumuladorFidelidade(N_CLIENTES)
+        if estado:
+            self.fidelidade.centavos, self.fidelidade.tem_pagamento = carregar_fidelidade(OUTPUT_DIR)
+        self.pool = None
+
+    def specs_hoteis(self):
+        return list(enumerate(self["Hoteis"]["Hoteis"][["HotelID","Cidade","UF"]].to_dict("records")))
+
+    def shards(self, etapa, func, specs, tabela):
+        """Anexa cada shard de func à saída da tabela, medindo a etapa."""
+        with self.etapas.medir(etapa) as reg:
+            for df in iter_shards(self.pool, func, specs, self.etapas):
+                reg["bytes"] += self.saidas[tabela].add(df)
+                reg["linhas"] += len(df)
+        return {tabela: self.saidas[tabela]}
+
+    def tabelas(self, nomes):
+        """{tabela: DataFrame | SaidaTabela} das tabelas pedidas, avaliando só os nós necessários."""
+        out = {}
+        for nome in nomes:
+            if nome in DIMENSOES_FIXAS:
+                out[nome] = DIMENSOES_FIXAS[nome]
+            elif nome in NO_DA_TABELA:
+                out[nome] = self[NO_DA_TABELA[nome]][nome]
+            else:
+                raise KeyError(f"Tabela desconhecida: {nome}")
+        return out
+
+    def fechar(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+def no_hoteis(ex):
+    with ex.etapas.medir("Hoteis") as reg:
+        df_hoteis = gerar_hoteis()
+        reg["linhas"] += len(df_hoteis)
+    return {"Hoteis": df_hoteis}
+
+def no_quartos(ex):
+    with ex.etapas.medir("Quartos") as reg:
+        df_quartos = gerar_quartos(ex["Hoteis"]["Hoteis"])
+        reg["linhas"] += len(df_quartos)
+    return {"Quartos": df_quartos}
+
+def no_calendario(ex):
+    with ex.etapas.medir("CalendarioTarifas") as reg:
+        # o ruído é sorteado dia a dia: o calendário estendido repete o anterior e só ganha dias novos
+        ex.fator_tarifa, df_calendario = gerar_calendario()
+        novos = df_calendario.iloc[ex.dia_ini * len(room_types):].reset_index(drop=True)
+        reg["bytes"] += ex.saidas["CalendarioTarifas"].add(novos)
+        reg["linhas"] += len(novos)
+    return {"CalendarioTarifas": ex.saidas["CalendarioTarifas"]}
+
+def no_contexto(ex):
+    """Arrays das dimensões para os shards, pools de identidade e o pool de processos."""
+    ctx = montar_contexto(ex["Hoteis"]["Hoteis"], ex["Quartos"]["Quartos"], ex.fator_tarifa)
+    ctx.update(janela=ex.janela, dia_ini=ex.dia_ini, mes0=ex.mes0)
+    # Pools de identidade (Faker só aqui; as linhas são montadas por sorteio de índices)
+    ctx["pools"] = montar_pools(fake_para("Identidades"))
+    _CTX.update(ctx)
+    if N_WORKERS > 1:
+        ex.pool = ProcessPoolExecutor(max_workers=N_WORKERS, initializer=_init_worker, initargs=(ctx,))
+    return ctx
+
+def no_clientes(ex):
+    if ex.estado:
+        return {"Clientes": ex.saidas["Clientes"]}
+    return ex.shards("Clientes", gerar_clientes_shard, id_shards(N_CLIENTES, CLIENTES_POR_SHARD), "Clientes")
+
+def no_reservas(ex):
+    """Reservas e fatos filhas; acumula a Fidelidade, os cubos (ex.cubos) e os esboços (ex.esbocos)."""
+    ctx, etapas, saidas = ex["contexto"], ex.etapas, ex.saidas
+    ex.cubos = novos_cubos(ctx["hotel_ids"])
+    ex.esbocos = novos_esbocos(ctx["hotel_ids"], np.datetime_as_string(MESES_ESBOCOS), np.array(room_types))
+    if ex.estado:
+        restaurar_cubos(os.path.join(OUTPUT_DIR, CUBOS_ARQUIVO), ex.cubos.values())
+        restaurar_esbocos(os.path.join(OUTPUT_DIR, ESBOCOS_ARQUIVO), ex.esbocos.values())
+
+    id_reserva = ex.ultimo_id.get("Reservas", 0) + 1
+    # Bitmap quarto x noite: os quartos das confirmadas são alocados aqui, shard a shard na
+    # ordem dos IDs, enquanto os workers geram os shards já alocados. Estadias de janelas
+    # incrementais começam depois do fim da anterior: o bitmap não precisa ser persistido
+    disp = Disponibilidade(ctx["q_qtd"], ctx["q_tipo"], N_DIAS)
+    def specs_reservas():
+        for spec in id_shards(ex.n_reservas, RESERVAS_POR_SHARD, id_reserva):
+            t = time.perf_counter()
+            spec = alocar_quartos(disp, ctx, spec)
+            etapas.somar("Disponibilidade", time.perf_counter() - t, spec[2] - spec[1], recusadas=len(spec[4]))
+            yield spec
+
+    with etapas.medir("Reservas") as reg:
+        for partes in iter_shards(ex.pool, gerar_reservas_shard, specs_reservas(), etapas):
+            # a ocupação é gerada dentro do shard: soma os segundos de worker
+            tempos = partes.pop("_tempos")
+            etapas.somar("OcupacaoDiaria", tempos["OcupacaoDiaria"], len(partes["OcupacaoDiaria"]))
+            etapas.somar("Cubos:parciais", tempos["Cubos:parciais"])
+            etapas.somar("Esbocos", tempos["Esbocos"])
+            for nome, p in partes.pop("_cubos").items():
+                ex.cubos[nome].somar(p)
+            for nome, p in partes.pop("_esbocos").items():
+                ex.esbocos[nome].somar(p)
+            ex.fidelidade.atualizar(partes["Reservas"], partes["Pagamentos"])
+
+            add_year_month(partes["Pagamentos"], "DataPagamento", prefix="")
+            add_year_month(partes["Reservas"], "DataCheckIn",   prefix="CheckIn")
+            add_year_month(partes["Reservas"], "DataReserva",   prefix="Reserva")
+
+            for nome, df in partes.items():
+                reg["bytes"] += saidas[nome].add(df)
+            reg["linhas"] += len(partes["Reservas"])
+    recusadas = etapas.registros.get("Disponibilidade", {}).get("recusadas", 0)
+    if recusadas:
+        print(f"Disponibilidade: {recusadas:,d} confirmadas sem quarto livre (hotel lotado) gravadas como "
+              f"Cancelada ({recusadas / ex.n_reservas:.2%} das reservas, além do PCT_CANCEL de {PCT_CANCEL:.0%})")
+    return {nome: saidas[nome] for nome in
+            ["Reservas", "Pagamentos", "ReservaServicos", "Feedback", "Reclamacoes", "OcupacaoDiaria"]}
+
+def no_funcionarios(ex):
+    if ex.estado:
+        return {"Funcionarios": ex.saidas["Funcionarios"]}
+    return ex.shards("Funcionarios", gerar_funcionarios_hotel, ex.specs_hoteis(), "Funcionarios")
+
+def no_fornecedores(ex):
+    if ex.estado:
+        return {"Fornecedores": ex.saidas["Fornecedores"]}
+    return ex.shards("Fornecedores", gerar_fornecedores_hotel, ex.specs_hoteis(), "Fornecedores")
+
+def no_estoque(ex):
+    hoteis_specs = ex.specs_hoteis()
+    with ex.etapas.medir("Movimentos") as reg:
+        for (k, _), (prod, mov) in zip(hoteis_specs, iter_shards(ex.pool, gerar_estoque_hotel, hoteis_specs,
+                                                                 ex.etapas)):
+            # catálogo fixo de PRODUTOS_POR_HOTEL por hotel: o ProdutoID não depende da janela
+            mov["ProdutoID"] += k * PRODUTOS_POR_HOTEL + 1
+            if not ex.estado:
+                reg["bytes"] += ex.saidas["EstoqueProdutos"].add(prod)
+            reg["bytes"] += ex.saidas["MovimentosEstoque"].add(mov)
+            reg["linhas"] += len(mov)
+    return {nome: ex.saidas[nome] for nome in ["EstoqueProdutos", "MovimentosEstoque"]}
+
+def no_manutencoes(ex):
+    return ex.shards("Manutencoes", gerar_manutencoes_hotel, ex.specs_hoteis(), "Manutencoes")
+
+def no_eventos(ex):
+    return ex.shards("Eventos", gerar_eventos_hotel, ex.specs_hoteis(), "Eventos")
+
+def no_fidelidade(ex):
+    with ex.etapas.medir("Fidelidade") as reg:
+        df_fidelidade = ex.fidelidade.frame()
+        reg["linhas"] += len(df_fidelidade)
+    return {"Fidelidade": df_fidelidade}
+
+def no_cubos(ex):
+    with ex.etapas.medir("Cubos") as reg:
+        df_cubo_dia, df_cubo_mes = frames_cubos(ex.cubos, ex["contexto"])
+        reg["linhas"] += len(df_cubo_dia) + len(df_cubo_mes)
+    return {"CuboHotelDia": df_cubo_dia, "CuboHotelMes": df_cubo_mes}
+
+# nó: (dependências, função); "contexto" não é tabela (arrays dos workers + pool)
+NOS = {
+    "Hoteis":            ([], no_hoteis),
+    "Quartos":           (["Hoteis"], no_quartos),
+    "CalendarioTarifas": ([], no_calendario),
+    "contexto":          (["Hoteis", "Quartos", "CalendarioTarifas"], no_contexto),
+    "Clientes":          (["contexto"], no_clientes),
+    "Reservas":          (["contexto"], no_reservas),
+    "Funcionarios":      (["contexto"], no_funcionarios),
+    "Fornecedores":      (["contexto"], no_fornecedores),
+    "Estoque":           (["contexto"], no_estoque),
+    "Manutencoes":       (["contexto"], no_manutencoes),
+    "Eventos":           (["contexto"], no_eventos),
+    "Fidelidade":        (["Reservas"], no_fidelidade),
+    "Cubos":             (["Reservas", "contexto"], no_cubos),
+}
+NO_DA_TABELA = {
+    "Hoteis": "Hoteis", "Quartos": "Quartos", "CalendarioTarifas": "CalendarioTarifas",
+    "Clientes": "Clientes", "Funcionarios": "Funcionarios", "Fornecedores": "Fornecedores",
+    "Reservas": "Reservas", "Pagamentos": "Reservas", "ReservaServicos": "Reservas", "Feedback": "Reservas",
+    "Reclamacoes": "Reservas", "OcupacaoDiaria": "Reservas",
+    "EstoqueProdutos": "Estoque", "MovimentosEstoque": "Estoque",
+    "Manutencoes": "Manutencoes", "Eventos": "Eventos", "Fidelidade": "Fidelidade",
+    "CuboHotelDia": "Cubos", "CuboHotelMes": "Cubos",
+}
+DIMENSOES_FIXAS = {"CanaisVenda": df_canais, "Servicos": df_servicos, "Departamentos": df_departamentos}
+
+# Ordem de exportação (a mesma do resumo); no incremental só as fatos a partir de "Reservas"
+ORDEM_TABELAS = ["Hoteis", "Quartos", "CanaisVenda", "Servicos", "Departamentos", "Clientes", "Funcionarios",
+                 "Fornecedores", "EstoqueProdutos", "Reservas", "Pagamentos", "ReservaServicos", "Feedback",
+                 "MovimentosEstoque", "Manutencoes", "Eventos", "Fidelidade", "Reclamacoes", "OcupacaoDiaria",
+                 "CalendarioTarifas", "CuboHotelDia", "CuboHotelMes"]
+TABELAS_INCREMENTAIS = ORDEM_TABELAS[ORDEM_TABELAS.index("Reservas"):]
+
+def gerar_tabelas(nomes):
+    """{tabela: DataFrame} das tabelas pedidas e das demais que os mesmos nós produziram.
+
+    Em memória, sem gravar arquivos (use com MODO_STREAMING desligado); só o subgrafo
+    necessário é avaliado — Quartos não gera Clientes nem Reservas, por exemplo.
+    """
+    ex = Execucao()
+    try:
+        ex.tabelas(nomes)
+    finally:
+        ex.fechar()
+    avaliadas = [t for t in ORDEM_TABELAS if t in DIMENSOES_FIXAS and t in nomes
+                 or NO_DA_TABELA.get(t) in ex.valores]
+    return {nome: t.frame() if isinstance(t, SaidaTabela) else t for nome, t in ex.tabelas(avaliadas).items()}
+
+# =========================
+# EXECUÇÃO
+# =========================
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    estado = carregar_estado(OUTPUT_DIR) if MODO_INCREMENTAL else None
+    if estado:
+        validar_incremento(estado, SEED, SCALE_FACTOR, DATE_START, DATE_END, RNG_TABELAS, OPCOES_CSV,
+                           FORMATOS_SAIDA)
+    ex = Execucao(estado)
+    etapas, saidas = ex.etapas, ex.saidas
+    print(f"Gerando SF={SCALE_FACTOR:g} com {N_WORKERS} worker(s){' em streaming' if MODO_STREAMING else ''}...")
+    if estado:
+        print(f"Incremental (janela {ex.janela}): {ex.inicio_janela.date()} a {DATE_END.date()}, "
+              f"{ex.n_reservas:,d} reservas novas")
+
+    try:
+        for no in ["Hoteis", "Quartos", "CalendarioTarifas", "contexto", "Clientes", "Reservas",
+                   "Funcionarios", "Fornecedores", "Estoque", "Manutencoes", "Eventos"]:
+            ex[no]
+    finally:
+        ex.fechar()
+    ex["Fidelidade"]
+    ex["Cubos"]
+
+    # =========================
+    # EXPORTA TUDO
+    # =========================
+    # (em MODO_STREAMING as tabelas em chunks já foram gravadas durante a geração; no modo
+    # incremental as dimensões não são regravadas)
+    print("\n=== EXPORTANDO ARQUIVOS ===")
+    tabelas = list(ex.tabelas(TABELAS_INCREMENTAIS if estado else ORDEM_TABELAS).items())
+
+    def exportar(nome, t):
+        with etapas.medir(f"export:{nome}", em_thread=True) as reg_t:
+            if isinstance(t, SaidaTabela):
+                reg_t["bytes"] += t.exportar()
+                reg_t["linhas"] += t.linhas
+            else:
+                reg_t["bytes"] += sum(os.path.getsize(p) for p in export_tabela(t, nome))
+                reg_t["linhas"] += len(t)
+        return reg_t
+
+    # tabelas gravadas em paralelo (threads: a formatação vetorizada libera o GIL)
+    with etapas.medir("export") as reg, ThreadPoolExecutor(CSV_THREADS) as pool:
+        for reg_t in pool.map(lambda item: exportar(*item), tabelas):
+            reg["linhas"] += reg_t["linhas"]
+            reg["bytes"] += reg_t["bytes"]
+
+    # =========================
+    # RESUMO FINAL (sanidade)
+    # =========================
+    print("\n=== RESUMO ===")
+    def count(t, name): print(f"{name:22s}: {t.linhas if isinstance(t, SaidaTabela) else len(t):>8,d}")
+    resumo = dict(tabelas)
+    for nome in ["Hoteis", "Quartos", "Clientes", "Reservas", "Pagamentos", "ReservaServicos", "Feedback",
+                 "Funcionarios", "Fornecedores", "EstoqueProdutos", "MovimentosEstoque", "Manutencoes",
+                 "Eventos", "Fidelidade", "Reclamacoes", "OcupacaoDiaria", "CalendarioTarifas",
+                 "CuboHotelDia", "CuboHotelMes"]:
+        if nome in resumo:
+            count(resumo[nome], nome)
+
+    # =========================
+    # MANIFESTO DE ESTADO (para a próxima execução incremental)
+    # =========================
+    ultimo_id = dict(ex.ultimo_id)
+    for nome, saida in saidas.items():
+        if saida.id_col is not None:
+            ultimo_id[nome] = saida.id_base + saida.linhas
+    ultimo_id["Reservas"] = ex.ultimo_id.get("Reservas", 0) + ex.n_reservas
+    if not estado:
+        ultimo_id.update(Clientes=N_CLIENTES, Hoteis=len(resumo["Hoteis"]), Quartos=len(resumo["Quartos"]))
+    salvar_fidelidade(OUTPUT_DIR, ex.fidelidade.centavos, ex.fidelidade.tem_pagamento)
+    salvar_cubos(os.path.join(OUTPUT_DIR, CUBOS_ARQUIVO), ex.cubos.values())
+    # gasto por cliente não é aditivo por mês: o esboço por segmento é refeito do acumulado
+    gasto = esboco_gasto(ex.fidelidade.centavos[ex.fidelidade.tem_pagamento])
+    salvar_esbocos(os.path.join(OUTPUT_DIR, ESBOCOS_ARQUIVO), [*ex.esbocos.values(), gasto])
+    path_estado = salvar_estado(OUTPUT_DIR, novo_estado(
+        estado, SEED, SCALE_FACTOR, DATE_START, DATE_END, ex.janela, ex.inicio_janela, ex.reservas_por_dia,
+        ultimo_id, {nome: saida.linhas for nome, saida in saidas.items() if saida.linhas},
+        RNG_TABELAS, FORMATOS_SAIDA, OPCOES_CSV))
+    print(f"Estado -> {path_estado}")
+
+    # =========================
+    # PICKUP, VALIDAÇÃO, PARTIÇÕES, CARGA EM BANCO LOCAL E KPIs (opcionais)
+    # =========================
+    # frames em memória quando a geração completa os manteve; senão, os arquivos do OUTPUT_DIR
+    if MODO_STREAMING or estado:
+        origem = OUTPUT_DIR
+    else:
+        origem = {nome: t.partes if isinstance(t, SaidaTabela) else t for nome, t in tabelas}
+    if CALCULAR_PICKUP:
+        # no modo incremental a janela nova também muda o livro das datas já geradas: tabela inteira
+        with etapas.medir("pickup") as reg:
+            df = pickup.tabela(kpis.ler_tabela(origem, "Reservas", pickup.COLUNAS))
+            reg["bytes"] += sum(os.path.getsize(p) for p in export_tabela(df, "PickupHotelDia"))
+            reg["linhas"] += len(df)
+        if isinstance(origem, dict):
+            origem["PickupHotelDia"] = df
+        print(f"PickupHotelDia: {len(df):,d} linhas ({len(pickup.PONTOS_ANTECEDENCIA)} antecedências por hotel x dia)")
+    if VALIDAR:
+        with etapas.medir("validacao"):
+            violacoes = validar(origem, etapas=etapas)
+        if violacoes:
+            etapas.fechar()
+            raise ValueError(f"Validação: {len(violacoes)} regras violadas\n{relatorio(violacoes)}")
+        print("Validação: PKs, FKs e datas OK")
+    if PARTICIONAR:
+        destino = os.path.join(OUTPUT_DIR, PASTA_PARTICOES)
+        with etapas.medir("particoes") as reg:
+            manifesto = particionar(origem, destino, CSV_COMPRESSAO, etapas)
+            reg["linhas"] += sum(p["linhas"] for t in manifesto["tabelas"].values() for p in t["particoes"].values())
+        print(f"Partições AnoMes x HotelID -> {destino} (manifesto {MANIFESTO})")
+    if CARGA_MOTOR:
+        carregar(CARGA_MOTOR, CARGA_DB, origem, N_WORKERS, etapas)
+    if CALCULAR_KPIS:
+        with etapas.medir("kpis") as reg:
+            relatorios = kpis.calcular(origem)
+            kpis.gravar(relatorios, os.path.join(OUTPUT_DIR, "kpis"))
+            reg["linhas"] += sum(len(df) for df in relatorios.values())
+        print(f"KPIs (05_analysis_queries.sql) -> {os.path.join(OUTPUT_DIR, 'kpis')}")
+    etapas.fechar()
+    print("\n=== ETAPAS ===")
+    print(etapas.resumo())
+    if METRICAS_PATH:
+        print(f"Métricas por etapa -> {METRICAS_PATH}")
+    print(f"\nArquivos gerados em: {OUTPUT_DIR}")
+    print("Pronto para BULK INSERT no SQL Server e modelagem no Power BI.")
+
+if __name__ == "__main__":
+    with perfilador(PERFIL, PERFIL_PATH):
+        main()
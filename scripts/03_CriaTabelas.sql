@@ -218,4 +218,62 @@ CREATE TABLE OcupacaoDiaria (
     Data DATE,
     TarifaEfetiva DECIMAL(10,2)
 );
+GO
+
+-- CalendarioTarifas (Dimensão de tarifas: fator por dia x tipo de quarto)
+-- TarifaEfetiva = MAX(100, ROUND(Quartos.PrecoBase * FatorTarifa, 2))
+CREATE TABLE CalendarioTarifas (
+    Data DATE,
+    Tipo NVARCHAR(50),
+    FatorSazonal DECIMAL(6,4),
+    FatorDiaSemana DECIMAL(6,4),
+    FatorTarifa DECIMAL(9,6),
+    TarifaReferencia DECIMAL(10,2),
+    PRIMARY KEY (Data, Tipo)
+);
+GO
+
+-- CuboHotelDia (Agregado pré-calculado para os painéis: hotel x dia)
+-- ADR = ReceitaDiarias / DiariasOcupadas; RevPAR = ReceitaDiarias / QuartosDisponiveis
+CREATE TABLE CuboHotelDia (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    Data DATE,
+    QuartosDisponiveis INT,
+    DiariasOcupadas INT,
+    ReceitaDiarias DECIMAL(14,2),
+    CheckIns INT,
+    Cancelamentos INT,
+    NoShows INT,
+    PRIMARY KEY (HotelID, Data)
+);
+GO
+
+-- CuboHotelMes (Agregado pré-calculado: hotel x mês do check-in x tipo de quarto x canal)
+-- Medidas aditivas: somam entre meses, tipos e canais sem reler as fatos
+CREATE TABLE CuboHotelMes (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    AnoMes NVARCHAR(7),
+    TipoQuarto NVARCHAR(50),
+    CanalID INT FOREIGN KEY REFERENCES CanaisVenda(CanalID),
+    Reservas INT,
+    Confirmadas INT,
+    Cancelamentos INT,
+    NoShows INT,
+    DiariasOcupadas INT,
+    ReceitaDiarias DECIMAL(14,2),
+    ReceitaTotal DECIMAL(14,2),
+    PRIMARY KEY (HotelID, AnoMes, TipoQuarto, CanalID)
+);
+GO
+
+-- PickupHotelDia (ritmo de reservas: diárias no livro por data de estadia x antecedência)
+-- DiariasNoLivro = diárias da data reservadas com pelo menos DiasAntecedencia dias (sem canceladas)
+CREATE TABLE PickupHotelDia (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    DataEstadia DATE,
+    DiasAntecedencia INT,
+    DiariasNoLivro INT,
+    DiariasCanceladas INT,
+    PRIMARY KEY (HotelID, DataEstadia, DiasAntecedencia)
+);
 GO
\ No newline at end of file
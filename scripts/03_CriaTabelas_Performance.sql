@@ -0,0 +1,343 @@
+-- GERADO por aurora/fisico.py a partir de 03_CriaTabelas.sql (não edite à mão)
+-- Variante de performance: partições anuais nas fatos, chaves de período persistidas
+-- e índices de FK, data e cobertura
+USE Aurora_Hotels_DB;
+GO
+
+-- Partição anual por data (RANGE RIGHT: cada limite é o 1º dia do ano)
+CREATE PARTITION FUNCTION pf_PorAno (DATE) AS RANGE RIGHT FOR VALUES ('2020-01-01', '2021-01-01', '2022-01-01', '2023-01-01', '2024-01-01', '2025-01-01', '2026-01-01');
+GO
+CREATE PARTITION SCHEME ps_PorAno AS PARTITION pf_PorAno ALL TO ([PRIMARY]);
+GO
+
+-- Hoteis
+CREATE TABLE Hoteis (
+    HotelID INT PRIMARY KEY,
+    Rede NVARCHAR(50),
+    NomeHotel NVARCHAR(100),
+    Cidade NVARCHAR(100),
+    UF NVARCHAR(2),
+    Pais NVARCHAR(50),
+    Categoria NVARCHAR(50),
+    Telefone NVARCHAR(20),
+    Email NVARCHAR(100),
+    DataAbertura DATE,
+    TotalQuartos INT
+);
+GO
+
+-- CanaisVenda
+CREATE TABLE CanaisVenda (
+    CanalID INT PRIMARY KEY,
+    NomeCanal NVARCHAR(100)
+);
+GO
+
+-- Clientes
+CREATE TABLE Clientes (
+    ClienteID INT PRIMARY KEY,
+    Nome NVARCHAR(100),
+    Sobrenome NVARCHAR(100),
+    Email NVARCHAR(150),
+    Telefone NVARCHAR(20),
+    Cidade NVARCHAR(100),
+    UF NVARCHAR(2),
+    Pais NVARCHAR(50),
+    DataNascimento DATE,
+    Genero CHAR(1),
+    Documento NVARCHAR(20),
+    DataCadastro DATE
+);
+GO
+
+-- Servicos
+CREATE TABLE Servicos (
+    ServicoID INT PRIMARY KEY,
+    NomeServico NVARCHAR(100),
+    Descricao NVARCHAR(250),
+    Preco DECIMAL(10,2)
+);
+GO
+
+-- Departamentos
+CREATE TABLE Departamentos (
+    DepartamentoID INT PRIMARY KEY,
+    NomeDepartamento NVARCHAR(50)
+);
+GO
+
+-- Quartos
+CREATE TABLE Quartos (
+    QuartoID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    Numero NVARCHAR(10),
+    Tipo NVARCHAR(50),
+    PrecoBase DECIMAL(10,2),
+    Andar INT,
+    Capacidade INT,
+    Status NVARCHAR(20)
+);
+GO
+
+-- Funcionarios
+CREATE TABLE Funcionarios (
+    FuncionarioID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    Nome NVARCHAR(100),
+    Sobrenome NVARCHAR(100),
+    Cargo NVARCHAR(50),
+    DepartamentoID INT FOREIGN KEY REFERENCES Departamentos(DepartamentoID),
+    DataAdmissao DATE,
+    Salario DECIMAL(10,2)
+);
+GO
+
+-- Fornecedores
+CREATE TABLE Fornecedores (
+    FornecedorID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    RazaoSocial NVARCHAR(200),
+    Categoria NVARCHAR(100),
+    Telefone NVARCHAR(20),
+    Email NVARCHAR(100),
+    Cidade NVARCHAR(100),
+    UF NVARCHAR(2),
+    Pais NVARCHAR(50)
+);
+GO
+
+-- EstoqueProdutos
+CREATE TABLE EstoqueProdutos (
+    ProdutoID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    NomeProduto NVARCHAR(100),
+    Categoria NVARCHAR(100),
+    Unidade NVARCHAR(10),
+    CustoMedio DECIMAL(10,2)
+);
+GO
+
+-- Eventos
+CREATE TABLE Eventos (
+    EventoID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    TipoEvento NVARCHAR(100),
+    DataInicio DATE,
+    DataFim DATE,
+    ReceitaEvento DECIMAL(10,2)
+);
+GO
+
+-- Fidelidade
+CREATE TABLE Fidelidade (
+    ClienteID INT PRIMARY KEY FOREIGN KEY REFERENCES Clientes(ClienteID),
+    ValorAcumulado DECIMAL(12,2),
+    Pontos INT,
+    Nivel NVARCHAR(50)
+);
+GO
+
+-- Reservas (particionada por ano de DataCheckIn)
+CREATE TABLE Reservas (
+    ReservaID INT PRIMARY KEY NONCLUSTERED,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    QuartoID INT FOREIGN KEY REFERENCES Quartos(QuartoID),
+    ClienteID INT FOREIGN KEY REFERENCES Clientes(ClienteID),
+    CanalID INT FOREIGN KEY REFERENCES CanaisVenda(CanalID),
+    DataReserva DATE,
+    DataCheckIn DATE,
+    DataCheckOut DATE,
+    Noites INT,
+    Status NVARCHAR(20),
+    CheckInAno INT,
+    CheckInMes INT,
+    CheckInAnoMes NVARCHAR(7),
+    ReservaAno INT,
+    ReservaMes INT,
+    ReservaAnoMes NVARCHAR(7)
+);
+GO
+CREATE CLUSTERED INDEX CX_Reservas ON Reservas (DataCheckIn) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataCheckIn);
+GO
+
+-- Pagamentos (particionada por ano de DataPagamento)
+CREATE TABLE Pagamentos (
+    PagamentoID INT PRIMARY KEY NONCLUSTERED,
+    ReservaID INT FOREIGN KEY REFERENCES Reservas(ReservaID),
+    Valor DECIMAL(12,2),
+    FormaPagamento NVARCHAR(50),
+    DataPagamento DATE,
+    Ano INT,
+    Mes INT,
+    AnoMes NVARCHAR(7)
+);
+GO
+CREATE CLUSTERED INDEX CX_Pagamentos ON Pagamentos (DataPagamento) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataPagamento);
+GO
+
+-- ReservaServicos
+CREATE TABLE ReservaServicos (
+    ReservaID INT FOREIGN KEY REFERENCES Reservas(ReservaID),
+    ServicoID INT FOREIGN KEY REFERENCES Servicos(ServicoID),
+    Quantidade INT,
+    ValorTotal DECIMAL(10,2),
+    PRIMARY KEY (ReservaID, ServicoID)
+);
+GO
+
+-- Feedback (particionada por ano de DataFeedback)
+CREATE TABLE Feedback (
+    FeedbackID INT PRIMARY KEY NONCLUSTERED,
+    ReservaID INT FOREIGN KEY REFERENCES Reservas(ReservaID),
+    Nota INT,
+    Comentario NVARCHAR(500),
+    DataFeedback DATE
+);
+GO
+CREATE CLUSTERED INDEX CX_Feedback ON Feedback (DataFeedback) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataFeedback);
+GO
+
+-- Manutencoes
+CREATE TABLE Manutencoes (
+    ManutencaoID INT PRIMARY KEY,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    QuartoID INT FOREIGN KEY REFERENCES Quartos(QuartoID),
+    Tipo NVARCHAR(50),
+    DataInicio DATE,
+    DataFim DATE,
+    Status NVARCHAR(50),
+    Custo DECIMAL(10,2)
+);
+GO
+
+-- Reclamacoes (particionada por ano de DataReclamacao)
+CREATE TABLE Reclamacoes (
+    ReclamacaoID INT PRIMARY KEY NONCLUSTERED,
+    ReservaID INT FOREIGN KEY REFERENCES Reservas(ReservaID),
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    DataReclamacao DATE,
+    Motivo NVARCHAR(200),
+    Status NVARCHAR(50)
+);
+GO
+CREATE CLUSTERED INDEX CX_Reclamacoes ON Reclamacoes (DataReclamacao) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataReclamacao);
+GO
+
+-- MovimentosEstoque (particionada por ano de DataMovimento)
+CREATE TABLE MovimentosEstoque (
+    MovimentoID INT PRIMARY KEY NONCLUSTERED,
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    ProdutoID INT FOREIGN KEY REFERENCES EstoqueProdutos(ProdutoID),
+    TipoMovimento NVARCHAR(10),
+    Quantidade INT,
+    DataMovimento DATE
+);
+GO
+CREATE CLUSTERED INDEX CX_MovimentosEstoque ON MovimentosEstoque (DataMovimento) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataMovimento);
+GO
+
+-- OcupacaoDiaria (particionada por ano de Data)
+CREATE TABLE OcupacaoDiaria (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    QuartoID INT FOREIGN KEY REFERENCES Quartos(QuartoID),
+    Data DATE,
+    TarifaEfetiva DECIMAL(10,2)
+);
+GO
+CREATE CLUSTERED INDEX CX_OcupacaoDiaria ON OcupacaoDiaria (Data) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(Data);
+GO
+
+-- CalendarioTarifas
+CREATE TABLE CalendarioTarifas (
+    Data DATE,
+    Tipo NVARCHAR(50),
+    FatorSazonal DECIMAL(6,4),
+    FatorDiaSemana DECIMAL(6,4),
+    FatorTarifa DECIMAL(9,6),
+    TarifaReferencia DECIMAL(10,2),
+    PRIMARY KEY (Data, Tipo)
+);
+GO
+
+-- CuboHotelDia (particionada por ano de Data)
+CREATE TABLE CuboHotelDia (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    Data DATE,
+    QuartosDisponiveis INT,
+    DiariasOcupadas INT,
+    ReceitaDiarias DECIMAL(14,2),
+    CheckIns INT,
+    Cancelamentos INT,
+    NoShows INT,
+    PRIMARY KEY NONCLUSTERED (HotelID, Data)
+);
+GO
+CREATE CLUSTERED INDEX CX_CuboHotelDia ON CuboHotelDia (Data) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(Data);
+GO
+
+-- CuboHotelMes
+CREATE TABLE CuboHotelMes (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    AnoMes NVARCHAR(7),
+    TipoQuarto NVARCHAR(50),
+    CanalID INT FOREIGN KEY REFERENCES CanaisVenda(CanalID),
+    Reservas INT,
+    Confirmadas INT,
+    Cancelamentos INT,
+    NoShows INT,
+    DiariasOcupadas INT,
+    ReceitaDiarias DECIMAL(14,2),
+    ReceitaTotal DECIMAL(14,2),
+    PRIMARY KEY (HotelID, AnoMes, TipoQuarto, CanalID)
+);
+GO
+
+-- PickupHotelDia (particionada por ano de DataEstadia)
+CREATE TABLE PickupHotelDia (
+    HotelID INT FOREIGN KEY REFERENCES Hoteis(HotelID),
+    DataEstadia DATE,
+    DiasAntecedencia INT,
+    DiariasNoLivro INT,
+    DiariasCanceladas INT,
+    PRIMARY KEY NONCLUSTERED (HotelID, DataEstadia, DiasAntecedencia)
+);
+GO
+CREATE CLUSTERED INDEX CX_PickupHotelDia ON PickupHotelDia (DataEstadia) WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno(DataEstadia);
+GO
+
+-- Índices não clusterizados (alinhados às partições nas fatos)
+CREATE NONCLUSTERED INDEX IX_Quartos_HotelID ON Quartos (HotelID);
+CREATE NONCLUSTERED INDEX IX_Funcionarios_HotelID ON Funcionarios (HotelID);
+CREATE NONCLUSTERED INDEX IX_Funcionarios_DepartamentoID ON Funcionarios (DepartamentoID);
+CREATE NONCLUSTERED INDEX IX_Fornecedores_HotelID ON Fornecedores (HotelID);
+CREATE NONCLUSTERED INDEX IX_EstoqueProdutos_HotelID ON EstoqueProdutos (HotelID);
+CREATE NONCLUSTERED INDEX IX_Eventos_HotelID ON Eventos (HotelID);
+CREATE NONCLUSTERED INDEX IX_Reservas_HotelID ON Reservas (HotelID) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Reservas_QuartoID ON Reservas (QuartoID) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Reservas_ClienteID ON Reservas (ClienteID) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Reservas_CanalID ON Reservas (CanalID) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Reservas_DataCheckIn ON Reservas (DataCheckIn) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Pagamentos_ReservaID ON Pagamentos (ReservaID) INCLUDE (Valor, DataPagamento, AnoMes) ON ps_PorAno(DataPagamento);
+CREATE NONCLUSTERED INDEX IX_Pagamentos_DataPagamento ON Pagamentos (DataPagamento) ON ps_PorAno(DataPagamento);
+CREATE NONCLUSTERED INDEX IX_ReservaServicos_ServicoID ON ReservaServicos (ServicoID);
+CREATE NONCLUSTERED INDEX IX_Feedback_ReservaID ON Feedback (ReservaID) ON ps_PorAno(DataFeedback);
+CREATE NONCLUSTERED INDEX IX_Feedback_DataFeedback ON Feedback (DataFeedback) ON ps_PorAno(DataFeedback);
+CREATE NONCLUSTERED INDEX IX_Manutencoes_HotelID ON Manutencoes (HotelID);
+CREATE NONCLUSTERED INDEX IX_Manutencoes_QuartoID ON Manutencoes (QuartoID);
+CREATE NONCLUSTERED INDEX IX_Reclamacoes_ReservaID ON Reclamacoes (ReservaID) ON ps_PorAno(DataReclamacao);
+CREATE NONCLUSTERED INDEX IX_Reclamacoes_HotelID ON Reclamacoes (HotelID) ON ps_PorAno(DataReclamacao);
+CREATE NONCLUSTERED INDEX IX_Reclamacoes_DataReclamacao ON Reclamacoes (DataReclamacao) ON ps_PorAno(DataReclamacao);
+CREATE NONCLUSTERED INDEX IX_MovimentosEstoque_HotelID ON MovimentosEstoque (HotelID) ON ps_PorAno(DataMovimento);
+CREATE NONCLUSTERED INDEX IX_MovimentosEstoque_ProdutoID ON MovimentosEstoque (ProdutoID) ON ps_PorAno(DataMovimento);
+CREATE NONCLUSTERED INDEX IX_MovimentosEstoque_DataMovimento ON MovimentosEstoque (DataMovimento) ON ps_PorAno(DataMovimento);
+CREATE NONCLUSTERED INDEX IX_OcupacaoDiaria_HotelID ON OcupacaoDiaria (HotelID) ON ps_PorAno(Data);
+CREATE NONCLUSTERED INDEX IX_OcupacaoDiaria_QuartoID ON OcupacaoDiaria (QuartoID) ON ps_PorAno(Data);
+CREATE NONCLUSTERED INDEX IX_OcupacaoDiaria_Data ON OcupacaoDiaria (Data) ON ps_PorAno(Data);
+CREATE NONCLUSTERED INDEX IX_CuboHotelDia_Data ON CuboHotelDia (Data) ON ps_PorAno(Data);
+CREATE NONCLUSTERED INDEX IX_CuboHotelMes_CanalID ON CuboHotelMes (CanalID);
+CREATE NONCLUSTERED INDEX IX_PickupHotelDia_DataEstadia ON PickupHotelDia (DataEstadia) ON ps_PorAno(DataEstadia);
+CREATE NONCLUSTERED INDEX IX_Reservas_ReservaID ON Reservas (ReservaID) INCLUDE (HotelID, QuartoID, ClienteID, DataCheckIn, DataCheckOut, CheckInAno, CheckInMes) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Reservas_CheckInAno_CheckInMes ON Reservas (CheckInAno, CheckInMes) INCLUDE (ReservaID) ON ps_PorAno(DataCheckIn);
+CREATE NONCLUSTERED INDEX IX_Pagamentos_Ano_Mes ON Pagamentos (Ano, Mes) INCLUDE (ReservaID, Valor) ON ps_PorAno(DataPagamento);
+CREATE NONCLUSTERED INDEX IX_OcupacaoDiaria_HotelID_Data ON OcupacaoDiaria (HotelID, Data) INCLUDE (QuartoID, TarifaEfetiva) ON ps_PorAno(Data);
+GO
@@ -19,11 +19,14 @@ WITH DiariasReservadas AS (
 ),
 
 -- CTE 2: Agrega o valor total de pagamentos para cada reserva, obtendo a receita por reserva.
+-- A data do último pagamento sai daqui: juntar Pagamentos de novo na consulta principal
+-- repetiria cada reserva uma vez por pagamento (receita e diárias multiplicadas).
 ReceitaPorReserva AS (
     SELECT 
         R.HotelID,
         R.ReservaID,
-        SUM(P.Valor) AS ReceitaReserva
+        SUM(P.Valor) AS ReceitaReserva,
+        MAX(P.DataPagamento) AS DataPagamento
     FROM Reservas R
     INNER JOIN Pagamentos P ON R.ReservaID = P.ReservaID
     GROUP BY R.HotelID, R.ReservaID
@@ -42,8 +45,8 @@ CapacidadeHotel AS (
 -- Consulta Principal: Agrega todas as métricas por hotel, ano e mês.
 SELECT 
     H.NomeHotel,
-    YEAR(P.DataPagamento) AS Ano,
-    MONTH(P.DataPagamento) AS Mes,
+    YEAR(RPR.DataPagamento) AS Ano,
+    MONTH(RPR.DataPagamento) AS Mes,
     
     -- Métrica: Receita Total (Soma da receita de todas as reservas no período)
     CAST(SUM(RPR.ReceitaReserva) AS DECIMAL(10,2)) AS ReceitaTotal,
@@ -52,27 +55,25 @@ SELECT
     CAST(SUM(DR.DiariasOcupadas) AS INT) AS DiariasOcupadas,
     
     -- Métrica: Diárias Disponíveis (Capacidade total de quartos * número de dias do mês)
-    (MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(P.DataPagamento)))) AS DiariasDisponiveis,
+    (MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))) AS DiariasDisponiveis,
     
     -- Métrica: ADR (Average Daily Rate) - Receita Média por Diária Ocupada
     CAST(SUM(RPR.ReceitaReserva) / NULLIF(SUM(DR.DiariasOcupadas),0) AS DECIMAL(10,2)) AS ADR,
     
     -- Métrica: Taxa de Ocupação (%) - Diárias Ocupadas em relação às Disponíveis
     CAST(SUM(DR.DiariasOcupadas) * 1.0 / 
-             NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(P.DataPagamento)))),0) * 100 AS DECIMAL(5,2)) 
+             NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))),0) * 100 AS DECIMAL(5,2)) 
              AS TaxaOcupacao,
     
     -- Métrica: RevPAR (Revenue Per Available Room) - Receita por Diária Disponível
-    CAST(SUM(RPR.ReceitaReserva) / NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(P.DataPagamento)))),0) AS DECIMAL(10,2)) 
+    CAST(SUM(RPR.ReceitaReserva) / NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))),0) AS DECIMAL(10,2)) 
              AS RevPAR
 FROM ReceitaPorReserva RPR
 -- Junções para vincular todas as CTEs e tabelas.
 INNER JOIN DiariasReservadas DR ON RPR.ReservaID = DR.ReservaID
-INNER JOIN Reservas R ON R.ReservaID = DR.ReservaID
-INNER JOIN Pagamentos P ON R.ReservaID = P.ReservaID
-INNER JOIN Hoteis H ON R.HotelID = H.HotelID
+INNER JOIN Hoteis H ON RPR.HotelID = H.HotelID
 INNER JOIN CapacidadeHotel CH ON H.HotelID = CH.HotelID
-GROUP BY H.NomeHotel, YEAR(P.DataPagamento), MONTH(P.DataPagamento)
+GROUP BY H.NomeHotel, YEAR(RPR.DataPagamento), MONTH(RPR.DataPagamento)
 ORDER BY Ano, Mes, H.NomeHotel;
 
 
@@ -0,0 +1,5 @@
+# Criado e implementado por Natan Vicente
+# https://github.com/natancent1
+# LinkedIn: https://www.linkedin.com/in/natanael-vicente-4b3b0a97/
+# =========================
+"""Módulos de apoio ao gerador (01_hotel_portfolio_generator_.py)."""
@@ -0,0 +1,60 @@
+# =========================
+# AMOSTRADORES CATEGÓRICOS PRÉ-COMPILADOS
+# =========================
+"""Distribuições categóricas validadas e compiladas uma vez (tabela acumulada).
+
+Amostrador(valores, pesos) normaliza os pesos e guarda a CDF na construção; cada sorteio é
+um uniforme + busca binária na tabela (k <= algumas centenas de categorias), sem
+renormalizar nem alocar a cada chamada. Pesos inválidos (negativos, NaN/inf, soma zero,
+comprimento diferente dos valores) levantam ValueError na construção, em vez de virar
+uniforme em silêncio. Sem pesos, o sorteio é uniforme.
+
+A CDF e o consumo do gerador são os mesmos de Generator.choice(k, size, p=...) (cumsum de
+p, dividido pelo último termo, um random() por sorteio e searchsorted side="right"), então
+trocar choice por um Amostrador não muda os dados gerados com a mesma semente.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+class Amostrador:
+    """Sorteio de `valores` com `pesos` (opcionais, não precisam somar 1)."""
+    def __init__(self, valores, pesos=None):
+        self.lista = list(valores)
+        self.valores = np.asarray(valores)
+        self.k = len(self.lista)
+        if self.k == 0:
+            raise ValueError("Amostrador sem valores")
+        self.cdf = None
+        if pesos is not None:
+            w = np.asarray(pesos, dtype=float)
+            if w.shape != (self.k,):
+                raise ValueError(f"{len(w)} pesos para {self.k} valores")
+            if not np.isfinite(w).all() or (w < 0).any() or w.sum() <= 0:
+                raise ValueError(f"Pesos inválidos: {w.tolist()} (precisam ser finitos, >= 0 e com soma > 0)")
+            cdf = (w / w.sum()).cumsum()
+            self.cdf = cdf / cdf[-1]
+            self._cdf_lista = self.cdf.tolist()
+
+    @property
+    def probabilidades(self):
+        if self.cdf is None:
+            return np.full(self.k, 1 / self.k)
+        return np.diff(self.cdf, prepend=0.0)
+
+    def um(self, rng):
+        """Um valor (objeto Python original)."""
+        if self.cdf is None:
+            return self.lista[rng.integers(self.k)]
+        return self.lista[bisect_right(self._cdf_lista, rng.random())]
+
+    def indices(self, rng, n):
+        """Posições (int64) de n sorteios."""
+        if self.cdf is None:
+            return rng.integers(0, self.k, size=n)
+        return np.searchsorted(self.cdf, rng.random(n), side="right")
+
+    def sortear(self, rng, n):
+        """Array NumPy com n valores sorteados."""
+        return self.valores[self.indices(rng, n)]
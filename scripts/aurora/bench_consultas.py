@@ -0,0 +1,142 @@
+# =========================
+# BENCHMARK DAS CONSULTAS: ESQUEMA PADRÃO x PERFORMANCE
+# =========================
+"""Roda as 4 consultas de 05_analysis_queries.sql no esquema padrão e no de performance.
+
+Uso (a partir de scripts/):
+    python -m aurora.bench_consultas --sf 0.1 1 --motores sqlite duckdb --repeticoes 3
+
+Para cada scale factor o gerador roda em um diretório temporário; cada motor recebe duas
+cargas dos mesmos CSVs: "padrao" (03_CriaTabelas.sql, índices de PK/FK da carga) e
+"performance" (03_CriaTabelas_Performance.sql + aurora.fisico.ajustes_embutidos, consultas
+reescritas sobre as chaves de período). Cada consulta roda uma vez para aquecer e depois
+--repeticoes vezes (vale o menor tempo); os resultados das duas variantes são comparados.
+Os tempos vão para o CSV de resultados e os planos (EXPLAIN) para --planos.
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from .benchmark import BENCH_DIR, _commit_atual, executar
+from .carga import MOTORES, Carga, duckdb
+from .fisico import DDL_PERFORMANCE_PATH, ajustes_embutidos, consultas_base, consultas_performance, traduzir
+from .metricas import Etapas
+from .schema import DDL_PATH
+
+CAMPOS = ["data_execucao", "commit", "sf", "motor", "esquema", "consulta", "segundos",
+          "linhas", "carga_s", "indices_s", "resultado"]
+
+ESQUEMAS = {
+    # esquema: (DDL, ajustes físicos, consultas)
+    "padrao":      (DDL_PATH, None, consultas_base),
+    "performance": (DDL_PERFORMANCE_PATH, ajustes_embutidos, consultas_performance),
+}
+
+def _conectar(motor, path):
+    return sqlite3.connect(path) if motor == "sqlite" else duckdb.connect(path, read_only=True)
+
+def plano(con, motor, sql):
+    """Plano de execução como texto (EXPLAIN QUERY PLAN no SQLite, EXPLAIN no DuckDB)."""
+    if motor == "sqlite":
+        return "\n".join(f"{pai:>4} {id_:>4}  {detalhe}"
+                         for id_, pai, _, detalhe in con.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall())
+    return "\n".join(linha[-1] for linha in con.execute(f"EXPLAIN {sql}").fetchall())
+
+def cronometrar(con, sql, repeticoes):
+    """(menor tempo em segundos, linhas do resultado) após uma execução de aquecimento."""
+    resultado = con.execute(sql).fetchall()
+    tempos = []
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        con.execute(sql).fetchall()
+        tempos.append(time.perf_counter() - ini)
+    return min(tempos), resultado
+
+def _normalizar(linhas):
+    # DECIMAL vira Decimal/float conforme o motor: compara arredondado em 2 casas; o ORDER BY
+    # das consultas não é total (ex.: consulta 3 só por segmento), então compara ordenado
+    return sorted((tuple(round(float(v), 2) if isinstance(v, (int, float)) or hasattr(v, "as_tuple") else v
+                   for v in linha) for linha in linhas), key=repr)
+
+def medir_motor(origem, motor, repeticoes, pasta_planos, rotulo):
+    """Carrega os dois esquemas no motor e devolve os registros por (esquema, consulta)."""
+    registros, resultados = [], {}
+    for esquema, (ddl_path, ajustes, consultas) in ESQUEMAS.items():
+        destino = os.path.join(origem, f"bench_{esquema}.{motor}")
+        etapas = Etapas()
+        Carga(motor, destino, origem, etapas=etapas, ddl_path=ddl_path, ajustes=ajustes).executar()
+        regs = etapas.registros
+        carga_s = regs["carga"]["segundos"] + regs.get("fisico:reordenar", {}).get("segundos", 0.0)
+        indices_s = regs["indices"]["segundos"] + regs.get("fisico:indices", {}).get("segundos", 0.0)
+        con = _conectar(motor, destino)
+        try:
+            for i, sql in enumerate(consultas(), start=1):
+                sql = traduzir(sql, motor)
+                segundos, resultado = cronometrar(con, sql, repeticoes)
+                resultados[(esquema, i)] = _normalizar(resultado)
+                with open(os.path.join(pasta_planos, f"{rotulo}_{motor}_{esquema}_q{i}.txt"), "w",
+                          encoding="utf-8") as f:
+                    f.write(sql.strip() + "\n\n-- PLANO\n" + plano(con, motor, sql) + "\n")
+                registros.append({"motor": motor, "esquema": esquema, "consulta": i, "segundos": segundos,
+                                  "linhas": len(resultado), "carga_s": carga_s, "indices_s": indices_s})
+        finally:
+            con.close()
+        os.remove(destino)
+    for reg in registros:
+        igual = resultados[("padrao", reg["consulta"])] == resultados[("performance", reg["consulta"])]
+        reg["resultado"] = "igual" if igual else "DIFERENTE"
+    return registros
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Consultas de análise: esquema padrão x performance.")
+    ap.add_argument("--sf", type=float, nargs="+", default=[0.1, 1])
+    ap.add_argument("--motores", nargs="+", choices=MOTORES, default=list(MOTORES))
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=None, help="workers do gerador")
+    ap.add_argument("--resultados", default=os.path.join(BENCH_DIR, "consultas.csv"))
+    ap.add_argument("--planos", default=os.path.join(BENCH_DIR, "planos"))
+    args = ap.parse_args(argv)
+
+    quando, commit = datetime.now().isoformat(timespec="seconds"), _commit_atual()
+    os.makedirs(os.path.dirname(os.path.abspath(args.resultados)), exist_ok=True)
+    os.makedirs(args.planos, exist_ok=True)
+    novo_arquivo = not os.path.exists(args.resultados)
+    diferentes = 0
+
+    with open(args.resultados, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CAMPOS)
+        if novo_arquivo:
+            w.writeheader()
+        for sf in args.sf:
+            with tempfile.TemporaryDirectory(prefix=f"aurora_consultas_sf{sf:g}_") as tmp:
+                executar(sf, args.workers, saida=tmp)
+                for motor in args.motores:
+                    registros = medir_motor(tmp, motor, args.repeticoes, args.planos, f"sf{sf:g}")
+                    print(f"\n=== SF {sf:g} / {motor} ===")
+                    por_chave = {(r["esquema"], r["consulta"]): r for r in registros}
+                    for i in sorted({r["consulta"] for r in registros}):
+                        p, o = por_chave[("padrao", i)], por_chave[("performance", i)]
+                        ganho = p["segundos"] / o["segundos"] if o["segundos"] else float("inf")
+                        print(f"consulta {i}: padrao {p['segundos']:8.4f}s  performance {o['segundos']:8.4f}s  "
+                              f"x{ganho:5.2f}  {p['linhas']:>6,d} linhas  {o['resultado']}")
+                    for esquema in ESQUEMAS:
+                        r = por_chave[(esquema, 1)]
+                        print(f"carga {esquema:12s} {r['carga_s']:8.3f}s  índices {r['indices_s']:8.3f}s")
+                    for reg in registros:
+                        diferentes += reg["resultado"] != "igual"
+                        w.writerow({"data_execucao": quando, "commit": commit, "sf": sf, **reg})
+                    f.flush()
+
+    print(f"\nResultados -> {args.resultados}\nPlanos -> {args.planos}")
+    if diferentes:
+        print(f"{diferentes} medição(ões) com resultado DIFERENTE entre os esquemas")
+    return 1 if diferentes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# =========================
+# BENCHMARK POR ETAPA E SCALE FACTOR
+# =========================
+"""Roda o gerador em vários scale factors e registra tempo, linhas/s e pico de RSS por etapa.
+
+Uso (a partir de scripts/):
+    python -m aurora.benchmark --sf 0.1 1 10 100
+    python -m aurora.benchmark --sf 0.1 1 --salvar-baseline
+
+Cada execução é anexada ao arquivo de resultados (CSV). Com um baseline salvo, etapas cujo
+linhas/s cair ou cujo aumento do pico de RSS (delta_pico_rss_mb, o quanto a própria etapa
+subiu o pico do processo principal e dos workers) crescer além da tolerância são marcadas
+como REGRESSAO (código de saída 1).
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GERADOR = os.path.join(SCRIPTS_DIR, "01_hotel_portfolio_generator_.py")
+BENCH_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "benchmarks")
+
+CAMPOS = ["data_execucao", "commit", "sf", "workers", "streaming", "etapa", "segundos",
+          "linhas", "linhas_s", "pico_rss_mb", "delta_pico_rss_mb", "status"]
+
+# Etapas mais curtas que isso não são comparadas (ruído de medição domina)
+MIN_SEGUNDOS = 0.5
+# Aumentos de pico menores que isso acima do baseline não contam (ruído do alocador)
+MIN_DELTA_RSS_MB = 32
+
+def _commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def executar(sf, workers=None, streaming=False, formatos="csv", saida=None):
+    """Roda o gerador em um diretório temporário e devolve as métricas de cada etapa.
+
+    Com `saida`, os arquivos gerados ficam nessa pasta (ex.: para carregar depois).
+    """
+    with tempfile.TemporaryDirectory(prefix=f"aurora_sf{sf:g}_") as tmp:
+        metricas = os.path.join(tmp, "metricas.jsonl")
+        env = dict(os.environ, AURORA_SF=str(sf), AURORA_OUTPUT_DIR=saida or os.path.join(tmp, "saida"),
+                   AURORA_METRICAS=metricas, AURORA_STREAMING="1" if streaming else "0",
+                   AURORA_FORMATOS=formatos)
+        if workers is not None:
+            env["AURORA_WORKERS"] = str(workers)
+        proc = subprocess.run([sys.executable, GERADOR], cwd=SCRIPTS_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Gerador falhou em SF={sf:g}:\n{proc.stderr}")
+        with open(metricas, encoding="utf-8") as f:
+            return [json.loads(linha) for linha in f]
+
+def carregar_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def comparar(reg, base, tolerancia):
+    """OK / REGRESSAO / SEM_BASELINE para uma etapa."""
+    if base is None:
+        return "SEM_BASELINE"
+    if reg["segundos"] < MIN_SEGUNDOS and base.get("segundos", 0) < MIN_SEGUNDOS:
+        return "OK"
+    if reg["linhas_s"] and base.get("linhas_s") and reg["linhas_s"] < base["linhas_s"] * (1 - tolerancia):
+        return "REGRESSAO"
+    # o pico acumulado só cresce: compara o quanto a etapa o subiu, não o valor absoluto
+    delta, base_delta = reg.get("delta_pico_rss_mb"), base.get("delta_pico_rss_mb")
+    if delta is not None and base_delta is not None and \
+            delta > max(base_delta, 0) * (1 + tolerancia) + MIN_DELTA_RSS_MB:
+        return "REGRESSAO"
+    return "OK"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark do gerador por etapa e scale factor.")
+    ap.add_argument("--sf", type=float, nargs="+", default=[0.1, 1, 10, 100])
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--streaming", action="store_true", help="roda o gerador em MODO_STREAMING")
+    ap.add_argument("--formatos", default="csv")
+    ap.add_argument("--resultados", default=os.path.join(BENCH_DIR, "resultados.csv"))
+    ap.add_argument("--baseline", default=os.path.join(BENCH_DIR, "baseline.json"))
+    ap.add_argument("--salvar-baseline", action="store_true", help="grava estas medições como novo baseline")
+    ap.add_argument("--tolerancia", type=float, default=0.20)
+    args = ap.parse_args(argv)
+
+    baseline = carregar_baseline(args.baseline)
+    quando, commit = datetime.now().isoformat(timespec="seconds"), _commit_atual()
+    os.makedirs(os.path.dirname(os.path.abspath(args.resultados)), exist_ok=True)
+    novo_arquivo = not os.path.exists(args.resultados)
+    campos = CAMPOS
+    if not novo_arquivo:
+        # arquivo de versões anteriores: continua com as colunas do cabeçalho dele
+        with open(args.resultados, newline="", encoding="utf-8") as f:
+            campos = next(csv.reader(f), CAMPOS)
+    regressoes = 0
+
+    with open(args.resultados, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=campos, extrasaction="ignore")
+        if novo_arquivo:
+            w.writeheader()
+        for sf in args.sf:
+            print(f"\n=== SF {sf:g} ===")
+            registros = executar(sf, args.workers, args.streaming, args.formatos)
+            base_sf = baseline.get(f"{sf:g}", {})
+            for reg in registros:
+                reg["status"] = comparar(reg, base_sf.get(reg["etapa"]), args.tolerancia)
+                regressoes += reg["status"] == "REGRESSAO"
+                w.writerow({"data_execucao": quando, "commit": commit, **reg})
+                print(f"{reg['etapa']:18s} {reg['segundos']:9.3f}s {reg['linhas']:>12,d} linhas "
+                      f"{reg['linhas_s'] or 0:>14,.0f} linhas/s  pico {reg['pico_rss_mb'] or 0:8.1f} MB "
+                      f"(+{reg.get('delta_pico_rss_mb') or 0:.1f})  {reg['status']}")
+            if args.salvar_baseline:
+                campos = ("segundos", "linhas", "linhas_s", "pico_rss_mb", "delta_pico_rss_mb")
+                baseline[f"{sf:g}"] = {r["etapa"]: {k: r.get(k) for k in campos} for r in registros}
+            f.flush()
+
+    if args.salvar_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline -> {args.baseline}")
+    print(f"\nResultados -> {args.resultados}")
+    if regressoes:
+        print(f"{regressoes} etapa(s) com REGRESSAO (tolerância {args.tolerancia:.0%})")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
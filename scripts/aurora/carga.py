@@ -0,0 +1,265 @@
+# =========================
+# CARGA EM BANCO LOCAL (SQLite / DuckDB)
+# =========================
+"""Cria o esquema de 03_CriaTabelas.sql em um banco embutido e carrega todas as tabelas.
+
+Uso (a partir de scripts/):
+    python -m aurora.carga --motor duckdb --origem <pasta dos CSVs> --destino aurora.duckdb
+    python -m aurora.carga --motor sqlite --origem <pasta dos CSVs> --destino aurora.sqlite
+
+A origem é a pasta de saída do gerador ou um dict {tabela: DataFrame | [chunks]} com os
+frames em memória. As tabelas são criadas sem restrições e carregadas em níveis de
+dependência de FK; as de um mesmo nível carregam em paralelo (threads). No SQLite os lotes
+vão por executemany em uma única conexão (um escritor por vez; a leitura dos CSVs é que
+corre em paralelo); no DuckDB cada thread tem seu cursor e insere direto do CSV (read_csv)
+ou do DataFrame registrado. PKs viram índices únicos e FKs índices + checagem de órfãos,
+tudo depois da carga: nenhum dos dois motores aceita adicionar FK a uma tabela existente.
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .escrita_csv import arquivos_csv
+from .metricas import Etapas
+from .schema import DDL_PATH, carregar_ddl, restricoes_ddl, para_texto
+
+try:
+    import duckdb
+except ImportError:  # opcional: só para --motor duckdb
+    duckdb = None
+
+MOTORES = ("sqlite", "duckdb")
+LOTE = 100_000
+
+def _tipo_sql(col, motor):
+    """Tipo da coluna no motor: INTEGER, DATE, DECIMAL(p,s) e textos (TEXT / VARCHAR)."""
+    if col.tipo == "INT":
+        return "INTEGER"
+    if col.tipo == "DATE":
+        return "DATE"
+    if col.tipo == "DECIMAL":
+        return f"DECIMAL({col.precisao},{col.escala})"
+    return "TEXT" if motor == "sqlite" else "VARCHAR"
+
+def niveis_dependencia(tabelas, ddl_path=DDL_PATH):
+    """Agrupa as tabelas em níveis: cada uma só depende (por FK) de tabelas de níveis anteriores."""
+    restricoes = restricoes_ddl(ddl_path)
+    nivel = {}
+    def calcular(t):
+        if t not in nivel:
+            pais = {ref for _, ref, _ in restricoes[t].fks if ref != t}
+            nivel[t] = 1 + max((calcular(p) for p in pais), default=-1)
+        return nivel[t]
+    for t in tabelas:
+        calcular(t)
+    niveis = [[] for _ in range(max(nivel.values(), default=-1) + 1)]
+    for t in tabelas:
+        niveis[nivel[t]].append(t)
+    return [n for n in niveis if n]
+
+def _lotes_csv(paths, colunas):
+    """Lotes dos CSVs da tabela (partes, .gz/.zst) como texto (o motor converte pelo tipo da
+    coluna), só com as colunas do DDL."""
+    for path in paths:
+        usar = [c for c in pd.read_csv(path, nrows=0).columns if c in colunas]
+        for df in pd.read_csv(path, usecols=usar, dtype=str, keep_default_na=False, na_values=[""],
+                              chunksize=LOTE, encoding="utf-8"):
+            yield df
+
+def _lotes_frames(frames, tabela, colunas):
+    """Lotes dos frames em memória (tipos compactos -> datas ISO e decimais em float)."""
+    for df in frames if isinstance(frames, (list, tuple)) else [frames]:
+        df = df[[c for c in df.columns if c in colunas]]
+        for ini in range(0, len(df), LOTE):
+            yield para_texto(df.iloc[ini:ini + LOTE], tabela)
+
+class Carga:
+    """Uma carga completa em um banco: esquema, dados (por níveis de FK) e restrições.
+
+    ddl_path escolhe o DDL (ex.: 03_CriaTabelas_Performance.sql); ajustes(motor, tabelas) devolve
+    (reordenar, índices), listas de SQL rodadas antes e depois dos índices de PK/FK
+    (ver aurora.fisico.ajustes_embutidos).
+    """
+    def __init__(self, motor, destino, origem, workers=None, etapas=None, ddl_path=DDL_PATH, ajustes=None):
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconhecido: {motor} (use {', '.join(MOTORES)})")
+        if motor == "duckdb" and duckdb is None:
+            raise ImportError("--motor duckdb requer duckdb (pip install duckdb).")
+        self.motor = motor
+        self.destino = destino
+        self.origem = origem
+        self.workers = workers or os.cpu_count() or 1
+        self.etapas = etapas or Etapas()
+        self.ddl_path = ddl_path
+        self.ddl = carregar_ddl(ddl_path)
+        self.ajustes = ajustes
+        self.lock = threading.Lock()
+        self.violacoes = []
+
+    # ----- origem -----
+    def _tabelas_disponiveis(self):
+        if isinstance(self.origem, dict):
+            return [t for t in self.ddl if t in self.origem]
+        return [t for t in self.ddl if arquivos_csv(self.origem, t)]
+
+    def _csv(self, tabela):
+        """Arquivos CSV da tabela: único ou partes, comprimidos ou não."""
+        return arquivos_csv(self.origem, tabela)
+
+    # ----- conexão -----
+    def _conectar(self):
+        if os.path.exists(self.destino):
+            os.remove(self.destino)
+        if self.motor == "sqlite":
+            con = sqlite3.connect(self.destino, check_same_thread=False, isolation_level=None)
+            # carga descartável: sem journal nem fsync (refazer a carga é a recuperação)
+            con.execute("PRAGMA journal_mode = OFF")
+            con.execute("PRAGMA synchronous = OFF")
+            con.execute("PRAGMA cache_size = -262144")
+            return con
+        return duckdb.connect(self.destino)
+
+    def _criar_tabelas(self, con, tabelas):
+        for t in tabelas:
+            cols = ", ".join(f"{c.nome} {_tipo_sql(c, self.motor)}" for c in self.ddl[t])
+            con.execute(f"CREATE TABLE {t} ({cols})")
+
+    # ----- dados -----
+    def _carregar_tabela(self, con, tabela):
+        colunas = [c.nome for c in self.ddl[tabela]]
+        with self.etapas.medir(f"carga:{tabela}", em_thread=True) as reg:
+            if self.motor == "sqlite":
+                reg["linhas"] += self._sqlite(con, tabela, colunas)
+            else:
+                reg["linhas"] += self._duckdb(con.cursor(), tabela, colunas)
+            if not isinstance(self.origem, dict):
+                reg["bytes"] += sum(os.path.getsize(p) for p in self._csv(tabela))
+        return tabela
+
+    def _sqlite(self, con, tabela, colunas):
+        lotes = (_lotes_frames(self.origem[tabela], tabela, colunas) if isinstance(self.origem, dict)
+                 else _lotes_csv(self._csv(tabela), colunas))
+        linhas = 0
+        for df in lotes:
+            # listas Python por coluna (sqlite3 não aceita escalares NumPy); NaN/NaT -> NULL
+            valores = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns]
+            sql = f"INSERT INTO {tabela} ({', '.join(df.columns)}) VALUES ({', '.join('?' * len(df.columns))})"
+            with self.lock:
+                con.execute("BEGIN")
+                con.executemany(sql, zip(*valores))
+                con.execute("COMMIT")
+            linhas += len(df)
+        return linhas
+
+    def _duckdb(self, cur, tabela, colunas):
+        if isinstance(self.origem, dict):
+            linhas = 0
+            for df in _lotes_frames(self.origem[tabela], tabela, colunas):
+                cur.register("lote", df)
+                cur.execute(f"INSERT INTO {tabela} ({', '.join(df.columns)}) SELECT * FROM lote")
+                cur.unregister("lote")
+                linhas += len(df)
+            return linhas
+        # leitor CSV nativo; tudo como texto para não perder zeros à esquerda (CPF, telefone)
+        paths = self._csv(tabela)
+        usar = [c for c in pd.read_csv(paths[0], nrows=0).columns if c in colunas]
+        cur.execute(f"INSERT INTO {tabela} ({', '.join(usar)}) SELECT {', '.join(usar)} "
+                    f"FROM read_csv(?, header = true, all_varchar = true)", [paths])
+        return cur.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+    # ----- restrições -----
+    def _restricoes(self, con, tabelas):
+        """Índices das PKs (únicos se não houver duplicatas) e das FKs, com contagem de violações."""
+        restricoes = restricoes_ddl(self.ddl_path)
+        for t in tabelas:
+            with self.etapas.medir(f"indices:{t}") as reg:
+                pk, fks = restricoes[t]
+                if pk:
+                    chave = ", ".join(pk)
+                    dup = con.execute(f"SELECT COUNT(*) FROM (SELECT {chave} FROM {t} "
+                                      f"GROUP BY {chave} HAVING COUNT(*) > 1) d").fetchone()[0]
+                    unico = "UNIQUE " if dup == 0 else ""
+                    con.execute(f"CREATE {unico}INDEX pk_{t} ON {t} ({chave})")
+                    if dup:
+                        self.violacoes.append((t, f"PK ({chave})", f"{dup} chaves duplicadas"))
+                for col, ref, ref_col in fks:
+                    if [col] != pk[:1]:
+                        con.execute(f"CREATE INDEX fk_{t}_{col} ON {t} ({col})")
+                    if ref not in tabelas:
+                        continue
+                    orfaos = con.execute(f"SELECT COUNT(*) FROM {t} f LEFT JOIN {ref} p ON f.{col} = p.{ref_col} "
+                                         f"WHERE f.{col} IS NOT NULL AND p.{ref_col} IS NULL").fetchone()[0]
+                    if orfaos:
+                        self.violacoes.append((t, f"FK {col} -> {ref}.{ref_col}", f"{orfaos} linhas órfãs"))
+                reg["linhas"] += con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+
+    def _executar_sql(self, con, comandos):
+        for sql in comandos:
+            con.execute(sql)
+
+    def executar(self):
+        tabelas = self._tabelas_disponiveis()
+        con = self._conectar()
+        try:
+            with self.etapas.medir("carga") as reg:
+                self._criar_tabelas(con, tabelas)
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    for nivel in niveis_dependencia(tabelas, self.ddl_path):
+                        list(pool.map(lambda t: self._carregar_tabela(con, t), nivel))
+                reg["linhas"] += sum(self.etapas.registros[f"carga:{t}"]["linhas"] for t in tabelas)
+            reordenar, indices = self.ajustes(self.motor, tabelas) if self.ajustes else ([], [])
+            if reordenar:
+                with self.etapas.medir("fisico:reordenar"):
+                    self._executar_sql(con, reordenar)
+            with self.etapas.medir("indices"):
+                self._restricoes(con, tabelas)
+            if indices:
+                with self.etapas.medir("fisico:indices"):
+                    self._executar_sql(con, indices)
+        finally:
+            con.close()
+        self.etapas.fechar()
+        return tabelas
+
+    def relatorio(self, tabelas):
+        """Tabela de texto com linhas/s por tabela e as violações de restrição encontradas."""
+        regs = {r["etapa"]: r for r in self.etapas.linhas()}
+        out = [f"{'Tabela':22s} {'linhas':>12s} {'seg':>9s} {'linhas/s':>12s} {'índices seg':>12s}"]
+        for t in tabelas:
+            r, i = regs[f"carga:{t}"], regs[f"indices:{t}"]
+            out.append(f"{t:22s} {r['linhas']:>12,d} {r['segundos']:9.3f} {r['linhas_s'] or 0:>12,.0f} "
+                       f"{i['segundos']:12.3f}")
+        total, idx = regs["carga"], regs["indices"]
+        out.append(f"{'TOTAL':22s} {total['linhas']:>12,d} {total['segundos']:9.3f} "
+                   f"{total['linhas_s'] or 0:>12,.0f} {idx['segundos']:12.3f}")
+        for t, restricao, problema in self.violacoes:
+            out.append(f"VIOLAÇÃO {t}: {restricao}: {problema}")
+        return "\n".join(out)
+
+def carregar(motor, destino, origem, workers=None, etapas=None, ddl_path=DDL_PATH, ajustes=None):
+    """Carrega a origem (pasta de CSVs ou dict de frames) no banco; imprime e retorna a Carga."""
+    carga = Carga(motor, destino, origem, workers, etapas, ddl_path, ajustes)
+    tabelas = carga.executar()
+    print(f"\n=== CARGA {motor.upper()} -> {destino} ===")
+    print(carga.relatorio(tabelas))
+    return carga
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Carrega a saída do gerador em SQLite ou DuckDB.")
+    ap.add_argument("--motor", choices=MOTORES, default="duckdb")
+    ap.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."),
+                    help="pasta com os CSVs do gerador")
+    ap.add_argument("--destino", help="arquivo do banco (padrão: <origem>/aurora.<motor>)")
+    ap.add_argument("--workers", type=int, default=None, help="tabelas carregadas em paralelo")
+    ap.add_argument("--metricas", default=None, help="JSON lines com as métricas por tabela")
+    args = ap.parse_args(argv)
+    destino = args.destino or os.path.join(args.origem, f"aurora.{args.motor}")
+    carregar(args.motor, destino, args.origem, args.workers, Etapas(args.metricas, motor=args.motor))
+
+if __name__ == "__main__":
+    main()
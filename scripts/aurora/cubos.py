@@ -0,0 +1,85 @@
+# =========================
+# CUBOS DE AGREGADOS ADITIVOS
+# =========================
+"""Agregados pré-calculados (hotel x dia, hotel x mês x tipo de quarto x canal) para os painéis.
+
+Um Cubo é um array denso int64 por medida sobre o produto cartesiano das dimensões. Os
+shards devolvem agregados parciais esparsos (células tocadas + somas) calculados com
+`parcial`; o processo principal só soma. Como todas as medidas são aditivas (contagens e
+valores em centavos), anexar dados ou refazer um shard atualiza só as células afetadas:
+somar(parcial_novo) e, para substituir um shard, somar(parcial_antigo, sinal=-1).
+ADR e RevPAR saem das medidas (receita / diárias, receita / diárias disponíveis).
+"""
+
+import numpy as np
+import pandas as pd
+
+def parcial(forma, coords, medidas):
+    """Agregado parcial esparso: (células únicas, {medida: soma int64}) das linhas de um shard.
+
+    coords: tupla de arrays de posição (uma por dimensão); medidas: {nome: array} ou escalar 1.
+    """
+    n = len(coords[0])
+    flat = np.ravel_multi_index(coords, forma) if n else np.zeros(0, dtype=np.int64)
+    celulas, inv = np.unique(flat, return_inverse=True)
+    somas = {}
+    for nome, v in medidas.items():
+        pesos = None if np.ndim(v) == 0 else np.asarray(v, dtype=np.float64)
+        soma = np.bincount(inv.ravel(), weights=pesos, minlength=len(celulas))
+        somas[nome] = np.rint(soma * (1 if pesos is not None else v)).astype(np.int64)
+    return celulas, somas
+
+class Cubo:
+    """Medidas aditivas densas sobre as dimensões {nome: rótulos}, na ordem dada."""
+    def __init__(self, nome, dimensoes, medidas):
+        self.nome = nome
+        self.dimensoes = {d: np.asarray(r) for d, r in dimensoes.items()}
+        self.forma = tuple(len(r) for r in self.dimensoes.values())
+        self.medidas = list(medidas)
+        self.valores = {m: np.zeros(int(np.prod(self.forma)), dtype=np.int64) for m in self.medidas}
+
+    def somar(self, parcial, sinal=1):
+        celulas, somas = parcial
+        for m, v in somas.items():
+            np.add.at(self.valores[m], celulas, sinal * v)
+
+    def _celulas_com_dados(self):
+        return np.flatnonzero(np.any([v != 0 for v in self.valores.values()], axis=0))
+
+    def frame(self, todas=False):
+        """DataFrame longo (rótulos das dimensões + medidas); por padrão só as células com dados."""
+        celulas = np.arange(len(next(iter(self.valores.values())))) if todas else self._celulas_com_dados()
+        pos = np.unravel_index(celulas, self.forma)
+        df = pd.DataFrame({d: r[p] for (d, r), p in zip(self.dimensoes.items(), pos)})
+        for m in self.medidas:
+            df[m] = self.valores[m][celulas]
+        return df
+
+    # ----- estado (modo incremental) -----
+    def estado(self):
+        """Células com dados, em rótulos (independe do tamanho das dimensões)."""
+        celulas = self._celulas_com_dados()
+        pos = np.unravel_index(celulas, self.forma)
+        out = {f"dim:{d}": r[p] for (d, r), p in zip(self.dimensoes.items(), pos)}
+        out.update({f"med:{m}": self.valores[m][celulas] for m in self.medidas})
+        return out
+
+    def restaurar(self, estado):
+        """Soma um estado salvo; os rótulos são localizados nas dimensões atuais (que podem ter crescido)."""
+        pos = []
+        for d, r in self.dimensoes.items():
+            rotulos = estado[f"dim:{d}"]
+            p = pd.Index(r).get_indexer(rotulos)
+            if (p < 0).any():
+                raise ValueError(f"Cubo {self.nome}: rótulos de {d} fora das dimensões atuais")
+            pos.append(p)
+        celulas = np.ravel_multi_index(pos, self.forma) if len(pos[0]) else np.zeros(0, dtype=np.int64)
+        self.somar((celulas, {m: estado[f"med:{m}"] for m in self.medidas}))
+
+def salvar_cubos(path, cubos):
+    np.savez_compressed(path, **{f"{c.nome}|{k}": v for c in cubos for k, v in c.estado().items()})
+
+def restaurar_cubos(path, cubos):
+    with np.load(path, allow_pickle=False) as z:
+        for c in cubos:
+            c.restaurar({k.split("|", 1)[1]: z[k] for k in z.files if k.startswith(f"{c.nome}|")})
@@ -0,0 +1,123 @@
+# =========================
+# DISPONIBILIDADE DE QUARTOS (BITMAP QUARTO x NOITE)
+# =========================
+"""Índice de disponibilidade que impede que duas estadias confirmadas ocupem o mesmo quarto.
+
+O bitmap é um array uint64[hotel, dia, palavra]: o bit q da linha (hotel, dia) indica que o
+quarto local q (posição dentro do hotel) está ocupado naquela noite. Com os quartos de um
+hotel lado a lado, os quartos livres durante uma estadia saem de um OR das palavras das
+suas noites (np.bitwise_or.reduceat): O(noites) por reserva, sem laço por dia em Python.
+
+`alocar` recebe um lote de estadias (na ordem de prioridade) e devolve o quarto local de
+cada uma: o preferido se estiver livre; senão o próximo livre do mesmo tipo (ou, sem
+nenhum, de qualquer tipo) em ordem circular; -1 se o hotel estiver lotado em alguma noite.
+As escolhas do lote são feitas em rodadas vetorizadas: quando duas reservas do lote disputam
+o mesmo quarto-noite, fica a de menor posição e as demais tentam de novo na rodada seguinte.
+`ocupacao` (hotel x dia) conta as noites alocadas, para tarifas que dependam da ocupação.
+"""
+
+import numpy as np
+
+BITS = 64
+
+def _noites(checkin, noites):
+    """Uma linha por noite: (posição da estadia, dia) e o início de cada estadia nessas linhas."""
+    inicio = np.cumsum(noites) - noites
+    idx = np.repeat(np.arange(len(noites)), noites)
+    return idx, checkin[idx] + (np.arange(len(idx)) - inicio[idx]), inicio
+
+class Disponibilidade:
+    """Bitmap de ocupação dos quartos de todos os hotéis em n_dias noites.
+
+    q_qtd: quartos por hotel; tipos: tipo (inteiro) de cada quarto, contíguo por hotel.
+    """
+    def __init__(self, q_qtd, tipos, n_dias):
+        q_qtd = np.asarray(q_qtd, dtype=np.int64)
+        self.n_dias = n_dias
+        self.q_qtd = q_qtd
+        self.largura = BITS * max(1, -(-int(q_qtd.max(initial=1)) // BITS))
+        local = np.arange(self.largura)
+        # tipo de cada quarto local por hotel; -1 nas posições além do último quarto
+        self.tipo_local = np.full((len(q_qtd), self.largura), -1, dtype=np.int16)
+        validos = local[None, :] < q_qtd[:, None]
+        self.tipo_local[validos] = np.asarray(tipos)
+        # posições sem quarto nascem ocupadas em todas as noites
+        sem_quarto = np.packbits(~validos, axis=1, bitorder="little").view("<u8")
+        self.bits = np.repeat(sem_quarto[:, None, :], n_dias, axis=1)
+        self.ocupacao = np.zeros((len(q_qtd), n_dias), dtype=np.int32)
+
+    def _ocupados(self, hotel, checkin, noites):
+        """uint64[estadia, palavra]: OR das palavras de todas as noites de cada estadia."""
+        idx, dia, inicio = _noites(checkin, noites)
+        return np.bitwise_or.reduceat(self.bits[hotel[idx], dia], inicio, axis=0)
+
+    def livres(self, hotel, checkin, noites):
+        """bool[estadia, quarto local]: quartos livres em todas as noites de cada estadia."""
+        ocupados = self._ocupados(hotel, checkin, noites)
+        return np.unpackbits(np.ascontiguousarray(~ocupados).view(np.uint8), axis=1,
+                             bitorder="little").astype(bool)
+
+    def _escolher(self, hotel, checkin, noites, preferido):
+        # caso comum: o preferido está livre (teste de um bit); só o resto procura outro quarto
+        ocupados = self._ocupados(hotel, checkin, noites)
+        palavra = ocupados[np.arange(len(hotel)), preferido // BITS]
+        escolha = preferido.copy()
+        busca = np.flatnonzero((palavra >> (preferido % BITS).astype(np.uint64)) & np.uint64(1))
+        if len(busca) == 0:
+            return escolha
+        h, pref = hotel[busca], preferido[busca]
+        livre = np.unpackbits(np.ascontiguousarray(~ocupados[busca]).view(np.uint8), axis=1,
+                              bitorder="little").astype(bool)
+        tipo = self.tipo_local[h]
+        pos = np.arange(len(busca))
+        mesmo_tipo = livre & (tipo == tipo[pos, pref][:, None])
+        alvo = np.where(mesmo_tipo.any(axis=1)[:, None], mesmo_tipo, livre)
+        # distância circular a partir do preferido; ocupados ficam fora
+        dist = (np.arange(self.largura, dtype=np.int32)[None, :] - pref[:, None].astype(np.int32)) % self.largura
+        dist[~alvo] = self.largura
+        outro = dist.argmin(axis=1)
+        escolha[busca] = np.where(alvo[pos, outro], outro, -1)
+        return escolha
+
+    def alocar(self, hotel, checkin, noites, preferido, lote=8192):
+        """Quarto local de cada estadia (-1 se não houver), marcando as noites como ocupadas."""
+        hotel, checkin = np.asarray(hotel, dtype=np.int64), np.asarray(checkin, dtype=np.int64)
+        noites, preferido = np.asarray(noites, dtype=np.int64), np.asarray(preferido, dtype=np.int64)
+        quarto = np.full(len(hotel), -1, dtype=np.int64)
+        for ini in range(0, len(hotel), lote):
+            pend = np.arange(ini, min(ini + lote, len(hotel)))
+            while len(pend):
+                escolha = self._escolher(hotel[pend], checkin[pend], noites[pend], preferido[pend])
+                pend = pend[escolha >= 0]
+                escolha = escolha[escolha >= 0]
+                # disputa dentro da rodada: cada quarto-noite fica com a estadia de menor posição
+                idx, dia, _ = _noites(checkin[pend], noites[pend])
+                chave = (hotel[pend][idx] * self.n_dias + dia) * self.largura + escolha[idx]
+                ordem = np.lexsort((idx, chave))
+                chave, idx = chave[ordem], idx[ordem]
+                perdeu = np.zeros(len(pend), dtype=bool)
+                perdeu[idx[1:][chave[1:] == chave[:-1]]] = True
+                ok = ~perdeu
+                quarto[pend[ok]] = escolha[ok]
+                self._marcar(hotel[pend][ok], checkin[pend][ok], noites[pend][ok], escolha[ok])
+                pend = pend[perdeu]
+        return quarto
+
+    def _marcar(self, hotel, checkin, noites, quarto):
+        idx, dia, _ = _noites(checkin, noites)
+        if len(idx) == 0:
+            return
+        h, q = hotel[idx], quarto[idx]
+        # quarto-noites distintos: junta os bits que caem na mesma palavra e grava cada uma uma vez
+        palavra = (h * self.n_dias + dia) * (self.largura // BITS) + q // BITS
+        ordem = np.argsort(palavra, kind="stable")
+        palavra = palavra[ordem]
+        inicio = np.flatnonzero(np.r_[True, palavra[1:] != palavra[:-1]])
+        bits = np.bitwise_or.reduceat(np.left_shift(np.uint64(1), (q[ordem] % BITS).astype(np.uint64)), inicio)
+        self.bits.reshape(-1)[palavra[inicio]] |= bits
+        celulas = np.bincount(h * self.n_dias + dia, minlength=self.ocupacao.size)
+        self.ocupacao += celulas.reshape(self.ocupacao.shape).astype(np.int32)
+
+    def taxa_ocupacao(self):
+        """Ocupação (0..1) por hotel x dia."""
+        return self.ocupacao / np.maximum(self.q_qtd, 1)[:, None]
@@ -0,0 +1,391 @@
+# =========================
+# ESBOÇOS APROXIMADOS (HYPERLOGLOG E QUANTIS)
+# =========================
+"""Esboços mescláveis por célula (hotel x mês ...) para distintos e quantis sem reler os fatos.
+
+Uso (a partir de scripts/):
+    python -m aurora.esbocos --origem <pasta do gerador> [--exato]
+
+- Distintos: HyperLogLog com 2^p registradores uint8 por célula (hash splitmix64 do ID).
+  Erro padrão ~1,04/sqrt(2^p) (p=11: ~2,3%); abaixo de 2,5 * 2^p usa contagem linear, quase
+  exata. Mesclar é o máximo dos registradores.
+- Quantis: histograma de baldes logarítmicos (o esquema do DDSketch): o valor x > 0 cai no
+  balde ceil(log_gamma(x)), gamma = (1 + alfa) / (1 - alfa), e o quantil devolvido tem erro
+  relativo <= alfa (1%) em relação ao valor exato de mesmo posto. Mesclar é somar contagens,
+  como nos cubos; guardado esparso (só baldes com contagem).
+
+Como nos cubos (aurora.cubos), os shards devolvem parciais esparsos (`parcial_hll`,
+`parcial_quantis`) e o processo principal só mescla; o estado em rótulos vai para _esbocos.npz
+e o modo incremental parte dele. As consultas agrupam por qualquer subconjunto das dimensões
+(mês -> ano, todos os hotéis...) mesclando as células, em milissegundos.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+P_HLL = 11
+ALFA = 0.01
+# valores em centavos: até 1e12 centavos cabem nos baldes (acima disso, o último balde)
+VALOR_MAX = 1e12
+
+_M1, _M2, _M3 = np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB), np.uint64(0x9E3779B97F4A7C15)
+
+def hash64(x):
+    """splitmix64 vetorizado (uint64) de inteiros."""
+    z = np.asarray(x).astype(np.uint64) + _M3
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return z ^ (z >> np.uint64(31))
+
+def _bits(x):
+    """Nº de bits significativos de cada uint64 (0 -> 0), exato (cada metade cabe no float64)."""
+    alto, baixo = (x >> np.uint64(32)).astype(np.float64), (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(alto > 0, 32 + np.frexp(alto)[1], np.frexp(baixo)[1])
+
+def _celulas(coords, forma):
+    return np.ravel_multi_index(coords, forma) if len(coords[0]) else np.zeros(0, dtype=np.int64)
+
+def _posicoes(nome, dimensoes, estado):
+    pos = []
+    for d, r in dimensoes.items():
+        p = pd.Index(r).get_indexer(estado[f"dim:{d}"])
+        if (p < 0).any():
+            raise ValueError(f"Esboço {nome}: rótulos de {d} fora das dimensões atuais")
+        pos.append(p)
+    return pos
+
+def _grupos(coords, dimensoes, por):
+    """Grupo (posição no produto das dimensões `por`) de cada célula e os rótulos de cada grupo."""
+    nomes = list(dimensoes)
+    faltando = set(por) - set(nomes)
+    if faltando:
+        raise KeyError(f"Dimensões desconhecidas: {sorted(faltando)} (use {nomes})")
+    forma = tuple(len(dimensoes[d]) for d in por)
+    if not por:
+        return np.zeros(len(coords[0]), dtype=np.int64), lambda g: {}
+    grupo = np.ravel_multi_index(tuple(coords[nomes.index(d)] for d in por), forma)
+    def rotulos(g):
+        return {d: dimensoes[d][p] for d, p in zip(por, np.unravel_index(g, forma))}
+    return grupo, rotulos
+
+# =========================
+# HYPERLOGLOG
+# =========================
+def parcial_hll(forma, coords, ids, p=P_HLL):
+    """Parcial esparso: (registradores tocados, posto máximo uint8) dos ids em cada célula."""
+    h = hash64(ids)
+    m = 1 << p
+    reg = (h >> np.uint64(64 - p)).astype(np.int64)
+    # zeros à esquerda do resto do hash + 1 (o bit sentinela limita a 64 - p + 1)
+    resto = (h << np.uint64(p)) | np.uint64(1 << (p - 1))
+    posto = (65 - _bits(resto)).astype(np.uint8)
+    flat = _celulas(coords, forma) * m + reg
+    tocados, inv = np.unique(flat, return_inverse=True)
+    maximo = np.zeros(len(tocados), dtype=np.uint8)
+    np.maximum.at(maximo, inv.ravel(), posto)
+    return tocados, maximo
+
+def estimar_hll(registros):
+    """Cardinalidade estimada de cada linha de registradores (k x 2^p)."""
+    registros = np.atleast_2d(registros)
+    m = registros.shape[1]
+    alfa = 0.7213 / (1 + 1.079 / m)
+    bruta = alfa * m * m / np.ldexp(1.0, -registros.astype(np.int64)).sum(axis=1)
+    vazios = (registros == 0).sum(axis=1)
+    linear = m * np.log(m / np.maximum(vazios, 1))
+    return np.where((bruta <= 2.5 * m) & (vazios > 0), linear, bruta)
+
+class HLL:
+    """Distintos aproximados sobre as dimensões {nome: rótulos} (registradores densos)."""
+    def __init__(self, nome, dimensoes, p=P_HLL):
+        self.nome, self.p = nome, p
+        self.dimensoes = {d: np.asarray(r) for d, r in dimensoes.items()}
+        self.forma = tuple(len(r) for r in self.dimensoes.values())
+        self.registros = np.zeros((int(np.prod(self.forma)), 1 << p), dtype=np.uint8)
+
+    def somar(self, parcial):
+        tocados, maximo = parcial
+        np.maximum.at(self.registros.reshape(-1), tocados, maximo)
+
+    def mesclar(self, outro):
+        np.maximum(self.registros, outro.registros, out=self.registros)
+
+    def estimar(self, por=None):
+        """DataFrame {dimensões de `por`..., Distintos} mesclando as demais dimensões."""
+        por = list(self.dimensoes) if por is None else list(por)
+        com_dados = np.flatnonzero(self.registros.any(axis=1))
+        grupo, rotulos = _grupos(np.unravel_index(com_dados, self.forma), self.dimensoes, por)
+        unicos, inv = np.unique(grupo, return_inverse=True)
+        regs = np.zeros((len(unicos), self.registros.shape[1]), dtype=np.uint8)
+        np.maximum.at(regs, inv.ravel(), self.registros[com_dados])
+        df = pd.DataFrame(rotulos(unicos))
+        df["Distintos"] = np.rint(estimar_hll(regs)).astype(np.int64) if len(unicos) else np.zeros(0, np.int64)
+        return df
+
+    # ----- estado (modo incremental) -----
+    def estado(self):
+        celulas = np.flatnonzero(self.registros.any(axis=1))
+        pos = np.unravel_index(celulas, self.forma)
+        out = {f"dim:{d}": r[p] for (d, r), p in zip(self.dimensoes.items(), pos)}
+        out.update({"registros": self.registros[celulas], "p": np.array(self.p)})
+        return out
+
+    def restaurar(self, estado):
+        if int(estado["p"]) != self.p:
+            raise ValueError(f"Esboço {self.nome}: salvo com p={int(estado['p'])}, atual p={self.p}")
+        celulas = _celulas(_posicoes(self.nome, self.dimensoes, estado), self.forma)
+        np.maximum.at(self.registros, celulas, estado["registros"])
+
+# =========================
+# QUANTIS (BALDES LOGARÍTMICOS)
+# =========================
+def _gamma(alfa):
+    return (1 + alfa) / (1 - alfa)
+
+def n_baldes(alfa=ALFA):
+    return int(np.ceil(np.log(VALOR_MAX) / np.log(_gamma(alfa)))) + 2
+
+def balde(valores, alfa=ALFA):
+    """Balde de cada valor: 0 para x < 1, senão ceil(log_gamma(x)) + 1."""
+    x = np.asarray(valores, dtype=np.float64)
+    b = np.ceil(np.log(np.maximum(x, 1)) / np.log(_gamma(alfa))).astype(np.int64) + 1
+    return np.where(x < 1, 0, np.minimum(b, n_baldes(alfa) - 1))
+
+def valor_do_balde(b, alfa=ALFA):
+    """Representante do balde (erro relativo <= alfa para todo valor do balde)."""
+    g = _gamma(alfa)
+    b = np.asarray(b)
+    return np.where(b == 0, 0.0, 2 * g ** (b - 1.0) / (g + 1))
+
+def parcial_quantis(forma, coords, valores, alfa=ALFA):
+    """Parcial esparso: (chaves célula x balde, contagens int64)."""
+    chave = _celulas(coords, forma) * n_baldes(alfa) + balde(valores, alfa)
+    chaves, contagens = np.unique(chave, return_counts=True)
+    return chaves, contagens.astype(np.int64)
+
+class Quantis:
+    """Distribuição aproximada de um valor sobre as dimensões {nome: rótulos}."""
+    def __init__(self, nome, dimensoes, alfa=ALFA):
+        self.nome, self.alfa = nome, alfa
+        self.dimensoes = {d: np.asarray(r) for d, r in dimensoes.items()}
+        self.forma = tuple(len(r) for r in self.dimensoes.values())
+        self.nb = n_baldes(alfa)
+        self.chaves = np.zeros(0, dtype=np.int64)
+        self.contagens = np.zeros(0, dtype=np.int64)
+        self._pendentes = []
+
+    def somar(self, parcial):
+        self._pendentes.append(parcial)
+        if len(self._pendentes) >= 32:
+            self._compactar()
+
+    def mesclar(self, outro):
+        outro._compactar()
+        self.somar((outro.chaves, outro.contagens))
+
+    def _compactar(self):
+        if not self._pendentes:
+            return
+        chaves = np.concatenate([self.chaves] + [c for c, _ in self._pendentes])
+        contagens = np.concatenate([self.contagens] + [n for _, n in self._pendentes])
+        self.chaves, inv = np.unique(chaves, return_inverse=True)
+        self.contagens = np.bincount(inv.ravel(), weights=contagens, minlength=len(self.chaves)).astype(np.int64)
+        self._pendentes = []
+
+    def quantis(self, qs=(0.5, 0.95), por=None):
+        """DataFrame {dimensões de `por`..., N, q50, q95...}; quantil do posto floor(q * (N - 1))."""
+        self._compactar()
+        por = list(self.dimensoes) if por is None else list(por)
+        celula, b = np.divmod(self.chaves, self.nb)
+        grupo, rotulos = _grupos(np.unravel_index(celula, self.forma), self.dimensoes, por)
+        # contagens por (grupo, balde), ordenadas; acumulado global e início de cada grupo
+        chave, inv = np.unique(grupo * self.nb + b, return_inverse=True)
+        cont = np.bincount(inv.ravel(), weights=self.contagens, minlength=len(chave)).astype(np.int64)
+        g, b = np.divmod(chave, self.nb)
+        unicos, ini = np.unique(g, return_index=True)
+        acum = np.cumsum(cont)
+        antes = np.r_[0, acum][ini]
+        n = np.r_[antes[1:], acum[-1:]] - antes if len(unicos) else np.zeros(0, dtype=np.int64)
+        df = pd.DataFrame(rotulos(unicos))
+        df["N"] = n
+        for q in qs:
+            posto = np.floor(q * (n - 1)).astype(np.int64)
+            k = np.searchsorted(acum, antes + posto, side="right")
+            df[f"q{round(q * 100):02d}"] = valor_do_balde(b[k], self.alfa)
+        return df
+
+    # ----- estado (modo incremental) -----
+    def estado(self):
+        self._compactar()
+        celula, b = np.divmod(self.chaves, self.nb)
+        pos = np.unravel_index(celula, self.forma)
+        out = {f"dim:{d}": r[p] for (d, r), p in zip(self.dimensoes.items(), pos)}
+        out.update({"balde": b, "contagem": self.contagens, "alfa": np.array(self.alfa)})
+        return out
+
+    def restaurar(self, estado):
+        if float(estado["alfa"]) != self.alfa:
+            raise ValueError(f"Esboço {self.nome}: salvo com alfa={float(estado['alfa'])}, atual alfa={self.alfa}")
+        celulas = _celulas(_posicoes(self.nome, self.dimensoes, estado), self.forma)
+        self.somar((celulas * self.nb + estado["balde"], estado["contagem"]))
+
+def salvar_esbocos(path, esbocos):
+    np.savez_compressed(path, **{f"{e.nome}|{k}": v for e in esbocos for k, v in e.estado().items()})
+
+def restaurar_esbocos(path, esbocos):
+    with np.load(path, allow_pickle=False) as z:
+        for e in esbocos:
+            estado = {k.split("|", 1)[1]: z[k] for k in z.files if k.startswith(f"{e.nome}|")}
+            if estado:
+                e.restaurar(estado)
+
+def carregar_esbocos(path):
+    """Esboços de um _esbocos.npz, com as dimensões reconstruídas dos rótulos salvos."""
+    esbocos = {}
+    with np.load(path, allow_pickle=False) as z:
+        nomes = dict.fromkeys(k.split("|", 1)[0] for k in z.files)
+        for nome in nomes:
+            estado = {k.split("|", 1)[1]: z[k] for k in z.files if k.startswith(f"{nome}|")}
+            dims = {k[4:]: np.unique(v) for k, v in estado.items() if k.startswith("dim:")}
+            e = HLL(nome, dims, int(estado["p"])) if "p" in estado else Quantis(nome, dims, float(estado["alfa"]))
+            e.restaurar(estado)
+            esbocos[nome] = e
+    return esbocos
+
+# =========================
+# ESBOÇOS DAS TABELAS DO GERADOR
+# =========================
+# ClientesDistintos: hotel x mês do check-in (todas as reservas). TarifaEfetiva: hotel x mês
+# x tipo de quarto (uma noite ocupada por linha). ValorPagamento: hotel x mês do pagamento.
+# GastoCliente: gasto total por cliente no segmento de ClientesPorSegmento (não é aditivo
+# por mês: refeito a cada execução a partir do acumulado da Fidelidade).
+SEGMENTOS = np.array(["Alto Valor", "Médio Valor", "Baixo Valor"])
+
+def novos_esbocos(hotel_ids, meses, tipos_quarto):
+    dims = {"HotelID": hotel_ids, "AnoMes": meses}
+    return {
+        "ClientesDistintos": HLL("ClientesDistintos", dims),
+        "TarifaEfetiva": Quantis("TarifaEfetiva", {**dims, "TipoQuarto": tipos_quarto}),
+        "ValorPagamento": Quantis("ValorPagamento", dims),
+    }
+
+def segmento(centavos):
+    """Posição em SEGMENTOS do gasto total (mesmas faixas de ClientesPorSegmento)."""
+    return np.select([centavos >= 1_000_000, centavos >= 500_000], [0, 1], 2)
+
+def esboco_gasto(centavos):
+    """Quantis do gasto total (centavos) por segmento de valor."""
+    e = Quantis("GastoCliente", {"SegmentoDeValor": SEGMENTOS})
+    e.somar(parcial_quantis(e.forma, (segmento(centavos),), centavos))
+    return e
+
+def _ano_mes(datas):
+    return np.datetime_as_string(np.asarray(datas).astype("datetime64[M]"))
+
+def esbocos_das_tabelas(origem):
+    """Os esboços calculados dos fatos (frames do gerador ou pasta de saída), sem estado salvo."""
+    from .kpis import ler_tabela
+    res = ler_tabela(origem, "Reservas", ["ReservaID", "HotelID", "ClienteID", "DataCheckIn"])
+    pag = ler_tabela(origem, "Pagamentos", ["ReservaID", "Valor", "DataPagamento"])
+    occ = ler_tabela(origem, "OcupacaoDiaria", ["HotelID", "QuartoID", "Data", "TarifaEfetiva"])
+    quartos = ler_tabela(origem, "Quartos", ["QuartoID", "Tipo"])
+
+    mes_res, mes_pag, mes_occ = _ano_mes(res["DataCheckIn"]), _ano_mes(pag["DataPagamento"]), _ano_mes(occ["Data"])
+    hoteis = np.unique(res["HotelID"].to_numpy())
+    meses = np.unique(np.concatenate([mes_res, mes_pag, mes_occ]))
+    tipos = np.unique(quartos["Tipo"].astype(str).to_numpy())
+    esbocos = novos_esbocos(hoteis, meses, tipos)
+
+    ids = res["ReservaID"].to_numpy()
+    ordem = np.argsort(ids, kind="stable")
+    pos_res = ordem[np.searchsorted(ids, pag["ReservaID"].to_numpy(), sorter=ordem)]
+    tipo_quarto = pd.Series(quartos["Tipo"].astype(str).to_numpy(), index=quartos["QuartoID"].to_numpy())
+    h = lambda v: np.searchsorted(hoteis, v)
+    m = lambda v: np.searchsorted(meses, v)
+
+    e = esbocos["ClientesDistintos"]
+    e.somar(parcial_hll(e.forma, (h(res["HotelID"].to_numpy()), m(mes_res)), res["ClienteID"].to_numpy()))
+    e = esbocos["TarifaEfetiva"]
+    tipo = np.searchsorted(tipos, occ["QuartoID"].map(tipo_quarto).to_numpy().astype(str))
+    e.somar(parcial_quantis(e.forma, (h(occ["HotelID"].to_numpy()), m(mes_occ), tipo), occ["TarifaEfetiva"].to_numpy()))
+    e = esbocos["ValorPagamento"]
+    e.somar(parcial_quantis(e.forma, (h(res["HotelID"].to_numpy()[pos_res]), m(mes_pag)), pag["Valor"].to_numpy()))
+
+    gasto = np.bincount(res["ClienteID"].to_numpy()[pos_res], weights=pag["Valor"].to_numpy())
+    tem = np.bincount(res["ClienteID"].to_numpy()[pos_res]) > 0
+    esbocos["GastoCliente"] = esboco_gasto(np.rint(gasto[tem]).astype(np.int64))
+    return esbocos
+
+# =========================
+# CONSULTAS
+# =========================
+def consultas(esbocos):
+    """As perguntas dos painéis: {nome: DataFrame} (valores em reais)."""
+    out = {
+        "ClientesDistintosHotelMes": esbocos["ClientesDistintos"].estimar(["HotelID", "AnoMes"]),
+        "ClientesDistintosMes": esbocos["ClientesDistintos"].estimar(["AnoMes"]),
+        "TarifaPorTipoQuarto": esbocos["TarifaEfetiva"].quantis((0.5, 0.95), ["TipoQuarto"]),
+        "ValorPagamentoHotelMes": esbocos["ValorPagamento"].quantis((0.5, 0.95), ["HotelID", "AnoMes"]),
+    }
+    if "GastoCliente" in esbocos:
+        out["GastoPorSegmento"] = esbocos["GastoCliente"].quantis((0.1, 0.5, 0.9, 0.99), ["SegmentoDeValor"])
+    for df in out.values():
+        for c in df.columns:
+            if c[0] == "q" and c[1:].isdigit():
+                df[c] = np.round(df[c] / 100, 2)
+    return out
+
+def _exatos(origem):
+    """Os mesmos números calculados exatamente a partir das tabelas (para medir o erro)."""
+    from .kpis import ler_tabela
+    res = ler_tabela(origem, "Reservas", ["HotelID", "ClienteID", "DataCheckIn"])
+    occ = ler_tabela(origem, "OcupacaoDiaria", ["QuartoID", "TarifaEfetiva"])
+    quartos = ler_tabela(origem, "Quartos", ["QuartoID", "Tipo"])
+    distintos = pd.DataFrame({"HotelID": res["HotelID"].to_numpy(), "AnoMes": _ano_mes(res["DataCheckIn"]),
+                              "ClienteID": res["ClienteID"].to_numpy()}
+                             ).groupby(["HotelID", "AnoMes"])["ClienteID"].nunique()
+    tipo = occ["QuartoID"].map(pd.Series(quartos["Tipo"].astype(str).to_numpy(), index=quartos["QuartoID"].to_numpy()))
+    tarifas = pd.Series(occ["TarifaEfetiva"].to_numpy() / 100).groupby(tipo.to_numpy())
+    return distintos, tarifas
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Distintos e quantis aproximados a partir dos esboços.")
+    ap.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."), help="pasta de saída do gerador")
+    ap.add_argument("--exato", action="store_true", help="compara com os valores exatos das tabelas")
+    args = ap.parse_args(argv)
+
+    from .estado import ESBOCOS_ARQUIVO
+    path = os.path.join(args.origem, ESBOCOS_ARQUIVO)
+    t0 = time.perf_counter()
+    if os.path.exists(path):
+        esbocos = carregar_esbocos(path)
+    else:
+        print(f"{path} não existe: esboços calculados das tabelas", file=sys.stderr)
+        esbocos = esbocos_das_tabelas(args.origem)
+    t1 = time.perf_counter()
+    resultado = consultas(esbocos)
+    t2 = time.perf_counter()
+    print(f"Esboços: {t1 - t0:.3f}s | consultas: {(t2 - t1) * 1000:.1f} ms")
+    with pd.option_context("display.width", 200, "display.max_rows", 20):
+        for nome, df in resultado.items():
+            print(f"\n{nome} ({len(df):,d} linhas)\n{df}")
+
+    if args.exato:
+        distintos, tarifas = _exatos(args.origem)
+        est = resultado["ClientesDistintosHotelMes"].set_index(["HotelID", "AnoMes"])["Distintos"]
+        erro = (est.reindex(distintos.index) / distintos - 1).abs()
+        print(f"\nDistintos hotel x mês: erro relativo médio {erro.mean():.2%}, máximo {erro.max():.2%}")
+        q = resultado["TarifaPorTipoQuarto"].set_index("TipoQuarto")
+        for p in (50, 95):
+            exato = tarifas.quantile(p / 100, interpolation="lower")
+            erro = (q[f"q{p}"].reindex(exato.index) / exato - 1).abs()
+            print(f"Tarifa p{p} por tipo de quarto: erro relativo máximo {erro.max():.2%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+# =========================
+# ESCRITA DE CSV (BULK INSERT)
+# =========================
+"""CSV formatado com NumPy direto em um buffer de bytes, em blocos paralelos.
+
+Cada coluna vira (comprimento do campo por linha, função que escreve os bytes a partir de
+posições dadas): inteiros e DECIMAL (int64 escalado) dígito a dígito, datas como
+YYYY-MM-DD a partir de ano/mês/dia, textos e categorias pelos valores únicos (já com as
+aspas do CSV) copiados por índice. As posições saem de somas acumuladas dos comprimentos,
+então não há laço por linha em Python. O resultado é byte a byte o mesmo de
+para_texto(df).to_csv(index=False) — inclusive decimais no formato do float (220.0, 0.05).
+
+Blocos de LINHAS_BLOCO linhas são formatados em threads (NumPy libera o GIL nas operações
+de array) e gravados na ordem. EscritorCSV acrescenta chunks a um arquivo, opcionalmente
+comprimido (gzip; zstd com o pacote zstandard — membros/frames concatenados continuam
+válidos) ou dividido em partes de até `linhas_por_arquivo` linhas, cada uma com cabeçalho,
+para lotes de BULK INSERT em paralelo.
+"""
+
+import glob
+import gzip
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .schema import colunas_da_tabela
+
+try:
+    import zstandard
+except ImportError:  # opcional: só para compressão zstd
+    zstandard = None
+
+COMPRESSOES = {"": "", "gzip": ".gz", "zstd": ".zst"}
+LINHAS_BLOCO = 200_000
+FIM_LINHA = os.linesep.encode()  # o mesmo terminador que o DataFrame.to_csv usa
+
+# =========================
+# FORMATAÇÃO POR COLUNA
+# =========================
+def _n_digitos(a):
+    """Quantidade de dígitos decimais de inteiros >= 0 (0 tem 1 dígito)."""
+    n = np.ones(len(a), dtype=np.int64)
+    limite = 10
+    while limite <= 10 ** 18:
+        maior = a >= limite
+        if not maior.any():
+            break
+        n += maior
+        limite *= 10
+    return n
+
+def _escrever_digitos(buf, fim, valor, largura):
+    """Escreve `valor` com `largura` dígitos (zeros à esquerda) terminando antes de `fim`."""
+    valor, pos = valor.copy(), fim - 1
+    for k in range(int(largura.max(initial=0))):
+        ativo = np.flatnonzero(largura > k)
+        buf[pos[ativo]] = 48 + valor[ativo] % 10
+        valor //= 10
+        pos -= 1
+
+def _inteiros(v):
+    v = v.astype(np.int64)
+    neg, a = v < 0, np.abs(v)
+    nd = _n_digitos(a)
+    def escrever(buf, ini):
+        buf[ini[neg]] = ord("-")
+        _escrever_digitos(buf, ini + neg + nd, a, nd)
+    return nd + neg, escrever
+
+def _decimais(v, escala):
+    """int64 escalado -> texto do float (parte inteira, ponto, fração sem zeros à direita, >= 1 dígito)."""
+    v = v.astype(np.int64)
+    neg, a = v < 0, np.abs(v)
+    inteiro, frac = np.divmod(a, 10 ** escala)
+    largura = np.full(len(a), escala, dtype=np.int64)
+    for _ in range(escala - 1):
+        zero = (frac % 10 == 0) & (largura > 1)
+        frac = np.where(zero, frac // 10, frac)
+        largura -= zero
+    nd = _n_digitos(inteiro)
+    def escrever(buf, ini):
+        buf[ini[neg]] = ord("-")
+        ponto = ini + neg + nd
+        _escrever_digitos(buf, ponto, inteiro, nd)
+        buf[ponto] = ord(".")
+        _escrever_digitos(buf, ponto + 1 + largura, frac, largura)
+    return neg + nd + 1 + largura, escrever
+
+def _datas(v):
+    dias = v.astype("datetime64[D]")
+    nulo = np.isnat(dias)
+    ano = dias.astype("datetime64[Y]")
+    mes = dias.astype("datetime64[M]")
+    a = ano.astype(np.int64) + 1970
+    m = (mes - ano.astype("datetime64[M]")).astype(np.int64) + 1
+    d = (dias - mes.astype("datetime64[D]")).astype(np.int64) + 1
+    def escrever(buf, ini):
+        ok = ~nulo
+        i, quatro, dois = ini[ok], np.full(ok.sum(), 4), np.full(ok.sum(), 2)
+        _escrever_digitos(buf, i + 4, a[ok], quatro)
+        buf[i + 4] = buf[i + 7] = ord("-")
+        _escrever_digitos(buf, i + 7, m[ok], dois)
+        _escrever_digitos(buf, i + 10, d[ok], dois)
+    return np.where(nulo, 0, 10), escrever
+
+def _campo_texto(valor):
+    """Valor já em texto -> bytes do campo, com aspas só quando necessário (QUOTE_MINIMAL)."""
+    if any(c in valor for c in ',"\n\r'):
+        valor = '"' + valor.replace('"', '""') + '"'
+    return valor.encode("utf-8")
+
+def _pool(unicos):
+    """(bytes de todos os campos concatenados, comprimento de cada um)."""
+    texto = "".join(unicos)
+    if texto.isascii() and not any(c in texto for c in ',"\n\r'):
+        # caso comum: sem aspas nem acentos, bytes = caracteres
+        return texto.encode("ascii"), np.fromiter(map(len, unicos), dtype=np.int64, count=len(unicos))
+    campos = [_campo_texto(u) for u in unicos]
+    return b"".join(campos), np.fromiter(map(len, campos), dtype=np.int64, count=len(campos))
+
+def _textos(codigos, unicos):
+    """Campos por código (-1 = nulo) em um pool de bytes dos valores únicos."""
+    pool, tam_u = _pool(unicos)
+    tam_u = np.append(tam_u, 0)
+    ini_u = np.cumsum(tam_u) - tam_u
+    pool = np.frombuffer(pool or b"\0", dtype=np.uint8)
+    codigos = np.where(codigos < 0, len(tam_u) - 1, codigos)
+    comp = tam_u[codigos]
+    def escrever(buf, ini):
+        total = int(comp.sum())
+        if total == 0:
+            return
+        dentro = np.arange(total) - np.repeat(np.cumsum(comp) - comp, comp)
+        buf[np.repeat(ini, comp) + dentro] = pool[np.repeat(ini_u[codigos], comp) + dentro]
+    return comp, escrever
+
+def _texto_pandas(s):
+    """Texto de cada valor como o to_csv grava (floats fora do DDL, booleanos...)."""
+    txt = s.astype(object).where(s.notna(), None)
+    return txt.map(lambda x: None if x is None else (repr(float(x)) if isinstance(x, (float, np.floating)) else str(x)))
+
+def _coluna(s, col):
+    """(comprimentos, escrever) de uma coluna do esquema compacto."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _textos(s.cat.codes.to_numpy(), [str(c) for c in s.cat.categories])
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return _datas(s.to_numpy())
+    if col is not None and col.tipo == "DECIMAL" and pd.api.types.is_integer_dtype(s):
+        a = np.abs(s.to_numpy().astype(np.int64))
+        # fora da faixa em que o float sai em notação decimal simples: texto do float
+        if not ((a >= 10 ** 15).any() or (col.escala > 4 and ((a > 0) & (a < 10 ** (col.escala - 4))).any())):
+            return _decimais(s.to_numpy(), col.escala)
+        s = pd.Series(s.to_numpy() / 10 ** col.escala)
+    if pd.api.types.is_integer_dtype(s) and not s.hasnans:
+        return _inteiros(s.to_numpy())
+    if not pd.api.types.is_object_dtype(s) and not pd.api.types.is_string_dtype(s):
+        s = _texto_pandas(s)
+    codigos, unicos = pd.factorize(s, use_na_sentinel=True)
+    return _textos(codigos, list(map(str, np.asarray(unicos, dtype=object))))
+
+def formatar_linhas(df, tabela):
+    """(bytes do CSV de df sem cabeçalho como uint8, posição final de cada linha)."""
+    cols = colunas_da_tabela(tabela)
+    campos = [_coluna(df[nome].reset_index(drop=True), cols.get(nome)) for nome in df.columns]
+    # linha = campos + vírgulas + fim de linha; cada campo começa depois dos anteriores
+    comp_linha = sum(c for c, _ in campos) + (len(campos) - 1) + len(FIM_LINHA)
+    fim_linha = np.cumsum(comp_linha)
+    buf = np.empty(int(fim_linha[-1]) if len(df) else 0, dtype=np.uint8)
+    pos = fim_linha - comp_linha
+    for j, (comp, escrever) in enumerate(campos):
+        escrever(buf, pos)
+        pos = pos + comp
+        if j < len(campos) - 1:
+            buf[pos] = ord(",")
+            pos = pos + 1
+    for k, b in enumerate(FIM_LINHA):
+        buf[pos + k] = b
+    return buf, fim_linha
+
+def cabecalho_csv(colunas):
+    return b",".join(_campo_texto(str(c)) for c in colunas) + FIM_LINHA
+
+def formatar(df, tabela, cabecalho=False):
+    """Bytes do CSV de df (esquema compacto); cabecalho=True inclui a linha de nomes."""
+    corpo = formatar_linhas(df, tabela)[0].tobytes() if len(df) else b""
+    return cabecalho_csv(df.columns) + corpo if cabecalho else corpo
+
+def formatar_blocos(df, tabela, pool=None, linhas_bloco=LINHAS_BLOCO):
+    """Blocos de bytes do CSV (sem cabeçalho), formatados em paralelo no pool (ThreadPoolExecutor)."""
+    blocos = [df.iloc[i:i + linhas_bloco] for i in range(0, len(df), linhas_bloco)]
+    if pool is None or len(blocos) < 2:
+        return [formatar(b, tabela) for b in blocos]
+    return list(pool.map(lambda b: formatar(b, tabela), blocos))
+
+# =========================
+# ARQUIVOS
+# =========================
+def _abrir(path, compressao):
+    """Arquivo para anexar bytes; cada abertura comprimida vira um membro (gzip) ou frame (zstd)."""
+    if compressao == "gzip":
+        return gzip.open(path, "ab", compresslevel=6)
+    if compressao == "zstd":
+        if zstandard is None:
+            raise ImportError("Compressão zstd requer zstandard (pip install zstandard).")
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "ab"), closefd=True)
+    return open(path, "ab")
+
+class EscritorCSV:
+    """CSV de uma tabela gravado em chunks, na ordem.
+
+    janela > 0 (modo incremental): o arquivo único recebe as linhas sem cabeçalho; as
+    partes de uma divisão continuam em arquivos próprios da janela.
+    """
+    def __init__(self, nome, output_dir, compressao="", linhas_por_arquivo=0, janela=0, pool=None):
+        if compressao not in COMPRESSOES:
+            raise ValueError(f"Compressão desconhecida: {compressao} (use gzip ou zstd)")
+        self.nome = nome
+        self.output_dir = output_dir
+        self.compressao = compressao
+        self.linhas_por_arquivo = linhas_por_arquivo
+        self.janela = janela
+        self.pool = pool
+        self.paths = []
+        self.linhas_parte = 0
+        self.cabecalho = None
+
+    def _nova_parte(self):
+        ext = ".csv" + COMPRESSOES[self.compressao]
+        if not self.janela and not self.paths:
+            # carga completa: remove variantes antigas (outra compressão, partes) da tabela
+            for antigo in arquivos_csv(self.output_dir, self.nome):
+                os.remove(antigo)
+        if not self.linhas_por_arquivo:
+            path = os.path.join(self.output_dir, self.nome + ext)
+            novo = not self.janela
+        else:
+            janela = f".{self.janela:03d}" if self.janela else ""
+            path = os.path.join(self.output_dir, f"{self.nome}{janela}.{len(self.paths) + 1:04d}{ext}")
+            novo = True
+        if novo and os.path.exists(path):
+            os.remove(path)
+        self.paths.append(path)
+        self.linhas_parte = 0
+        return novo
+
+    def _anexar(self, df, com_cabecalho):
+        """Grava df no arquivo atual; retorna os bytes acrescentados ao arquivo."""
+        path = self.paths[-1]
+        antes = os.path.getsize(path) if os.path.exists(path) else 0
+        blocos = formatar_blocos(df, self.nome, self.pool)
+        if com_cabecalho:
+            blocos.insert(0, self.cabecalho)
+        with _abrir(path, self.compressao) as f:
+            for b in blocos:
+                f.write(b)
+        self.linhas_parte += len(df)
+        return os.path.getsize(path) - antes
+
+    def add(self, df):
+        """Anexa um chunk; retorna os bytes gravados em disco."""
+        if self.cabecalho is None:
+            self.cabecalho = formatar(df.iloc[:0], self.nome, cabecalho=True)
+        gravados = 0
+        if not self.paths:
+            gravados += self._anexar(df.iloc[:0], self._nova_parte())
+        ini = 0
+        while ini < len(df):
+            if self.linhas_por_arquivo and self.linhas_parte >= self.linhas_por_arquivo:
+                gravados += self._anexar(df.iloc[:0], self._nova_parte())
+            n = len(df) - ini
+            if self.linhas_por_arquivo:
+                n = min(n, self.linhas_por_arquivo - self.linhas_parte)
+            gravados += self._anexar(df.iloc[ini:ini + n], False)
+            ini += n
+        return gravados
+
+    def descricao(self):
+        """Texto para o log: o arquivo ou a primeira parte e o número de partes."""
+        if len(self.paths) == 1:
+            return self.paths[0]
+        return f"{self.paths[0]} .. {os.path.basename(self.paths[-1])} ({len(self.paths)} partes)"
+
+_RE_PARTE = re.compile(r"\.(?:(\d{3})\.)?(\d{4})\.csv")
+
+def arquivos_csv(pasta, tabela):
+    """Arquivos CSV de uma tabela na pasta de saída: único (comprimido ou não) ou partes, na
+    ordem (carga completa e depois cada janela incremental)."""
+    for ext in COMPRESSOES.values():
+        unico = os.path.join(pasta, f"{tabela}.csv{ext}")
+        if os.path.exists(unico):
+            return [unico]
+    base = os.path.join(glob.escape(pasta), glob.escape(tabela))
+    partes = []
+    for ext in COMPRESSOES.values():
+        partes += glob.glob(f"{base}.[0-9][0-9][0-9][0-9].csv{ext}")
+        partes += glob.glob(f"{base}.[0-9][0-9][0-9].[0-9][0-9][0-9][0-9].csv{ext}")
+    def ordem(path):
+        janela, parte = _RE_PARTE.match(os.path.basename(path)[len(tabela):]).groups()
+        return int(janela or 0), int(parte)
+    return sorted(partes, key=ordem)
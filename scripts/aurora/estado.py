@@ -0,0 +1,95 @@
+# =========================
+# MANIFESTO DE ESTADO (modo incremental)
+# =========================
+"""Estado de uma execução do gerador, lido pela próxima execução incremental.
+
+O manifesto (_estado.json, no diretório de saída) guarda o horizonte já gerado, os últimos
+IDs de cada tabela e a janela de RNG; o acumulado da Fidelidade por cliente fica ao lado,
+em _fidelidade.npz, as células dos cubos de agregados em _cubos.npz e os esboços
+(HyperLogLog, quantis) em _esbocos.npz. Os streams de RNG não são serializados: cada partição (tabela, shard)
+deriva de SeedSequence(SEED) pela chave (shard,) na carga completa e (shard, janela) nos
+incrementos, então basta o número da janela para continuar de forma determinística.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+ESTADO_ARQUIVO = "_estado.json"
+FIDELIDADE_ARQUIVO = "_fidelidade.npz"
+CUBOS_ARQUIVO = "_cubos.npz"
+ESBOCOS_ARQUIVO = "_esbocos.npz"
+VERSAO = 1
+# opções do CSV nos manifestos anteriores a elas: arquivo único sem compressão
+CSV_PADRAO = {"compressao": "", "linhas_por_arquivo": 0}
+
+def carregar_estado(output_dir):
+    path = os.path.join(output_dir, ESTADO_ARQUIVO)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Modo incremental sem execução anterior: {path} não existe.")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def salvar_estado(output_dir, estado):
+    path = os.path.join(output_dir, ESTADO_ARQUIVO)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)  # troca atômica: um manifesto nunca fica pela metade
+    return path
+
+def validar_incremento(estado, seed, scale_factor, date_start, date_end, tabelas_rng, csv=None, formatos=None):
+    """Confere se a execução incremental continua a anterior; levanta ValueError se não."""
+    if estado.get("versao") != VERSAO:
+        raise ValueError(f"Manifesto versão {estado.get('versao')} não suportado (esperado {VERSAO}).")
+    erros = []
+    if estado["seed"] != seed:
+        erros.append(f"SEED {seed} != {estado['seed']}")
+    if estado["scale_factor"] != scale_factor:
+        erros.append(f"SCALE_FACTOR {scale_factor:g} != {estado['scale_factor']:g}")
+    if estado["date_start"] != str(date_start.date()):
+        erros.append(f"DATE_START {date_start.date()} != {estado['date_start']}")
+    if str(date_end.date()) <= estado["date_end"]:
+        erros.append(f"DATE_END {date_end.date()} precisa ser posterior a {estado['date_end']}")
+    if list(tabelas_rng[:len(estado["rng"]["tabelas"])]) != estado["rng"]["tabelas"]:
+        erros.append("RNG_TABELAS mudou (novas tabelas só podem entrar no fim da lista)")
+    if formatos is not None and sorted(formatos) != sorted(estado["formatos"]):
+        erros.append(f"formatos de saída {list(formatos)} != {estado['formatos']} (cada incremento anexa a todos os formatos)")
+    if csv is not None and estado.get("csv", CSV_PADRAO) != csv:
+        erros.append(f"opções do CSV {csv} != {estado.get('csv', CSV_PADRAO)} (os incrementos anexam aos mesmos arquivos)")
+    if erros:
+        raise ValueError("Execução incremental incompatível com o manifesto: " + "; ".join(erros))
+
+def novo_estado(anterior, seed, scale_factor, date_start, date_end, janela, inicio_janela,
+                reservas_por_dia, ultimo_id, linhas, tabelas_rng, formatos, csv=None):
+    historico = list(anterior["historico"]) if anterior else []
+    historico.append({
+        "janela": janela,
+        "de": str(inicio_janela.date()),
+        "ate": str(date_end.date()),
+        "linhas": linhas,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+    })
+    return {
+        "versao": VERSAO,
+        "seed": seed,
+        "scale_factor": scale_factor,
+        "date_start": str(date_start.date()),
+        "date_end": str(date_end.date()),
+        "janela": janela,
+        "reservas_por_dia": reservas_por_dia,
+        "ultimo_id": ultimo_id,
+        "rng": {"tabelas": list(tabelas_rng), "chave_shard": "(shard,) na janela 0; (shard, janela) depois"},
+        "formatos": list(formatos),
+        "csv": dict(csv or CSV_PADRAO),
+        "historico": historico,
+    }
+
+def salvar_fidelidade(output_dir, centavos, tem_pagamento):
+    np.savez_compressed(os.path.join(output_dir, FIDELIDADE_ARQUIVO), centavos=centavos, tem_pagamento=tem_pagamento)
+
+def carregar_fidelidade(output_dir):
+    with np.load(os.path.join(output_dir, FIDELIDADE_ARQUIVO)) as z:
+        return z["centavos"], z["tem_pagamento"]
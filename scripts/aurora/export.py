@@ -0,0 +1,177 @@
+# =========================
+# EXPORTAÇÃO COLUNAR (Parquet / Arrow IPC)
+# =========================
+"""Escrita das tabelas em Parquet ou Feather (Arrow IPC) com os tipos do DDL.
+
+DATE -> date32, DECIMAL(p,s) -> decimal128(p,s), INT -> int32, textos -> string.
+Colunas de baixa cardinalidade saem dictionary-encoded; compressão zstd.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from .schema import colunas_da_tabela, COLUNAS_CATEGORIA
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:  # pyarrow é opcional: só é exigido quando um formato colunar é pedido
+    pa = None
+
+FORMATOS_COLUNARES = {"parquet": ".parquet", "feather": ".feather"}
+
+def _dicionario_encoded(nome, serie):
+    """Colunas category (esquema compacto) ou de baixa cardinalidade saem dictionary-encoded."""
+    return isinstance(serie.dtype, pd.CategoricalDtype) or nome in COLUNAS_CATEGORIA or nome.endswith("AnoMes")
+
+def _exigir_pyarrow():
+    if pa is None:
+        raise ImportError("Formato colunar requer pyarrow (pip install pyarrow).")
+
+def _tipo_inferido(serie):
+    """Tipo Arrow de uma coluna que não está no DDL (ex.: Ano/Mes auxiliares)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return pa.string()
+    if pd.api.types.is_integer_dtype(serie):
+        return pa.int32()
+    if pd.api.types.is_float_dtype(serie):
+        return pa.float64()
+    if pd.api.types.is_bool_dtype(serie):
+        return pa.bool_()
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return pa.date32()
+    return pa.string()
+
+def _tipo_arrow(col, serie):
+    if col is None:
+        return _tipo_inferido(serie)
+    if col.tipo == "DATE":
+        return pa.date32()
+    if col.tipo == "DECIMAL":
+        return pa.decimal128(col.precisao, col.escala)
+    if col.tipo in ("INT", "SMALLINT", "TINYINT"):
+        return pa.int32()
+    if col.tipo == "BIGINT":
+        return pa.int64()
+    return pa.string()
+
+def _converter(serie, tipo, col):
+    """pandas.Series -> pyarrow.Array no tipo de destino."""
+    if pa.types.is_date32(tipo):
+        dias = pd.to_datetime(serie).to_numpy().astype("datetime64[D]")
+        return pa.array(dias, type=tipo, from_pandas=True)
+    if pa.types.is_decimal(tipo):
+        # int64 escalado (esquema compacto) ou float em unidades naturais
+        if pd.api.types.is_integer_dtype(serie):
+            valores = serie.to_numpy() / 10 ** col.escala
+        else:
+            valores = serie.to_numpy(dtype="float64")
+        valores = pa.array(np.round(valores, col.escala), from_pandas=True)
+        return pc.cast(valores, tipo, safe=False)
+    if pa.types.is_string(tipo):
+        return pa.array(serie.to_numpy(dtype=object), type=tipo, from_pandas=True)
+    return pa.array(serie.to_numpy(), type=tipo, from_pandas=True)
+
+class EscritorColunar:
+    """Escritor Parquet/Feather que recebe a tabela em chunks e fecha o arquivo no fim.
+
+    O esquema é fixado no primeiro chunk. Os dicionários crescem entre chunks (sempre
+    como extensão do anterior), o que mantém o arquivo IPC válido com deltas. No Parquet
+    os chunks são agrupados em row groups de row_group_size linhas. `arquivo` troca o nome
+    do arquivo (padrão: o da tabela), p.ex. para gravar um incremento ao lado da carga base.
+    """
+    def __init__(self, nome, output_dir, formato="parquet", row_group_size=1_000_000, arquivo=None):
+        _exigir_pyarrow()
+        if formato not in FORMATOS_COLUNARES:
+            raise ValueError(f"Formato colunar desconhecido: {formato}")
+        self.nome = nome
+        self.formato = formato
+        self.row_group_size = row_group_size
+        self.path = os.path.join(output_dir, f"{arquivo or nome}{FORMATOS_COLUNARES[formato]}")
+        self.colunas = colunas_da_tabela(nome)
+        self.schema = None
+        self.vocab = {}
+        self.buffer = []
+        self.buffer_linhas = 0
+        self.writer = None
+
+    def _fixar_schema(self, df):
+        campos = []
+        for nome in df.columns:
+            tipo = _tipo_arrow(self.colunas.get(nome), df[nome])
+            if _dicionario_encoded(nome, df[nome]) and pa.types.is_string(tipo):
+                tipo = pa.dictionary(pa.int32(), pa.string())
+                self.vocab[nome] = []
+            campos.append(pa.field(nome, tipo))
+        self.schema = pa.schema(campos)
+        if self.formato == "parquet":
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        else:
+            opcoes = ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+            self.writer = ipc.new_file(self.path, self.schema, options=opcoes)
+
+    def _dicionario(self, nome, serie):
+        vocab = self.vocab[nome]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # recodifica só as categorias (sem passar pelas strings de cada linha)
+            conhecidos = set(vocab)
+            vocab.extend(c for c in serie.cat.categories if c not in conhecidos)
+            codigos = serie.cat.set_categories(vocab).cat.codes.to_numpy().astype(np.int32)
+        else:
+            valores = serie.to_numpy(dtype=object)
+            novos = pd.unique(valores[~pd.isna(valores) & ~pd.Series(valores).isin(vocab).to_numpy()])
+            vocab.extend(novos.tolist())
+            codigos = pd.Categorical(valores, categories=vocab).codes.astype(np.int32)
+        indices = pa.array(codigos, type=pa.int32(), mask=codigos < 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(vocab, type=pa.string()))
+
+    def _tabela(self, df):
+        arrays = []
+        for campo in self.schema:
+            serie = df[campo.name]
+            if pa.types.is_dictionary(campo.type):
+                arrays.append(self._dicionario(campo.name, serie))
+            else:
+                arrays.append(_converter(serie, campo.type, self.colunas.get(campo.name)))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def add(self, df):
+        if self.schema is None:
+            self._fixar_schema(df)
+        tabela = self._tabela(df)
+        if self.formato == "feather":
+            self.writer.write_table(tabela, max_chunksize=self.row_group_size)
+            return
+        self.buffer.append(tabela)
+        self.buffer_linhas += tabela.num_rows
+        if self.buffer_linhas >= self.row_group_size:
+            self._descarregar(final=False)
+
+    def _descarregar(self, final):
+        if not self.buffer:
+            return
+        tabela = pa.concat_tables(self.buffer)
+        cheios = tabela.num_rows if final else tabela.num_rows - tabela.num_rows % self.row_group_size
+        if cheios:
+            self.writer.write_table(tabela.slice(0, cheios), row_group_size=self.row_group_size)
+        resto = tabela.slice(cheios)
+        self.buffer = [resto] if resto.num_rows else []
+        self.buffer_linhas = resto.num_rows
+
+    def fechar(self):
+        if self.writer is None:
+            return
+        if self.formato == "parquet":
+            self._descarregar(final=True)
+        self.writer.close()
+        self.writer = None
+
+def export_colunar(df, nome, output_dir, formato="parquet", row_group_size=1_000_000):
+    """Exporta um DataFrame inteiro em formato colunar; retorna o caminho."""
+    escritor = EscritorColunar(nome, output_dir, formato, row_group_size)
+    escritor.add(df)
+    escritor.fechar()
+    return escritor.path
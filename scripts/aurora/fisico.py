@@ -0,0 +1,266 @@
+# =========================
+# ESQUEMA FÍSICO DE PERFORMANCE
+# =========================
+"""Variante "performance" de 03_CriaTabelas.sql: partições por ano, índices e chaves de período.
+
+Uso (a partir de scripts/):
+    python -m aurora.fisico            # regrava 03_CriaTabelas_Performance.sql
+
+A variante é gerada a partir do DDL base (mesmas tabelas e colunas) e acrescenta:
+- partição anual (RANGE RIGHT) das tabelas fato pela coluna de data em PARTICOES, com o
+  índice clusterizado nessa data e compressão de página; a PK vira NONCLUSTERED;
+- chaves de período persistidas (COLUNAS_PERSISTIDAS, que o gerador já grava no CSV),
+  para agrupar por mês sem YEAR()/MONTH() linha a linha;
+- índices nas FKs e nas datas das fatos, e índices de cobertura (INCLUDE) para os joins
+  Reservas <-> Pagamentos de 05_analysis_queries.sql.
+
+Para os motores embutidos do harness (aurora.bench_consultas), `ajustes_embutidos` traduz o
+mesmo desenho: como SQLite e DuckDB não têm partições, as fatos são regravadas em ordem de
+data (o equivalente às zone maps / localidade de uma partição) e os INCLUDE entram na chave.
+"""
+
+import os
+import re
+
+from .schema import DDL_PATH, carregar_ddl, restricoes_ddl
+
+DDL_PERFORMANCE_PATH = os.path.join(os.path.dirname(DDL_PATH), "03_CriaTabelas_Performance.sql")
+
+# Tabela fato -> coluna de data da partição anual
+PARTICOES = {
+    "Reservas":          "DataCheckIn",
+    "Pagamentos":        "DataPagamento",
+    "Feedback":          "DataFeedback",
+    "Reclamacoes":       "DataReclamacao",
+    "MovimentosEstoque": "DataMovimento",
+    "OcupacaoDiaria":    "Data",
+    "CuboHotelDia":      "Data",
+    "PickupHotelDia":    "DataEstadia",
+}
+
+# Chaves de período persistidas (colunas extras do CSV de Reservas; Pagamentos já tem Ano/Mes/AnoMes)
+COLUNAS_PERSISTIDAS = {
+    "Reservas": [("CheckInAno", "INT"), ("CheckInMes", "INT"), ("CheckInAnoMes", "NVARCHAR(7)"),
+                 ("ReservaAno", "INT"), ("ReservaMes", "INT"), ("ReservaAnoMes", "NVARCHAR(7)")],
+}
+
+# Índices de cobertura: (tabela, chave, colunas incluídas)
+INDICES_COBERTURA = [
+    ("Reservas",       ["ReservaID"],                ["HotelID", "QuartoID", "ClienteID", "DataCheckIn",
+                                                      "DataCheckOut", "CheckInAno", "CheckInMes"]),
+    ("Reservas",       ["CheckInAno", "CheckInMes"], ["ReservaID"]),
+    ("Pagamentos",     ["ReservaID"],                ["Valor", "DataPagamento", "AnoMes"]),
+    ("Pagamentos",     ["Ano", "Mes"],               ["ReservaID", "Valor"]),
+    ("OcupacaoDiaria", ["HotelID", "Data"],          ["QuartoID", "TarifaEfetiva"]),
+]
+
+def _tipo_tsql(col):
+    if col.tipo == "DECIMAL":
+        return f"DECIMAL({col.precisao},{col.escala})"
+    return f"{col.tipo}({col.tamanho})" if col.tamanho else col.tipo
+
+def indices_performance(tabelas=None):
+    """[(tabela, chave, incluídas)]: FKs, datas das fatos e cobertura, sem chaves repetidas."""
+    restricoes = restricoes_ddl()
+    tabelas = list(carregar_ddl()) if tabelas is None else tabelas
+    indices = {}
+    for t in tabelas:
+        pk = restricoes[t].pk
+        for col, _, _ in restricoes[t].fks:
+            if [col] != pk[:1]:
+                indices[(t, (col,))] = []
+        if t in PARTICOES:
+            indices[(t, (PARTICOES[t],))] = []
+    for t, chave, incluidas in INDICES_COBERTURA:
+        if t in tabelas:
+            indices[(t, tuple(chave))] = incluidas
+    return [(t, list(chave), incluidas) for (t, chave), incluidas in indices.items()]
+
+def _nome_indice(t, chave):
+    return f"IX_{t}_{'_'.join(chave)}"
+
+def ddl_performance(ano_ini=2019, ano_fim=2026):
+    """Texto T-SQL da variante de performance (partições anuais de ano_ini a ano_fim)."""
+    ddl, restricoes = carregar_ddl(), restricoes_ddl()
+    limites = ", ".join(f"'{a}-01-01'" for a in range(ano_ini + 1, ano_fim + 1))
+    out = [
+        "-- GERADO por aurora/fisico.py a partir de 03_CriaTabelas.sql (não edite à mão)",
+        "-- Variante de performance: partições anuais nas fatos, chaves de período persistidas",
+        "-- e índices de FK, data e cobertura",
+        "USE Aurora_Hotels_DB;",
+        "GO",
+        "",
+        "-- Partição anual por data (RANGE RIGHT: cada limite é o 1º dia do ano)",
+        f"CREATE PARTITION FUNCTION pf_PorAno (DATE) AS RANGE RIGHT FOR VALUES ({limites});",
+        "GO",
+        "CREATE PARTITION SCHEME ps_PorAno AS PARTITION pf_PorAno ALL TO ([PRIMARY]);",
+        "GO",
+    ]
+    for t, colunas in ddl.items():
+        pk, fks = restricoes[t]
+        fk = {col: (ref, ref_col) for col, ref, ref_col in fks}
+        particao = PARTICOES.get(t)
+        linhas = []
+        for c in colunas:
+            linha = f"    {c.nome} {_tipo_tsql(c)}"
+            if pk == [c.nome]:
+                linha += " PRIMARY KEY NONCLUSTERED" if particao else " PRIMARY KEY"
+            if c.nome in fk:
+                linha += f" FOREIGN KEY REFERENCES {fk[c.nome][0]}({fk[c.nome][1]})"
+            linhas.append(linha)
+        linhas += [f"    {nome} {tipo}" for nome, tipo in COLUNAS_PERSISTIDAS.get(t, [])]
+        if len(pk) > 1:
+            linhas.append(f"    PRIMARY KEY{' NONCLUSTERED' if particao else ''} ({', '.join(pk)})")
+        out += ["", f"-- {t}" + (f" (particionada por ano de {particao})" if particao else ""),
+                f"CREATE TABLE {t} (", ",\n".join(linhas), ");", "GO"]
+        if particao:
+            out += [f"CREATE CLUSTERED INDEX CX_{t} ON {t} ({particao}) "
+                    f"WITH (DATA_COMPRESSION = PAGE) ON ps_PorAno({particao});", "GO"]
+    out += ["", "-- Índices não clusterizados (alinhados às partições nas fatos)"]
+    for t, chave, incluidas in indices_performance():
+        sql = f"CREATE NONCLUSTERED INDEX {_nome_indice(t, chave)} ON {t} ({', '.join(chave)})"
+        if incluidas:
+            sql += f" INCLUDE ({', '.join(incluidas)})"
+        if t in PARTICOES:
+            sql += f" ON ps_PorAno({PARTICOES[t]})"
+        out.append(sql + ";")
+    out.append("GO")
+    return "\n".join(out) + "\n"
+
+def gravar_ddl_performance(path=DDL_PERFORMANCE_PATH, **kwargs):
+    # CRLF como os demais .sql do repositório
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+        f.write(ddl_performance(**kwargs))
+    return path
+
+def ajustes_embutidos(motor, tabelas):
+    """(reordenar, índices): SQL do desenho de performance para SQLite/DuckDB.
+
+    `reordenar` roda antes dos índices da carga (regrava as fatos em ordem de data);
+    `índices` depois, com as colunas incluídas no fim da chave.
+    """
+    reordenar = []
+    for t, col in PARTICOES.items():
+        if t in tabelas:
+            reordenar += [f"CREATE TABLE {t}__ord AS SELECT * FROM {t} ORDER BY {col}",
+                          f"DROP TABLE {t}",
+                          f"ALTER TABLE {t}__ord RENAME TO {t}"]
+    restricoes = restricoes_ddl()
+    indices = []
+    for t, chave, incluidas in indices_performance(tabelas):
+        # a carga já cria índices nas FKs; aqui só datas e cobertura
+        if not incluidas and any([c] == chave for c, _, _ in restricoes[t].fks):
+            continue
+        indices.append(f"CREATE INDEX {_nome_indice(t, chave)} ON {t} ({', '.join(chave + incluidas)})")
+    indices.append("ANALYZE")
+    return reordenar, indices
+
+# =========================
+# CONSULTAS (05_analysis_queries.sql) E TRADUÇÃO DE DIALETO
+# =========================
+CONSULTAS_PATH = os.path.join(os.path.dirname(DDL_PATH), "05_analysis_queries.sql")
+
+# As mesmas quatro consultas reescritas para o esquema de performance: agrupam pelas chaves
+# de período persistidas (Pagamentos.AnoMes, Reservas.CheckInAno/CheckInMes)
+CONSULTAS_PERFORMANCE = [
+    """
+WITH DiariasReservadas AS (
+    SELECT R.HotelID, R.ReservaID, DATEDIFF(DAY, R.DataCheckIn, R.DataCheckOut) AS DiariasOcupadas
+    FROM Reservas R
+),
+ReceitaPorReserva AS (
+    SELECT P.ReservaID, SUM(P.Valor) AS ReceitaReserva,
+           MAX(P.DataPagamento) AS DataPagamento, MAX(P.AnoMes) AS AnoMes
+    FROM Pagamentos P
+    GROUP BY P.ReservaID
+),
+CapacidadeHotel AS (
+    SELECT Q.HotelID, COUNT(Q.QuartoID) AS QtdeQuartos FROM Quartos Q GROUP BY Q.HotelID
+)
+SELECT
+    H.NomeHotel,
+    CAST(LEFT(RPR.AnoMes, 4) AS INT) AS Ano,
+    CAST(RIGHT(RPR.AnoMes, 2) AS INT) AS Mes,
+    CAST(SUM(RPR.ReceitaReserva) AS DECIMAL(10,2)) AS ReceitaTotal,
+    CAST(SUM(DR.DiariasOcupadas) AS INT) AS DiariasOcupadas,
+    (MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))) AS DiariasDisponiveis,
+    CAST(SUM(RPR.ReceitaReserva) / NULLIF(SUM(DR.DiariasOcupadas),0) AS DECIMAL(10,2)) AS ADR,
+    CAST(SUM(DR.DiariasOcupadas) * 1.0 /
+             NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))),0) * 100 AS DECIMAL(5,2)) AS TaxaOcupacao,
+    CAST(SUM(RPR.ReceitaReserva) / NULLIF((MAX(CH.QtdeQuartos) * DAY(EOMONTH(MAX(RPR.DataPagamento)))),0) AS DECIMAL(10,2)) AS RevPAR
+FROM ReceitaPorReserva RPR
+INNER JOIN DiariasReservadas DR ON RPR.ReservaID = DR.ReservaID
+INNER JOIN Hoteis H ON DR.HotelID = H.HotelID
+INNER JOIN CapacidadeHotel CH ON H.HotelID = CH.HotelID
+GROUP BY H.NomeHotel, RPR.AnoMes
+ORDER BY Ano, Mes, H.NomeHotel
+""",
+    """
+SELECT res.CheckInAno AS Ano, res.CheckInMes AS Mes, SUM(pg.Valor) AS ReceitaMensal
+FROM Reservas AS res
+JOIN Pagamentos AS pg ON res.ReservaID = pg.ReservaID
+GROUP BY res.CheckInAno, res.CheckInMes
+HAVING SUM(pg.Valor) > (
+    SELECT AVG(ReceitaTotal_Mes)
+    FROM (
+        SELECT res_sub.CheckInAno, res_sub.CheckInMes, SUM(pg_sub.Valor) AS ReceitaTotal_Mes
+        FROM Reservas AS res_sub
+        JOIN Pagamentos AS pg_sub ON res_sub.ReservaID = pg_sub.ReservaID
+        GROUP BY res_sub.CheckInAno, res_sub.CheckInMes
+    ) AS ReceitaPorMes
+)
+ORDER BY Ano, Mes DESC
+""",
+    None,  # 3 e 4 não agrupam por data: mesma consulta, só os índices mudam
+    None,
+]
+
+def consultas_base(path=CONSULTAS_PATH):
+    """As consultas de 05_analysis_queries.sql (T-SQL), na ordem do arquivo."""
+    with open(path, encoding="utf-8") as f:
+        sql = f.read()
+    sql = re.sub(r"/\*.*?\*/", "", sql, flags=re.S)
+    sql = "\n".join(l for l in sql.splitlines() if not l.strip().startswith("--"))
+    return [q.strip() for q in re.split(r";\s*(?:\n|$)", sql) if "SELECT" in q.upper()]
+
+def consultas_performance(path=CONSULTAS_PATH):
+    return [otimizada or base for otimizada, base in zip(CONSULTAS_PERFORMANCE, consultas_base(path))]
+
+def _trocar_funcao(sql, nome, f):
+    """Substitui NOME(arg1, arg2...) por f(args), respeitando parênteses aninhados."""
+    padrao = re.compile(rf"\b{nome}\s*\(", re.I)
+    while True:
+        m = padrao.search(sql)
+        if not m:
+            return sql
+        nivel, ini, args, i = 1, m.end(), [], m.end()
+        while nivel:
+            c = sql[i]
+            if c == "(":
+                nivel += 1
+            elif c == ")":
+                nivel -= 1
+            elif c == "," and nivel == 1:
+                args.append(sql[ini:i].strip())
+                ini = i + 1
+            i += 1
+        args.append(sql[ini:i - 1].strip())
+        sql = sql[:m.start()] + f(*args) + sql[i:]
+
+def traduzir(sql, motor):
+    """T-SQL das consultas -> dialeto do motor embutido (datas, concatenação, LEFT/RIGHT)."""
+    sql = re.sub(r"(\w+\.\w+)\s*\+\s*' '\s*\+\s*(\w+\.\w+)", r"\1 || ' ' || \2", sql)
+    if motor == "duckdb":
+        sql = _trocar_funcao(sql, "DATEDIFF", lambda unidade, a, b: f"DATE_DIFF('day', {a}, {b})")
+        return _trocar_funcao(sql, "EOMONTH", lambda d: f"LAST_DAY({d})")
+    sql = _trocar_funcao(sql, "DAY", lambda d: (
+        f"CAST(strftime('%d', {d[len('EOMONTH('):-1]}, 'start of month', '+1 month', '-1 day') AS INTEGER)"
+        if d.upper().startswith("EOMONTH(") else f"CAST(strftime('%d', {d}) AS INTEGER)"))
+    sql = _trocar_funcao(sql, "YEAR", lambda d: f"CAST(strftime('%Y', {d}) AS INTEGER)")
+    sql = _trocar_funcao(sql, "MONTH", lambda d: f"CAST(strftime('%m', {d}) AS INTEGER)")
+    sql = _trocar_funcao(sql, "DATEDIFF", lambda unidade, a, b: f"CAST(julianday({b}) - julianday({a}) AS INTEGER)")
+    sql = _trocar_funcao(sql, "LEFT", lambda s, n: f"substr({s}, 1, {n})")
+    return _trocar_funcao(sql, "RIGHT", lambda s, n: f"substr({s}, -{n})")
+
+if __name__ == "__main__":
+    print(f"OK -> {gravar_ddl_performance()}")
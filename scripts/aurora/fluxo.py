@@ -0,0 +1,265 @@
+# =========================
+# FLUXO DE EVENTOS DE RESERVAS (asyncio)
+# =========================
+"""Reservas, cancelamentos, check-ins/outs, pagamentos, feedback e reclamações como um fluxo
+de eventos em ordem de tempo, para testes de carga de pipelines de ingestão.
+
+Uso (a partir de scripts/):
+    python -m aurora.fluxo --sf 0.1 --taxa 50000 > eventos.jsonl
+    python -m aurora.fluxo --origem <pasta do gerador> --compressao 86400 --socket localhost:9000
+    python -m aurora.fluxo --sf 1 --de 2025-01-01 --limite 1000000 --saida /dev/null
+
+Os dados são as tabelas do gerador (aurora.grafo.generate, com cache, ou uma pasta de
+saída); o fluxo só reordena o que já foi gerado. Cada evento é um dict JSON com seq, ts
+(YYYY-MM-DDTHH:MM:SS), tipo e as colunas do DDL da linha de origem:
+
+    reserva_criada     DataReserva (todas as reservas, inclusive as que serão canceladas)
+    reserva_cancelada  entre DataReserva e DataCheckIn (Status = Cancelada)
+    no_show / check_in DataCheckIn;  check_out  DataCheckOut (Confirmada)
+    pagamento          DataPagamento;  feedback  DataFeedback;  reclamacao  DataReclamacao
+
+As tabelas só têm datas: o horário de cada evento é sorteado (semente fixa) numa faixa
+típica do tipo e nunca fica antes da criação da reserva. Os eventos são montados em lotes
+vetorizados (ordem por np.lexsort; ts formatado por datetime_as_string) e emitidos um a um.
+
+Ritmo: `taxa` limita os eventos por segundo; `compressao` reproduz a forma do tráfego, com
+`compressao` segundos simulados por segundo real (86400 = um dia por segundo); sem nenhum
+dos dois, o fluxo sai o mais rápido possível. A contrapressão é a do próprio gerador
+assíncrono: nada é produzido antes de o consumidor pedir o próximo evento, e o destino por
+socket espera o drain() do transporte a cada lote.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .kpis import ler_tabela
+
+TABELAS = ["Reservas", "Pagamentos", "Feedback", "Reclamacoes"]
+
+# tipo: (tabela de origem, colunas do evento, faixa de horário em horas); a ordem desempata
+# eventos no mesmo segundo
+TIPOS = {
+    "reserva_criada":    ("Reservas",    ["ReservaID", "HotelID", "QuartoID", "ClienteID", "CanalID",
+                                          "DataCheckIn", "DataCheckOut", "Noites"], (0, 24)),
+    "reserva_cancelada": ("Reservas",    ["ReservaID", "HotelID"], (0, 24)),
+    "no_show":           ("Reservas",    ["ReservaID", "HotelID", "QuartoID"], (22, 24)),
+    "check_in":          ("Reservas",    ["ReservaID", "HotelID", "QuartoID"], (14, 22)),
+    "pagamento":         ("Pagamentos",  ["PagamentoID", "ReservaID", "Valor", "FormaPagamento"], (8, 23)),
+    "check_out":         ("Reservas",    ["ReservaID", "HotelID", "QuartoID"], (7, 12)),
+    "reclamacao":        ("Reclamacoes", ["ReclamacaoID", "ReservaID", "HotelID", "Motivo", "Status"], (8, 22)),
+    "feedback":          ("Feedback",    ["FeedbackID", "ReservaID", "Nota"], (8, 23)),
+}
+NOMES_TIPOS = list(TIPOS)
+
+def _segundos(datas):
+    """datetime64 (qualquer unidade) -> segundos desde 1970 do início do dia."""
+    return datas.astype("datetime64[D]").astype(np.int64) * 86400
+
+def _horario(rng, tipo, n):
+    ini, fim = TIPOS[tipo][2]
+    return rng.integers(ini * 3600, fim * 3600, size=n)
+
+def _json(valores):
+    """Texto JSON de cada valor (números como estão; textos entre aspas, codificados uma vez por valor único)."""
+    if valores.dtype.kind in "iuf":
+        return valores.astype(str).astype(object)
+    codigos, unicos = pd.factorize(valores)
+    return np.array([json.dumps(u, ensure_ascii=False) for u in unicos], dtype=object)[codigos]
+
+def _valores(df, coluna):
+    """Coluna pronta para JSON: datas em ISO, DECIMAL (centavos) em float, o resto como veio."""
+    s = df[coluna]
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return np.datetime_as_string(s.to_numpy().astype("datetime64[D]")).astype(object)
+    if coluna == "Valor":
+        return s.to_numpy() / 100
+    return s.to_numpy(dtype=object) if isinstance(s.dtype, pd.CategoricalDtype) else s.to_numpy()
+
+class Linha:
+    """Eventos montados de todas as tabelas, ordenados por tempo (arrays paralelos)."""
+    def __init__(self, tabelas, seed=42, de=None, ate=None):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(len(TIPOS),)))
+        r = tabelas["Reservas"]
+        status = r["Status"].to_numpy(dtype=object)
+        reserva = r["ReservaID"].to_numpy()
+        criada = _segundos(r["DataReserva"].to_numpy()) + _horario(rng, "reserva_criada", len(r))
+        checkin = _segundos(r["DataCheckIn"].to_numpy())
+
+        def por_reserva(ids):
+            pos = np.searchsorted(reserva, ids)
+            return criada[np.minimum(pos, len(reserva) - 1)]
+
+        partes = {}
+        partes["reserva_criada"] = (np.arange(len(r)), criada)
+        cancel = np.flatnonzero(status == "Cancelada")
+        # data do cancelamento: uniforme entre a reserva e o check-in
+        janela = np.maximum(checkin[cancel] - criada[cancel], 1)
+        partes["reserva_cancelada"] = (cancel, criada[cancel] + 1 + (rng.random(len(cancel)) * janela).astype(np.int64))
+        for tipo, st, coluna in [("no_show", "No-Show", "DataCheckIn"), ("check_in", "Confirmada", "DataCheckIn"),
+                                 ("check_out", "Confirmada", "DataCheckOut")]:
+            idx = np.flatnonzero(status == st)
+            ts = _segundos(r[coluna].to_numpy()[idx]) + _horario(rng, tipo, len(idx))
+            partes[tipo] = (idx, np.maximum(ts, criada[idx] + 1))
+        for tipo, tabela, coluna in [("pagamento", "Pagamentos", "DataPagamento"),
+                                     ("reclamacao", "Reclamacoes", "DataReclamacao"),
+                                     ("feedback", "Feedback", "DataFeedback")]:
+            t = tabelas[tabela]
+            ts = _segundos(t[coluna].to_numpy()) + _horario(rng, tipo, len(t))
+            partes[tipo] = (np.arange(len(t)), np.maximum(ts, por_reserva(t["ReservaID"].to_numpy()) + 1))
+
+        self.colunas = {tipo: [(c, _valores(tabelas[tab], c)) for c in cols] for tipo, (tab, cols, _) in TIPOS.items()}
+        self.textos = {tipo: [_json(v) for _, v in colunas] for tipo, colunas in self.colunas.items()}
+        # modelo da linha JSON de cada tipo: seq, ts e as colunas entram pelo format
+        self.modelos = {tipo: ('{{"seq":{},"ts":"{}","tipo":"' + tipo + '",'
+                               + ",".join(f'"{c}":{{}}' for c in cols) + "}}")
+                        for tipo, (_, cols, _) in TIPOS.items()}
+        self.tipo = np.concatenate([np.full(len(partes[t][0]), k, dtype=np.int8) for k, t in enumerate(NOMES_TIPOS)])
+        self.linha = np.concatenate([partes[t][0] for t in NOMES_TIPOS])
+        self.ts = np.concatenate([partes[t][1] for t in NOMES_TIPOS])
+        manter = np.ones(len(self.ts), dtype=bool)
+        if de is not None:
+            manter &= self.ts >= _segundos(np.datetime64(pd.Timestamp(de).date()))
+        if ate is not None:
+            manter &= self.ts < _segundos(np.datetime64(pd.Timestamp(ate).date())) + 86400
+        ordem = np.flatnonzero(manter)[np.lexsort((self.tipo[manter], self.ts[manter]))]
+        self.tipo, self.linha, self.ts = self.tipo[ordem], self.linha[ordem], self.ts[ordem]
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _por_tipo(self, ini, fim):
+        """(posições no lote, nome do tipo, seq, ts, linhas de origem) de cada tipo presente em [ini, fim)."""
+        tipo, linha = self.tipo[ini:fim], self.linha[ini:fim]
+        ts = np.datetime_as_string(self.ts[ini:fim].astype("datetime64[s]")).astype(object)
+        for k in np.unique(tipo).tolist():
+            pos = np.flatnonzero(tipo == k)
+            yield pos, NOMES_TIPOS[k], (pos + ini).tolist(), ts[pos].tolist(), linha[pos]
+
+    def lote(self, ini, fim):
+        """Eventos [ini, fim) como dicts, na ordem."""
+        out = [None] * (fim - ini)
+        for pos, nome, seq, ts, linha in self._por_tipo(ini, fim):
+            campos = ["seq", "ts", "tipo"] + [c for c, _ in self.colunas[nome]]
+            valores = [seq, ts, [nome] * len(pos)] + [v[linha].tolist() for _, v in self.colunas[nome]]
+            for p, vals in zip(pos.tolist(), zip(*valores)):
+                out[p] = dict(zip(campos, vals))
+        return out
+
+    def linhas_json(self, ini, fim):
+        """Eventos [ini, fim) já como linhas JSON (sem dicts nem json.dumps por evento)."""
+        out = [None] * (fim - ini)
+        for pos, nome, seq, ts, linha in self._por_tipo(ini, fim):
+            textos = map(self.modelos[nome].format, seq, ts, *(v[linha].tolist() for v in self.textos[nome]))
+            for p, txt in zip(pos.tolist(), textos):
+                out[p] = txt
+        return out
+
+def carregar_tabelas(origem=None, params=None, cache_dir=None):
+    """Tabelas de origem: pasta de saída do gerador ou generate(params) (com cache)."""
+    if origem is not None:
+        return {t: ler_tabela(origem, t) for t in TABELAS}
+    from .grafo import generate
+    return generate(TABELAS, params, cache_dir)
+
+async def _ritmo(linha, taxa=None, compressao=None, limite=None, lote=2000):
+    """Faixas [ini, fim) de eventos liberadas no ritmo pedido (ver o docstring do módulo)."""
+    total = len(linha) if limite is None else min(limite, len(linha))
+    if taxa:
+        lote = max(1, min(lote, int(taxa // 100)))  # lotes de ~10 ms com taxa baixa
+    t0, ts0 = time.perf_counter(), int(linha.ts[0]) if total else 0
+    for ini in range(0, total, lote):
+        espera = ini / taxa if taxa else 0.0
+        if compressao:
+            espera = max(espera, (int(linha.ts[ini]) - ts0) / compressao)
+        atraso = t0 + espera - time.perf_counter()
+        if atraso > 0:
+            await asyncio.sleep(atraso)
+        yield ini, min(ini + lote, total)
+        await asyncio.sleep(0)  # deixa o loop atender outras tarefas entre lotes
+
+async def eventos(linha, taxa=None, compressao=None, limite=None, lote=2000):
+    """Gerador assíncrono dos eventos (dicts) da Linha, no ritmo pedido.
+
+    taxa: máximo de eventos/s; compressao: segundos simulados por segundo real. O ritmo é
+    aplicado por lote (até `lote` eventos, menos se a taxa for baixa).
+    """
+    async for ini, fim in _ritmo(linha, taxa, compressao, limite, lote):
+        for ev in linha.lote(ini, fim):
+            yield ev
+
+async def lotes_json(linha, taxa=None, compressao=None, limite=None, lote=2000):
+    """Como `eventos`, mas cada item é um lote de linhas JSON (o caminho rápido dos destinos)."""
+    async for ini, fim in _ritmo(linha, taxa, compressao, limite, lote):
+        yield linha.linhas_json(ini, fim)
+
+# =========================
+# DESTINOS
+# =========================
+async def para_arquivo(lotes, arquivo):
+    """Lotes de linhas JSON (lotes_json) em um arquivo de texto aberto (ex.: sys.stdout); retorna o nº de eventos."""
+    n = 0
+    async for linhas in lotes:
+        arquivo.write("\n".join(linhas) + "\n")
+        n += len(linhas)
+    arquivo.flush()
+    return n
+
+async def para_socket(lotes, endereco):
+    """Lotes de linhas JSON em um socket local: "host:porta" (TCP) ou caminho de um socket Unix."""
+    if ":" in endereco:
+        host, porta = endereco.rsplit(":", 1)
+        _, writer = await asyncio.open_connection(host or "localhost", int(porta))
+    else:
+        _, writer = await asyncio.open_unix_connection(endereco)
+    n = 0
+    try:
+        async for linhas in lotes:
+            writer.write(("\n".join(linhas) + "\n").encode("utf-8"))
+            n += len(linhas)
+            await writer.drain()  # contrapressão: espera o consumidor esvaziar o buffer do transporte
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return n
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Emite as reservas do gerador como fluxo de eventos (JSON lines).")
+    ap.add_argument("--origem", default=None, help="pasta de saída do gerador (padrão: generate com cache)")
+    ap.add_argument("--sf", type=float, default=1.0)
+    ap.add_argument("--date-end", default="2025-12-31")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--cache", default=None)
+    ap.add_argument("--de", default=None, help="primeiro dia do fluxo (YYYY-MM-DD)")
+    ap.add_argument("--ate", default=None, help="último dia do fluxo (YYYY-MM-DD)")
+    ap.add_argument("--taxa", type=float, default=None, help="máximo de eventos por segundo")
+    ap.add_argument("--compressao", type=float, default=None, help="segundos simulados por segundo real")
+    ap.add_argument("--limite", type=int, default=None, help="número máximo de eventos")
+    grupo = ap.add_mutually_exclusive_group()
+    grupo.add_argument("--saida", default="-", help="arquivo JSON lines (- = stdout)")
+    grupo.add_argument("--socket", default=None, help="host:porta (TCP) ou caminho de socket Unix")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    tabelas = carregar_tabelas(args.origem, {"sf": args.sf, "date_end": args.date_end, "seed": args.seed}, args.cache)
+    linha = Linha(tabelas, args.seed, args.de, args.ate)
+    t1 = time.perf_counter()
+    fluxo = lotes_json(linha, args.taxa, args.compressao, args.limite)
+    if args.socket:
+        n = asyncio.run(para_socket(fluxo, args.socket))
+    elif args.saida == "-":
+        n = asyncio.run(para_arquivo(fluxo, sys.stdout))
+    else:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            n = asyncio.run(para_arquivo(fluxo, f))
+    t2 = time.perf_counter()
+    print(f"{len(linha):,d} eventos montados em {t1 - t0:.2f}s; {n:,d} emitidos em {t2 - t1:.2f}s "
+          f"({n / max(t2 - t1, 1e-9):,.0f} eventos/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# =========================
+# GRAFO DE TABELAS E API DE GERAÇÃO COM CACHE
+# =========================
+"""Geração sob demanda: só o subgrafo das tabelas pedidas, com cache em disco.
+
+Uso como biblioteca (a partir de scripts/ ou com scripts/ no PYTHONPATH):
+    from aurora.grafo import generate
+    t = generate(["Reservas", "Pagamentos"], {"sf": 0.1})
+    t["Reservas"].head()
+
+Uso pela linha de comando (aquece o cache):
+    python -m aurora.grafo --tabelas Reservas Pagamentos --sf 0.1
+
+O gerador declara as tabelas como nós de um Grafo (Hoteis -> Quartos -> contexto ->
+Reservas -> Fidelidade/Cubos...; ver NOS em 01_hotel_portfolio_generator_.py) e avalia só
+os nós de que as tabelas pedidas dependem. Os DataFrames (tipos compactos de
+aurora.schema.tipar) ficam em <cache>/<chave>/<Tabela>.pkl, onde a chave é um hash dos
+parâmetros, da semente, da data de referência (hoje, de que saem as datas de cadastro) e
+da versão do código (conteúdo do gerador, de aurora/*.py e do DDL): mudar qualquer um deles
+gera uma chave nova e o cache antigo simplesmente deixa de ser lido. Com tudo em cache, generate não importa o gerador (nem o Faker).
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from functools import lru_cache
+
+import pandas as pd
+
+from .benchmark import GERADOR, SCRIPTS_DIR
+from .schema import DDL_PATH, carregar_ddl
+
+CACHE_DIR = os.environ.get("AURORA_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "aurora"))
+
+# parâmetro: (variável de ambiente do gerador, padrão); workers não muda o resultado e fica fora da chave
+PARAMETROS = {
+    "sf":       ("AURORA_SF", 1.0),
+    "date_end": ("AURORA_DATE_END", "2025-12-31"),
+    "seed":     ("AURORA_SEED", 42),
+    "hoje":     ("AURORA_HOJE", "today"),
+}
+FORA_DA_CHAVE = {"workers": ("AURORA_WORKERS", 1)}
+
+class Grafo:
+    """Avaliação preguiçosa de nós {nome: (dependências, função(grafo))}; cada nó roda uma vez."""
+    def __init__(self, nos):
+        self.nos = nos
+        self.valores = {}
+
+    def __getitem__(self, nome):
+        if nome not in self.valores:
+            dependencias, func = self.nos[nome]
+            for dep in dependencias:
+                self[dep]
+            self.valores[nome] = func(self)
+        return self.valores[nome]
+
+def normalizar(params=None):
+    """Parâmetros completos e canônicos (valores padrão preenchidos), na ordem de PARAMETROS."""
+    params = dict(params or {})
+    desconhecidos = set(params) - set(PARAMETROS) - set(FORA_DA_CHAVE)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(desconhecidos)} (use {', '.join([*PARAMETROS, *FORA_DA_CHAVE])})")
+    out = {}
+    for nome, (_, padrao) in {**PARAMETROS, **FORA_DA_CHAVE}.items():
+        valor = params.get(nome, padrao)
+        if nome == "sf":
+            valor = float(valor)
+        elif nome in ("date_end", "hoje"):
+            valor = pd.Timestamp(valor).date().isoformat()
+        else:
+            valor = int(valor)
+        out[nome] = valor
+    return out
+
+@lru_cache(maxsize=1)
+def versao_codigo():
+    """Hash do conteúdo do gerador, dos módulos aurora/*.py e do DDL."""
+    h = hashlib.sha256()
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    arquivos = [GERADOR, DDL_PATH] + sorted(os.path.join(pasta, f) for f in os.listdir(pasta) if f.endswith(".py"))
+    for path in arquivos:
+        with open(path, "rb") as f:
+            h.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return h.hexdigest()
+
+def chave_cache(params):
+    """Chave do cache: parâmetros que mudam o resultado + versão do código."""
+    params = normalizar(params)
+    conteudo = json.dumps({"params": {k: params[k] for k in PARAMETROS}, "codigo": versao_codigo()},
+                          sort_keys=True)
+    return hashlib.sha256(conteudo.encode()).hexdigest()[:20]
+
+def carregar_gerador(params):
+    """Importa o gerador com os parâmetros no ambiente (em memória, sem streaming nem incremental)."""
+    params = normalizar(params)
+    env = {var: str(params[nome]) for nome, (var, _) in {**PARAMETROS, **FORA_DA_CHAVE}.items()}
+    env.update(AURORA_STREAMING="0", AURORA_INCREMENTAL="0", AURORA_FORMATOS="csv",
+               AURORA_OUTPUT_DIR=os.path.join(CACHE_DIR, "saida"))
+    antes = {k: v for k, v in os.environ.items() if k.startswith("AURORA_")}
+    nome = f"aurora_gerador_{chave_cache(params)}"
+    try:
+        for k in antes:
+            del os.environ[k]
+        os.environ.update(env)
+        spec = importlib.util.spec_from_file_location(nome, GERADOR)
+        modulo = importlib.util.module_from_spec(spec)
+        # registrado antes de executar: os workers (fork) resolvem as funções dos shards por nome
+        sys.modules[nome] = modulo
+        if SCRIPTS_DIR not in sys.path:
+            sys.path.insert(0, SCRIPTS_DIR)
+        spec.loader.exec_module(modulo)
+    finally:
+        for k in env:
+            os.environ.pop(k, None)
+        os.environ.update(antes)
+    return modulo
+
+def _gravar(path, df):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+def generate(tables=None, params=None, cache_dir=None, usar_cache=True):
+    """{tabela: DataFrame} das tabelas pedidas (todas do DDL por padrão).
+
+    params: sf, date_end, seed, hoje (entram na chave do cache; hoje é a data do dia por
+    padrão) e workers. As tabelas que faltam
+    no cache são geradas juntas (um único subgrafo) e todas as que esses nós produziram
+    são guardadas.
+    """
+    todas = list(carregar_ddl())
+    tables = todas if tables is None else list(tables)
+    desconhecidas = [t for t in tables if t not in todas]
+    if desconhecidas:
+        raise KeyError(f"Tabelas desconhecidas: {desconhecidas}")
+    pasta = os.path.join(cache_dir or CACHE_DIR, chave_cache(params))
+    arquivo = {t: os.path.join(pasta, f"{t}.pkl") for t in todas}
+
+    out = {}
+    if usar_cache:
+        out = {t: pd.read_pickle(arquivo[t]) for t in tables if os.path.exists(arquivo[t])}
+    faltam = [t for t in tables if t not in out]
+    if faltam:
+        geradas = carregar_gerador(params).gerar_tabelas(faltam)
+        if usar_cache:
+            os.makedirs(pasta, exist_ok=True)
+            for t, df in geradas.items():
+                _gravar(arquivo[t], df)
+        out.update({t: geradas[t] for t in faltam})
+    return {t: out[t] for t in tables}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gera (ou lê do cache) só as tabelas pedidas.")
+    ap.add_argument("--tabelas", nargs="+", default=None, help="padrão: todas as tabelas do DDL")
+    ap.add_argument("--sf", type=float, default=PARAMETROS["sf"][1])
+    ap.add_argument("--date-end", default=PARAMETROS["date_end"][1])
+    ap.add_argument("--seed", type=int, default=PARAMETROS["seed"][1])
+    ap.add_argument("--hoje", default=PARAMETROS["hoje"][1], help="data de referência (AAAA-MM-DD; padrão: hoje)")
+    ap.add_argument("--workers", type=int, default=FORA_DA_CHAVE["workers"][1])
+    ap.add_argument("--cache", default=CACHE_DIR)
+    args = ap.parse_args(argv)
+    params = {"sf": args.sf, "date_end": args.date_end, "seed": args.seed, "hoje": args.hoje,
+              "workers": args.workers}
+    tabelas = generate(args.tabelas, params, args.cache)
+    for nome, df in tabelas.items():
+        print(f"{nome:22s}: {len(df):>8,d}")
+    print(f"Cache -> {os.path.join(args.cache, chave_cache(params))}")
+
+if __name__ == "__main__":
+    main()
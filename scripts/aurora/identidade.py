@@ -0,0 +1,115 @@
+# =========================
+# IDENTIDADES SINTÉTICAS (pools + montagem vetorizada)
+# =========================
+"""Pools de valores do Faker sorteados uma única vez e montagem vetorizada de linhas.
+
+O Faker é chamado só para montar os pools (alguns milhares de valores por campo); as
+linhas são montadas por sorteio de índices e concatenação de strings em NumPy. CPFs e
+telefones são gerados diretamente em NumPy (CPF com dígitos verificadores válidos).
+"""
+
+import numpy as np
+
+TAMANHO_POOL = 4000
+
+# DDDs válidos no Brasil
+DDDS = np.array([11,12,13,14,15,16,17,18,19,21,22,24,27,28,31,32,33,34,35,37,38,41,42,43,44,45,
+                 46,47,48,49,51,53,54,55,61,62,63,64,65,66,67,68,69,71,73,74,75,77,79,81,82,83,
+                 84,85,86,87,88,89,91,92,93,94,95,96,97,98,99])
+
+# "0".."9999" pré-formatados (sufixo numérico dos e-mails)
+_NUMEROS = np.array([str(i) for i in range(10000)], dtype=object)
+
+def _unicos(gerador, tamanho, paciencia=500):
+    """Até `tamanho` valores distintos de gerador(), na ordem em que aparecem.
+
+    Para quando o provedor se esgota (`paciencia` sorteios seguidos sem valor novo).
+    """
+    vistos = {}
+    repetidos = 0
+    while len(vistos) < tamanho and repetidos < paciencia:
+        v = gerador()
+        repetidos = repetidos + 1 if v in vistos else 0
+        vistos.setdefault(v, None)
+    return np.array(list(vistos), dtype=object)
+
+def _para_email(valores):
+    return np.array([v.lower().replace(" ", "") for v in valores], dtype=object)
+
+def montar_pools(fake, tamanho=TAMANHO_POOL):
+    """Pools por campo a partir de um Faker já semeado (determinístico)."""
+    pools = {
+        "nomes":      _unicos(fake.first_name, tamanho),
+        "sobrenomes": _unicos(fake.last_name, tamanho),
+        "cidades":    _unicos(fake.city, tamanho // 2),
+        "ufs":        _unicos(fake.estado_sigla, 27),
+        "empresas":   _unicos(fake.company, tamanho // 2),
+        "dominios":   _unicos(fake.domain_name, tamanho // 2),
+        "frases":     np.array([fake.sentence(nb_words=12) for _ in range(tamanho)], dtype=object),
+        "palavras":   _unicos(fake.word, tamanho // 4),
+    }
+    pools["nomes_email"] = _para_email(pools["nomes"])
+    pools["sobrenomes_email"] = _para_email(pools["sobrenomes"])
+    return pools
+
+def sortear(rng, pool, n):
+    return pool[rng.integers(0, len(pool), size=n)]
+
+def _bytes_para_str(matriz):
+    """Matriz (n, k) de bytes ASCII -> array object de strings de k caracteres."""
+    matriz = np.ascontiguousarray(matriz, dtype=np.uint8)
+    return matriz.view(f"S{matriz.shape[1]}").ravel().astype(f"U{matriz.shape[1]}").astype(object)
+
+def cpfs(rng, n):
+    """CPFs válidos formatados (000.000.000-00)."""
+    d = np.empty((n, 11), dtype=np.uint8)
+    d[:, :9] = rng.integers(0, 10, size=(n, 9), dtype=np.uint8)
+    # 1º dígito: pesos 10..2 sobre os 9 primeiros; 2º: pesos 11..2 sobre os 10 primeiros
+    for pos in (9, 10):
+        resto = (d[:, :pos] @ np.arange(pos + 1, 1, -1, dtype=np.float64)).astype(np.int64) % 11
+        d[:, pos] = np.where(resto < 2, 0, 11 - resto)
+    d += ord("0")
+    m = np.empty((n, 14), dtype=np.uint8)
+    m[:, 0:3], m[:, 4:7], m[:, 8:11], m[:, 12:14] = d[:, 0:3], d[:, 3:6], d[:, 6:9], d[:, 9:11]
+    m[:, 3] = m[:, 7] = ord(".")
+    m[:, 11] = ord("-")
+    return _bytes_para_str(m)
+
+def cpf_valido(cpf):
+    """Confere os dígitos verificadores de um CPF (formatado ou não)."""
+    d = [int(c) for c in cpf if c.isdigit()]
+    if len(d) != 11:
+        return False
+    for pos in (9, 10):
+        resto = sum(x * w for x, w in zip(d[:pos], range(pos + 1, 1, -1))) % 11
+        if d[pos] != (0 if resto < 2 else 11 - resto):
+            return False
+    return True
+
+def telefones(rng, n):
+    """Telefones no formato +55 DD NNNN-NNNN."""
+    m = np.empty((n, 16), dtype=np.uint8)
+    m[:, :4] = np.frombuffer(b"+55 ", dtype=np.uint8)
+    ddd = DDDS[rng.integers(0, len(DDDS), size=n)]
+    m[:, 4] = ddd // 10 + ord("0")
+    m[:, 5] = ddd % 10 + ord("0")
+    m[:, 6] = ord(" ")
+    d = rng.integers(0, 10, size=(n, 8), dtype=np.uint8) + ord("0")
+    m[:, 7:11], m[:, 12:16] = d[:, :4], d[:, 4:]
+    m[:, 11] = ord("-")
+    return _bytes_para_str(m)
+
+def emails(rng, i_nome, i_sobrenome, pools, dominios):
+    """nome.sobrenome<0-9998>@dominio, a partir dos índices já sorteados nos pools.
+
+    Prefixos e sufixos são montados só para as combinações distintas e depois indexados,
+    de modo que cada linha custa uma única concatenação.
+    """
+    n = len(i_nome)
+    pares, i_par = np.unique(i_nome * len(pools["sobrenomes"]) + i_sobrenome, return_inverse=True)
+    prefixos = (pools["nomes_email"][pares // len(pools["sobrenomes"])] + "."
+                + pools["sobrenomes_email"][pares % len(pools["sobrenomes"])])
+    sufixos, i_suf = np.unique(rng.integers(0, 9999, size=n) * len(dominios)
+                               + rng.integers(0, len(dominios), size=n), return_inverse=True)
+    sufixos = _NUMEROS[sufixos // len(dominios)] + "@" + dominios[sufixos % len(dominios)]
+    return prefixos[i_par.ravel()] + sufixos[i_suf.ravel()]
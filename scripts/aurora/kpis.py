@@ -0,0 +1,274 @@
+# =========================
+# KPIs (RELATÓRIOS DE 05_analysis_queries.sql EM PANDAS)
+# =========================
+"""Os quatro relatórios de 05_analysis_queries.sql calculados direto dos frames ou arquivos.
+
+Uso (a partir de scripts/):
+    python -m aurora.kpis --origem <pasta do gerador> [--saida <pasta>] [--comparar ../data/raw]
+
+Valores monetários ficam em centavos (int64) até o fim, então somas são exatas e os
+arredondamentos seguem o CAST(... AS DECIMAL(p,2)) do SQL Server (metade para cima).
+A consulta 1 original junta Pagamentos duas vezes (na CTE e de novo na consulta principal),
+o que multiplica receita e diárias pelo nº de pagamentos da reserva; aqui, como no SQL
+corrigido, cada reserva entra uma vez, no mês do seu último pagamento.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .escrita_csv import arquivos_csv
+from .schema import tipar, concatenar, colunas_da_tabela
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # opcional: sem pyarrow, lê os CSVs
+    pa = pq = None
+
+RELATORIOS = {
+    # nome do arquivo em data/raw: colunas-chave para o diff
+    "ADR_e_OCUPACAO":              ["NomeHotel", "Ano", "Mes"],
+    "Analise_Temporalidade":       ["Ano", "Mes"],
+    "ClientesPorSegmento":         ["ClienteID"],
+    "Performance_Categoria_Quarto": ["CategoriaQuarto", "NomeHotel"],
+}
+
+COLUNAS_USADAS = {
+    "Hoteis":     ["HotelID", "NomeHotel"],
+    "Quartos":    ["QuartoID", "HotelID", "Tipo"],
+    "Clientes":   ["ClienteID", "Nome", "Sobrenome"],
+    "Reservas":   ["ReservaID", "HotelID", "QuartoID", "ClienteID", "DataCheckIn", "DataCheckOut"],
+    "Pagamentos": ["ReservaID", "Valor", "DataPagamento"],
+}
+
+# =========================
+# LEITURA
+# =========================
+def _ler_parquet(paths, tabela, colunas):
+    partes = []
+    for path in paths:
+        t = pq.read_table(path, columns=colunas)
+        # DECIMAL -> float para o tipar voltar ao int64 escalado; dicionários -> texto
+        t = pa.table({c: (t[c].cast(pa.float64()) if pa.types.is_decimal(t[c].type) else t[c])
+                      for c in t.column_names})
+        partes.append(tipar(t.to_pandas(), tabela))
+    return concatenar(partes)
+
+def ler_tabela(origem, tabela, colunas=None):
+    """Tabela no esquema compacto (tipar), só com `colunas`.
+
+    origem: dict {tabela: DataFrame | [chunks]} (frames do gerador) ou pasta de saída; na
+    pasta, usa <tabela>.parquet (+ incrementos <tabela>.NNN.parquet) se existir, senão os CSVs
+    (arquivo único ou partes, comprimidos ou não).
+    """
+    if isinstance(origem, dict):
+        df = origem[tabela]
+        df = concatenar(df) if isinstance(df, (list, tuple)) else df
+        return df[colunas] if colunas else df
+    base = os.path.join(origem, tabela)
+    parquets = sorted(glob.glob(f"{base}.parquet") + glob.glob(f"{base}.[0-9][0-9][0-9].parquet"))
+    if pq is not None and os.path.exists(f"{base}.parquet"):
+        return _ler_parquet(parquets, tabela, colunas)
+    texto = [c for c, col in colunas_da_tabela(tabela).items() if col.tipo not in ("INT", "DECIMAL", "DATE")]
+    partes = [pd.read_csv(path, usecols=colunas, encoding="utf-8",
+                          dtype={c: str for c in texto}, keep_default_na=False, na_values=[""])
+              for path in arquivos_csv(origem, tabela)]
+    return tipar(partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True), tabela)
+
+def ler_tabelas(origem):
+    return {t: ler_tabela(origem, t, cols) for t, cols in COLUNAS_USADAS.items()}
+
+# =========================
+# ARITMÉTICA DECIMAL
+# =========================
+def _dividir(num, den, escala=2):
+    """round(num / den, escala) com metade para cima (num >= 0), em inteiros; den = 0 -> NaN."""
+    num, den = np.asarray(num, dtype=np.int64), np.asarray(den, dtype=np.int64)
+    fator = 10 ** escala
+    seguro = np.where(den == 0, 1, den)
+    q = (2 * num * fator + seguro) // (2 * seguro)
+    return np.where(den == 0, np.nan, q / fator)
+
+def _reais(centavos):
+    return np.asarray(centavos, dtype=np.int64) / 100
+
+def _pagamentos_com_reserva(t):
+    """Pagamentos com as colunas da sua reserva (INNER JOIN Reservas ON ReservaID), por gather."""
+    res, pag = t["Reservas"], t["Pagamentos"]
+    ids = res["ReservaID"].to_numpy()
+    ordem = np.argsort(ids, kind="stable")
+    pos = np.searchsorted(ids, pag["ReservaID"].to_numpy(), sorter=ordem)
+    pos = np.minimum(pos, len(ids) - 1)
+    achou = ids[ordem[pos]] == pag["ReservaID"].to_numpy()
+    linhas = ordem[pos[achou]]
+    out = res.iloc[linhas].reset_index(drop=True)
+    out["Valor"] = pag["Valor"].to_numpy()[achou]
+    out["DataPagamento"] = pag["DataPagamento"].to_numpy()[achou]
+    return out
+
+def _nome_hotel(t, hotel_id):
+    h = t["Hoteis"]
+    return pd.Series(hotel_id).map(pd.Series(h["NomeHotel"].astype(str).to_numpy(), index=h["HotelID"].to_numpy()))
+
+def _ano_mes(datas):
+    m = np.asarray(datas).astype("datetime64[M]").astype(np.int64)
+    return 1970 + m // 12, m % 12 + 1
+
+# =========================
+# RELATÓRIOS
+# =========================
+def adr_ocupacao(t, pr=None):
+    """Consulta 1: receita, diárias, ADR, ocupação e RevPAR por hotel x mês do pagamento."""
+    pr = _pagamentos_com_reserva(t) if pr is None else pr
+    # uma linha por reserva: receita somada e data do último pagamento (sem o fan-out)
+    por_res = pr.groupby("ReservaID", sort=False).agg(
+        HotelID=("HotelID", "first"), Receita=("Valor", "sum"), DataPagamento=("DataPagamento", "max"),
+        DataCheckIn=("DataCheckIn", "first"), DataCheckOut=("DataCheckOut", "first"))
+    ano, mes = _ano_mes(por_res["DataPagamento"])
+    diarias = (por_res["DataCheckOut"].to_numpy() - por_res["DataCheckIn"].to_numpy()).astype("timedelta64[D]").astype(np.int64)
+    g = pd.DataFrame({"HotelID": por_res["HotelID"].to_numpy(), "Ano": ano, "Mes": mes,
+                      "Receita": por_res["Receita"].to_numpy(), "Diarias": diarias}
+                     ).groupby(["HotelID", "Ano", "Mes"], as_index=False).sum()
+    qtde_quartos = t["Quartos"].groupby("HotelID").size()
+    # DAY(EOMONTH(...)): dias do mês
+    m = (((g["Ano"] - 1970) * 12 + g["Mes"] - 1).to_numpy()).astype("datetime64[M]")
+    dias_mes = ((m + 1).astype("datetime64[D]") - m.astype("datetime64[D]")).astype(np.int64)
+    disponiveis = qtde_quartos.reindex(g["HotelID"]).to_numpy() * dias_mes
+    out = pd.DataFrame({
+        "NomeHotel": _nome_hotel(t, g["HotelID"].to_numpy()),
+        "Ano": g["Ano"].to_numpy(),
+        "Mes": g["Mes"].to_numpy(),
+        "ReceitaTotal": _reais(g["Receita"]),
+        "DiariasOcupadas": g["Diarias"].to_numpy(),
+        "DiariasDisponiveis": disponiveis,
+        "ADR": _dividir(g["Receita"], g["Diarias"] * 100),
+        "TaxaOcupacao": _dividir(g["Diarias"] * 100, disponiveis),
+        "RevPAR": _dividir(g["Receita"], disponiveis * 100),
+    })
+    return out.sort_values(["Ano", "Mes", "NomeHotel"], ignore_index=True)
+
+def temporalidade(t, pr=None):
+    """Consulta 2: meses (do check-in) com receita acima da média mensal."""
+    pr = _pagamentos_com_reserva(t) if pr is None else pr
+    ano, mes = _ano_mes(pr["DataCheckIn"])
+    g = pd.DataFrame({"Ano": ano, "Mes": mes, "Valor": pr["Valor"].to_numpy()}).groupby(["Ano", "Mes"], as_index=False).sum()
+    g = g[g["Valor"] > g["Valor"].mean()]
+    out = pd.DataFrame({"Ano": g["Ano"], "Mes": g["Mes"], "ReceitaMensal": _reais(g["Valor"])})
+    return out.sort_values(["Ano", "Mes"], ascending=[True, False], ignore_index=True)
+
+def clientes_por_segmento(t, pr=None):
+    """Consulta 3: gasto total por cliente e segmento de valor."""
+    pr = _pagamentos_com_reserva(t) if pr is None else pr
+    gasto = pr.groupby("ClienteID")["Valor"].sum()
+    cli = t["Clientes"].set_index("ClienteID").reindex(gasto.index)
+    reais = _reais(gasto.to_numpy())
+    out = pd.DataFrame({
+        "ClienteID": gasto.index.to_numpy(),
+        "NomeCliente": (cli["Nome"].astype(str) + " " + cli["Sobrenome"].astype(str)).to_numpy(),
+        "GastoTotal": reais,
+        "SegmentoDeValor": np.select([reais >= 10000, reais >= 5000], ["Alto Valor", "Médio Valor"], "Baixo Valor"),
+    })
+    return out.sort_values(["SegmentoDeValor", "ClienteID"], ignore_index=True)
+
+def performance_categoria(t, pr=None):
+    """Consulta 4: reservas e receita por tipo de quarto x hotel (só combinações com > 100)."""
+    pr = _pagamentos_com_reserva(t) if pr is None else pr
+    q = t["Quartos"]
+    tipo = pr["QuartoID"].map(pd.Series(q["Tipo"].astype(str).to_numpy(), index=q["QuartoID"].to_numpy()))
+    g = pd.DataFrame({"Tipo": tipo, "HotelID": pr["HotelID"].to_numpy(), "Valor": pr["Valor"].to_numpy()}
+                     ).groupby(["Tipo", "HotelID"], as_index=False).agg(Qtd=("Valor", "size"), Valor=("Valor", "sum"))
+    g = g[g["Qtd"] > 100]
+    out = pd.DataFrame({
+        "CategoriaQuarto": g["Tipo"].to_numpy(),
+        "NomeHotel": _nome_hotel(t, g["HotelID"].to_numpy()),
+        "QuantidadeReservas": g["Qtd"].to_numpy(),
+        "ReceitaTotal": _reais(g["Valor"]),
+    })
+    return out.sort_values("ReceitaTotal", ascending=False, ignore_index=True)
+
+def calcular(origem):
+    """Os quatro relatórios {nome do arquivo: DataFrame} a partir dos frames ou da pasta."""
+    return calcular_tabelas(ler_tabelas(origem))
+
+def calcular_tabelas(t):
+    pr = _pagamentos_com_reserva(t)
+    return {
+        "ADR_e_OCUPACAO": adr_ocupacao(t, pr),
+        "Analise_Temporalidade": temporalidade(t, pr),
+        "ClientesPorSegmento": clientes_por_segmento(t, pr),
+        "Performance_Categoria_Quarto": performance_categoria(t, pr),
+    }
+
+def gravar(relatorios, pasta):
+    os.makedirs(pasta, exist_ok=True)
+    for nome, df in relatorios.items():
+        df.to_csv(os.path.join(pasta, f"{nome}.csv"), index=False, encoding="utf-8", float_format="%.2f")
+
+# =========================
+# DIFF CONTRA OS CSVs DE REFERÊNCIA (data/raw)
+# =========================
+def comparar(df, path, chaves, tolerancia=0.005):
+    """Compara um relatório com o CSV de referência pelas chaves; retorna a lista de diferenças."""
+    ref = pd.read_csv(path, encoding="utf-8")
+    difs = []
+    if list(ref.columns) != list(df.columns):
+        return [f"colunas {list(df.columns)} != referência {list(ref.columns)}"]
+    m = df.merge(ref, on=chaves, how="outer", suffixes=("", "_ref"), indicator=True)
+    so_calc, so_ref = (m["_merge"] == "left_only").sum(), (m["_merge"] == "right_only").sum()
+    if so_calc or so_ref:
+        difs.append(f"{so_calc} linhas só no calculado, {so_ref} só na referência (de {len(ref)})")
+    ambos = m[m["_merge"] == "both"]
+    for c in df.columns:
+        if c in chaves:
+            continue
+        a, b = ambos[c], ambos[f"{c}_ref"]
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+            delta = (a - b).abs()
+            ruins = delta > tolerancia
+            if ruins.any():
+                difs.append(f"{c}: {ruins.sum()} linhas diferem (máx. |Δ| = {delta.max():,.2f})")
+        elif (a.astype(str) != b.astype(str)).any():
+            difs.append(f"{c}: {(a.astype(str) != b.astype(str)).sum()} linhas diferem")
+    return difs
+
+def comparar_pasta(relatorios, pasta, tolerancia=0.005):
+    """{relatório: [diferenças]} contra <pasta>/<relatório>.csv."""
+    return {nome: comparar(df, os.path.join(pasta, f"{nome}.csv"), RELATORIOS[nome], tolerancia)
+            for nome, df in relatorios.items()}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Calcula os relatórios de 05_analysis_queries.sql em pandas.")
+    ap.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."), help="pasta de saída do gerador")
+    ap.add_argument("--saida", default=None, help="pasta para gravar os relatórios (CSV)")
+    ap.add_argument("--comparar", default=None, help="pasta com CSVs de referência (ex.: ../data/raw)")
+    ap.add_argument("--tolerancia", type=float, default=0.005)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    t = ler_tabelas(args.origem)
+    t1 = time.perf_counter()
+    relatorios = calcular_tabelas(t)
+    t2 = time.perf_counter()
+    print(f"Leitura: {t1 - t0:.3f}s | cálculo dos 4 relatórios: {t2 - t1:.3f}s")
+    for nome, df in relatorios.items():
+        print(f"{nome:30s} {len(df):>8,d} linhas")
+    if args.saida:
+        gravar(relatorios, args.saida)
+        print(f"Relatórios -> {args.saida}")
+    if args.comparar:
+        difs = comparar_pasta(relatorios, args.comparar, args.tolerancia)
+        for nome, lista in difs.items():
+            print(f"[{'OK' if not lista else 'DIFERENTE'}] {nome}")
+            for d in lista:
+                print(f"    {d}")
+        if any(difs.values()):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# =========================
+# MÉTRICAS POR ETAPA
+# =========================
+"""Instrumentação das etapas do gerador: início/fim, tempo, CPU, memória, linhas e bytes.
+
+Cada etapa concluída vira uma linha JSON (gravada na hora, para sobreviver a uma execução
+interrompida). O custo é uma leitura de relógio e um getrusage por etapa, então pode ficar
+ligado em produção. `perfilador` embrulha a execução em cProfile ou pyinstrument.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def pico_rss_mb():
+    """Pico de RSS em MB do processo atual e dos filhos já encerrados, o maior dos dois (None
+    se a plataforma não informa). Workers vivos de um pool não entram: ver Etapas.observar_pico."""
+    if resource is None:
+        return None
+    pico = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux informa KB; macOS, bytes
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _agora():
+    return datetime.now().isoformat(timespec="milliseconds")
+
+class Etapas:
+    """Registro das etapas; com `path`, cada etapa concluída é anexada ao arquivo JSON lines.
+
+    Etapas sem bloco próprio no processo principal (ex.: medidas dentro dos workers) são
+    acumuladas com `somar` e gravadas em `fechar`. O pico de RSS é o maior entre o processo
+    principal, os filhos encerrados e os picos que os workers informam (`observar_pico`); como
+    ele só cresce, a comparação entre execuções usa delta_pico_rss_mb (quanto a etapa o subiu).
+    """
+    def __init__(self, path=None, **extras):
+        self.path = path
+        self.extras = extras
+        self.registros = {}
+        self.pendentes = []
+        self.pico_workers = None
+        self.lock = threading.Lock()  # etapas medidas em threads (export/carga em paralelo)
+        if path:
+            open(path, "w", encoding="utf-8").close()
+
+    def _registro(self, nome):
+        return self.registros.setdefault(nome, {
+            "etapa": nome, "inicio": None, "fim": None, "segundos": 0.0, "cpu_s": 0.0,
+            "pico_rss_mb": None, "delta_pico_rss_mb": 0.0, "linhas": 0, "bytes": 0,
+        })
+
+    def observar_pico(self, mb):
+        """Pico de RSS informado por um worker do pool (o getrusage dele, devolvido com o shard)."""
+        if mb is not None:
+            self.pico_workers = mb if self.pico_workers is None else max(self.pico_workers, mb)
+
+    def pico(self):
+        picos = [p for p in (pico_rss_mb(), self.pico_workers) if p is not None]
+        return max(picos) if picos else None
+
+    @contextmanager
+    def medir(self, nome, em_thread=False):
+        """Mede o bloco; o registro é devolvido para contagem (reg["linhas"] += n, reg["bytes"] += b).
+
+        em_thread: bloco executado em uma thread de um pool; cpu_s conta só a CPU dessa thread
+        (process_time somaria a das threads concorrentes).
+        """
+        reg = self._registro(nome)
+        reg["inicio"] = reg["inicio"] or _agora()
+        cpu = time.thread_time if em_thread else time.process_time
+        t0, cpu0, rss0 = time.perf_counter(), cpu(), self.pico()
+        try:
+            yield reg
+        finally:
+            reg["segundos"] += time.perf_counter() - t0
+            reg["cpu_s"] += cpu() - cpu0
+            reg["pico_rss_mb"] = self.pico()
+            if rss0 is not None:
+                reg["delta_pico_rss_mb"] = round(reg["delta_pico_rss_mb"] + reg["pico_rss_mb"] - rss0, 1)
+            reg["fim"] = _agora()
+            self._emitir(reg)
+
+    def somar(self, nome, segundos=0.0, linhas=0, cpu_s=None, **contadores):
+        """Soma uma medição feita em outro lugar (ex.: dentro dos workers); `contadores` são
+        somados em campos extras do registro (ex.: recusadas=n)."""
+        reg = self._registro(nome)
+        reg["inicio"] = reg["inicio"] or _agora()
+        reg["segundos"] += segundos
+        reg["cpu_s"] += segundos if cpu_s is None else cpu_s
+        reg["linhas"] += linhas
+        for campo, n in contadores.items():
+            reg[campo] = reg.get(campo, 0) + n
+        reg["pico_rss_mb"] = self.pico()
+        reg["fim"] = _agora()
+        if nome not in self.pendentes:
+            self.pendentes.append(nome)
+
+    @staticmethod
+    def _linha(reg):
+        reg = dict(reg, segundos=round(reg["segundos"], 4), cpu_s=round(reg["cpu_s"], 4))
+        reg["linhas_s"] = round(reg["linhas"] / reg["segundos"], 1) if reg["segundos"] > 0 else None
+        return reg
+
+    def _emitir(self, reg):
+        if self.path:
+            with self.lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({**self.extras, **self._linha(reg)}, ensure_ascii=False) + "\n")
+
+    def linhas(self):
+        """Registros com linhas/s, na ordem em que as etapas começaram."""
+        return [self._linha(reg) for reg in self.registros.values()]
+
+    def fechar(self):
+        for nome in self.pendentes:
+            self._emitir(self.registros[nome])
+        self.pendentes = []
+
+    def resumo(self):
+        """Tabela de texto com as etapas (para o console)."""
+        out = [f"{'Etapa':26s} {'seg':>9s} {'cpu':>9s} {'linhas':>12s} {'MB escritos':>12s} {'pico MB':>9s}"]
+        for r in self.linhas():
+            out.append(f"{r['etapa']:26s} {r['segundos']:9.3f} {r['cpu_s']:9.3f} {r['linhas']:>12,d} "
+                       f"{r['bytes'] / 1e6:12.1f} {r['pico_rss_mb'] or 0:9.1f}")
+        return "\n".join(out)
+
+@contextmanager
+def perfilador(tipo, path):
+    """Perfil da execução (processo principal): tipo "cprofile" (.prof) ou "pyinstrument" (.html)."""
+    if not tipo:
+        yield
+        return
+    if tipo == "cprofile":
+        import cProfile
+        perfil = cProfile.Profile()
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            perfil.dump_stats(path)
+            print(f"Perfil cProfile -> {path}")
+    elif tipo == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ImportError("AURORA_PERFIL=pyinstrument requer pyinstrument (pip install pyinstrument).")
+        perfil = Profiler()
+        perfil.start()
+        try:
+            yield
+        finally:
+            perfil.stop()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(perfil.output_html())
+            print(f"Perfil pyinstrument -> {path}")
+    else:
+        raise ValueError(f"Perfilador desconhecido: {tipo} (use cprofile ou pyinstrument)")
@@ -0,0 +1,236 @@
+# =========================
+# SAÍDA PARTICIONADA (MÊS x HOTEL) COM MANIFESTO
+# =========================
+"""Tabelas fato em partições AnoMes x HotelID, com um manifesto de hashes para recargas só do que mudou.
+
+Uso (a partir de scripts/):
+    python -m aurora.particoes particionar --origem <pasta do gerador>
+    python -m aurora.particoes diff <manifesto antigo> <manifesto novo>
+
+Layout (pastas chave=valor, como o particionamento Hive):
+    <destino>/<Tabela>/AnoMes=2025-11/HotelID=3/dados.csv[.gz|.zst]
+
+Cada arquivo é um CSV completo (cabeçalho e todas as colunas da tabela), carregável sozinho
+por BULK INSERT; a chave AnoMes vem da coluna de data em PARTICIONADAS e Pagamentos/Feedback
+recebem o hotel da reserva. O manifesto (<destino>/_manifesto.json) guarda, por partição,
+linhas, menor e maior data, bytes e o sha256 do CSV sem compressão (o hash não depende do
+gzip/zstd). A saída é função só das tabelas: partições com o mesmo hash do manifesto
+anterior não são regravadas e as que deixaram de existir são apagadas. `diff` compara dois
+manifestos e lista as partições novas, alteradas e removidas: com o gerador incremental,
+só os meses da janela nova mudam.
+
+A tabela é ordenada por (mês, hotel) de forma estável (dentro da partição vale a ordem do
+CSV completo) e formatada em blocos (aurora.escrita_csv.formatar_linhas); as partições são
+fatias desses buffers, então o custo é o de uma escrita do CSV.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+
+from .escrita_csv import COMPRESSOES, LINHAS_BLOCO, _abrir, cabecalho_csv, formatar_linhas
+from .kpis import ler_tabela
+
+PASTA = "particionado"
+MANIFESTO = "_manifesto.json"
+VERSAO = 1
+
+# tabela: coluna de data que define o AnoMes da partição
+PARTICIONADAS = {
+    "Reservas":          "DataCheckIn",
+    "Pagamentos":        "DataPagamento",
+    "OcupacaoDiaria":    "Data",
+    "MovimentosEstoque": "DataMovimento",
+    "Manutencoes":       "DataInicio",
+    "Eventos":           "DataInicio",
+    "Feedback":          "DataFeedback",
+}
+# tabelas sem HotelID: o hotel vem da reserva
+HOTEL_VIA_RESERVA = {"Pagamentos", "Feedback"}
+
+def carregar_manifesto(path):
+    """Manifesto de uma saída particionada ({} se não existir)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _hoteis_por_reserva(reservas):
+    ids = reservas["ReservaID"].to_numpy()
+    hoteis = reservas["HotelID"].to_numpy()
+    ordem = np.argsort(ids, kind="stable")
+    return ids[ordem], hoteis[ordem]
+
+def _hotel(df, tabela, reservas):
+    if tabela not in HOTEL_VIA_RESERVA:
+        return df["HotelID"].to_numpy()
+    ids, hoteis = reservas
+    pos = np.searchsorted(ids, df["ReservaID"].to_numpy())
+    pos = np.minimum(pos, len(ids) - 1)
+    if len(ids) == 0 or (ids[pos] != df["ReservaID"].to_numpy()).any():
+        raise ValueError(f"{tabela}: ReservaID sem reserva correspondente; não há como achar o hotel")
+    return hoteis[pos]
+
+class _Texto:
+    """Bytes de linhas [i, j) do df, formatado em blocos de LINHAS_BLOCO linhas (pedidos em ordem crescente)."""
+    def __init__(self, df, tabela):
+        self.df, self.tabela = df, tabela
+        self.ini = self.fim = 0
+        self.buf, self.limites = None, None
+
+    def _bloco(self, i):
+        self.ini, self.fim = i, min(i + LINHAS_BLOCO, len(self.df))
+        self.buf, fim_linha = formatar_linhas(self.df.iloc[self.ini:self.fim], self.tabela)
+        self.limites = np.r_[0, fim_linha]
+
+    def fatia(self, i, j):
+        pedacos = []
+        while i < j:
+            if not self.ini <= i < self.fim:
+                self._bloco(i)
+            k = min(j, self.fim)
+            pedacos.append(self.buf[self.limites[i - self.ini]:self.limites[k - self.ini]].tobytes())
+            i = k
+        return b"".join(pedacos)
+
+def particionar_tabela(df, tabela, destino, compressao="", anterior=None, reservas=None):
+    """Grava as partições de uma tabela; retorna {partição: entrada do manifesto}."""
+    coluna = PARTICIONADAS[tabela]
+    anterior = anterior or {}
+    ext = ".csv" + COMPRESSOES[compressao]
+    dias = df[coluna].to_numpy().astype("datetime64[D]")
+    mes = dias.astype("datetime64[M]").astype(np.int64)
+    hotel = _hotel(df, tabela, reservas)
+    ordem = np.lexsort((hotel, mes))
+    df, dias, mes, hotel = df.iloc[ordem], dias[ordem], mes[ordem], hotel[ordem]
+    cabecalho = cabecalho_csv(df.columns)
+
+    texto = _Texto(df, tabela)
+    particoes = {}
+    limites = np.flatnonzero(np.r_[True, (mes[1:] != mes[:-1]) | (hotel[1:] != hotel[:-1]), True])
+    for i, j in zip(limites[:-1].tolist(), limites[1:].tolist()):
+        chave = f"AnoMes={1970 + int(mes[i]) // 12}-{int(mes[i]) % 12 + 1:02d}/HotelID={int(hotel[i])}"
+        conteudo = cabecalho + texto.fatia(i, j)
+        entrada = {
+            "arquivo": f"{chave}/dados{ext}",
+            "linhas": j - i,
+            "data_min": str(dias[i:j].min()),
+            "data_max": str(dias[i:j].max()),
+            "bytes": len(conteudo),
+            "sha256": hashlib.sha256(conteudo).hexdigest(),
+        }
+        path = os.path.join(destino, tabela, entrada["arquivo"])
+        if anterior.get(chave) != entrada or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(path)
+            with _abrir(path, compressao) as f:
+                f.write(conteudo)
+        particoes[chave] = entrada
+    for chave, entrada in anterior.items():
+        if chave not in particoes or particoes[chave]["arquivo"] != entrada["arquivo"]:
+            path = os.path.join(destino, tabela, entrada["arquivo"])
+            if os.path.exists(path):
+                os.remove(path)
+            for pasta in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+                if os.path.isdir(pasta) and not os.listdir(pasta):
+                    os.rmdir(pasta)
+    return particoes
+
+def particionar(origem, destino, compressao="", etapas=None):
+    """Particiona as tabelas de PARTICIONADAS; origem: frames do gerador ou pasta de saída.
+
+    Grava o manifesto em <destino>/_manifesto.json e o devolve.
+    """
+    path_manifesto = os.path.join(destino, MANIFESTO)
+    anterior = carregar_manifesto(path_manifesto).get("tabelas", {})
+    reservas = _hoteis_por_reserva(ler_tabela(origem, "Reservas", ["ReservaID", "HotelID"]))
+    tabelas = {}
+    for tabela, coluna in PARTICIONADAS.items():
+        if isinstance(origem, dict) and tabela not in origem:
+            continue
+        with etapas.medir(f"particoes:{tabela}") if etapas else nullcontext({"linhas": 0, "bytes": 0}) as reg:
+            df = ler_tabela(origem, tabela)
+            particoes = particionar_tabela(df, tabela, destino, compressao,
+                                           anterior.get(tabela, {}).get("particoes"), reservas)
+            reg["linhas"] += len(df)
+            reg["bytes"] += sum(p["bytes"] for p in particoes.values())
+        tabelas[tabela] = {"coluna_data": coluna, "particoes": particoes}
+    manifesto = {
+        "versao": VERSAO,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "compressao": compressao,
+        "tabelas": tabelas,
+    }
+    os.makedirs(destino, exist_ok=True)
+    tmp = path_manifesto + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path_manifesto)
+    return manifesto
+
+# =========================
+# DIFERENÇAS ENTRE MANIFESTOS
+# =========================
+def diff(antigo, novo):
+    """{tabela: {"novas": [...], "alteradas": [...], "removidas": [...]}} entre dois manifestos."""
+    out = {}
+    ta, tn = antigo.get("tabelas", {}), novo.get("tabelas", {})
+    for tabela in sorted(set(ta) | set(tn)):
+        pa = ta.get(tabela, {}).get("particoes", {})
+        pn = tn.get(tabela, {}).get("particoes", {})
+        out[tabela] = {
+            "novas": sorted(set(pn) - set(pa)),
+            "alteradas": sorted(k for k in set(pa) & set(pn) if pa[k]["sha256"] != pn[k]["sha256"]),
+            "removidas": sorted(set(pa) - set(pn)),
+        }
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Saída particionada por mês x hotel e diff de manifestos.")
+    sub = ap.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("particionar", help="grava as partições e o manifesto")
+    p.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."), help="pasta de saída do gerador")
+    p.add_argument("--destino", default=None, help=f"padrão: <origem>/{PASTA}")
+    p.add_argument("--compressao", choices=[c for c in COMPRESSOES if c], default="")
+    d = sub.add_parser("diff", help="partições que mudaram entre dois manifestos")
+    d.add_argument("antigo")
+    d.add_argument("novo")
+    d.add_argument("--json", action="store_true", help="imprime o diff como JSON")
+    args = ap.parse_args(argv)
+
+    if args.comando == "particionar":
+        destino = args.destino or os.path.join(args.origem, PASTA)
+        manifesto = particionar(args.origem, destino, args.compressao)
+        for tabela, t in manifesto["tabelas"].items():
+            print(f"{tabela:20s} {len(t['particoes']):>6,d} partições")
+        print(f"Manifesto -> {os.path.join(destino, MANIFESTO)}")
+        return 0
+
+    novo = carregar_manifesto(args.novo)
+    difs = diff(carregar_manifesto(args.antigo), novo)
+    if args.json:
+        print(json.dumps(difs, indent=1, ensure_ascii=False))
+        return 0
+    total = mudaram = linhas = linhas_mudaram = 0
+    for tabela, d in difs.items():
+        particoes = novo.get("tabelas", {}).get(tabela, {}).get("particoes", {})
+        total += len(particoes)
+        linhas += sum(p["linhas"] for p in particoes.values())
+        for tipo in ("novas", "alteradas", "removidas"):
+            for chave in d[tipo]:
+                print(f"{tipo[:-1]:9s} {tabela}/{chave}")
+        mudaram += len(d["novas"]) + len(d["alteradas"])
+        linhas_mudaram += sum(particoes[k]["linhas"] for k in d["novas"] + d["alteradas"])
+    print(f"{mudaram:,d} de {total:,d} partições mudaram ({linhas_mudaram:,d} de {linhas:,d} linhas); "
+          f"{sum(len(d['removidas']) for d in difs.values()):,d} removidas", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
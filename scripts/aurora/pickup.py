@@ -0,0 +1,201 @@
+# =========================
+# PICKUP / ON-THE-BOOKS (RITMO DE RESERVAS)
+# =========================
+"""Diárias no livro por hotel x data de estadia x dias de antecedência, em tempo linear.
+
+Uso (a partir de scripts/):
+    python -m aurora.pickup --origem <pasta do gerador> [--hotel 1 --de 2025-12-01 --ate 2025-12-31]
+
+No livro em (d, a) = diárias da data d reservadas com pelo menos a dias de antecedência
+(DataReserva <= d - a). Em SQL isso é um self-join reservas x noites x dias de antecedência;
+aqui cada reserva vira quatro marcas em um array de diferenças e o resto são somas acumuladas.
+
+Na noite k da estadia a antecedência é (check-in - reserva) + k: as noites de uma reserva
+formam uma diagonal no plano (data, antecedência), mas com DataReserva constante. Indexando
+por (DataReserva, antecedência), a diagonal vira uma linha: +1 na antecedência do check-in e
+-1 na do check-out; o cumsum nesse eixo dá o pickup (diárias reservadas com antecedência
+exata a), que volta para (data, a) como uma view com strides, sem cópia. Antecedências >=
+MAX_ANTECEDENCIA ficam no último degrau (diferenças ao longo da data). O no livro é o cumsum
+reverso do pickup; a tabela só precisa das somas entre os PONTOS_ANTECEDENCIA.
+Custo O(reservas + hotéis x dias x MAX_ANTECEDENCIA), em blocos de hotéis para limitar a memória.
+
+Canceladas são descontadas: DiariasNoLivro só conta as reservas não canceladas (No-Show
+fica no livro até a chegada) e DiariasCanceladas guarda as canceladas que tinham sido
+reservadas até ali. Os dados não têm data de cancelamento, então elas saem desde a reserva.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .schema import tipar
+
+MAX_ANTECEDENCIA = 120  # o gerador limita o lead time a 120 dias
+# antecedências exportadas em PickupHotelDia (a curva completa sai de no_livro)
+PONTOS_ANTECEDENCIA = [0, 1, 2, 3, 7, 14, 21, 30, 45, 60, 90, 120]
+HOTEIS_POR_BLOCO = 16
+# colunas de Reservas usadas
+COLUNAS = ["HotelID", "DataReserva", "DataCheckIn", "DataCheckOut", "Noites", "Status"]
+DIAS_ANO_ANTERIOR = 364  # mesmo dia da semana do ano anterior
+
+def _diferencas(hotel, reserva, checkin, noites, peso, n_hoteis, n_dias, L):
+    """Pickup exato (hotéis x dias x 0..L-1, view) e a cauda (antecedência >= L, hotéis x dias)."""
+    hotel, reserva, checkin = (np.asarray(v, dtype=np.int64) for v in (hotel, reserva, checkin))
+    noites, peso = np.asarray(noites, dtype=np.int64), np.asarray(peso, dtype=np.float64)
+    lead = checkin - reserva
+    if (lead < 0).any():
+        raise ValueError("DataReserva posterior ao check-in")
+
+    # antecedência < L: diferenças no plano (DataReserva + L, antecedência); coluna L absorve o fim
+    a = lead < L
+    fim = np.minimum(lead[a] + noites[a], L)
+    linhas, colunas = n_dias + L, L + 1
+    base = (hotel[a] * linhas + reserva[a] + L) * colunas
+    diag = np.bincount(np.r_[base + lead[a], base + fim], weights=np.r_[peso[a], -peso[a]],
+                       minlength=n_hoteis * linhas * colunas).astype(np.int32).reshape(n_hoteis, linhas, colunas)
+    np.cumsum(diag, axis=2, out=diag)
+    # (h, d, a) -> diag[h, d - a + L, a]: o cisalhamento é só um jogo de strides sobre o mesmo buffer
+    item = diag.itemsize
+    exato = np.lib.stride_tricks.as_strided(
+        diag.reshape(-1)[L * colunas:], shape=(n_hoteis, n_dias, L),
+        strides=(linhas * colunas * item, colunas * item, (1 - colunas) * item), writeable=False)
+
+    # antecedência >= L: da noite em que a antecedência chega a L até o check-out
+    k = np.maximum(L - lead, 0)
+    b = k < noites
+    hb = hotel[b] * (n_dias + 1) + checkin[b]
+    cauda = np.bincount(np.r_[hb + k[b], hb + noites[b]], weights=np.r_[peso[b], -peso[b]],
+                        minlength=n_hoteis * (n_dias + 1)).astype(np.int32).reshape(n_hoteis, n_dias + 1)
+    return exato, np.cumsum(cauda, axis=1, dtype=np.int32)[:, :n_dias]
+
+def pickup(hotel, reserva, checkin, noites, peso, n_hoteis, n_dias, max_antecedencia=MAX_ANTECEDENCIA):
+    """Pickup (hotéis x dias x antecedências 0..max) a partir das reservas, por arrays de diferenças.
+
+    hotel: posição 0..n_hoteis-1; reserva/checkin: offsets de dia (checkin em 0..n_dias-1,
+    reserva >= -max); a última coluna acumula antecedências >= max_antecedencia. peso:
+    diárias por noite de cada reserva (1, 0 ou booleano).
+    """
+    exato, cauda = _diferencas(hotel, reserva, checkin, noites, peso, n_hoteis, n_dias, max_antecedencia)
+    return np.concatenate([exato, cauda[:, :, None]], axis=2)
+
+def no_livro(pick):
+    """Diárias no livro (antecedência >= a) a partir do pickup: cumsum reverso nas antecedências."""
+    return np.cumsum(pick[:, :, ::-1], axis=2)[:, :, ::-1]
+
+def no_livro_em(hotel, reserva, checkin, noites, peso, n_hoteis, n_dias, pontos,
+                max_antecedencia=MAX_ANTECEDENCIA):
+    """No livro só nas antecedências `pontos` (crescentes, <= max): somas por faixa, sem a matriz inteira."""
+    exato, cauda = _diferencas(hotel, reserva, checkin, noites, peso, n_hoteis, n_dias, max_antecedencia)
+    pontos = np.asarray(pontos)
+    dentro = pontos[pontos < max_antecedencia]
+    faixas = np.add.reduceat(exato, dentro, axis=2) if len(dentro) else np.zeros((n_hoteis, n_dias, 0), np.int32)
+    livro = np.cumsum(faixas[:, :, ::-1], axis=2)[:, :, ::-1] + cauda[:, :, None]
+    return np.concatenate([livro, np.repeat(cauda[:, :, None], len(pontos) - len(dentro), axis=2)], axis=2)
+
+def _colunas(reservas, max_antecedencia):
+    """Arrays de pickup() de toda a tabela Reservas: (HotelID, reserva, checkin, checkout, noites, cancelada)."""
+    checkin = reservas["DataCheckIn"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    # reservas feitas antes de -max entram no degrau >= max_antecedencia do mesmo jeito
+    reserva = np.maximum(reservas["DataReserva"].to_numpy().astype("datetime64[D]").astype(np.int64),
+                         checkin - max_antecedencia)
+    return (reservas["HotelID"].to_numpy(), reserva, checkin,
+            reservas["DataCheckOut"].to_numpy().astype("datetime64[D]").astype(np.int64),
+            reservas["Noites"].to_numpy(), (reservas["Status"] == "Cancelada").to_numpy())
+
+def _argumentos(hotel, reserva, checkin, checkout, noites, cancelada, hotel_ids):
+    """Argumentos de pickup() para os hotéis `hotel_ids` (ordenados), com o primeiro dia da grade."""
+    inicio = checkin.min()
+    n_dias = int(checkout.max() - inicio)
+    args = (np.searchsorted(hotel_ids, hotel), reserva - inicio, checkin - inicio, noites)
+    return inicio, n_dias, args, cancelada
+
+def matriz(reservas, max_antecedencia=MAX_ANTECEDENCIA):
+    """No livro e canceladas (hotéis x dias x 0..max) da tabela Reservas, com hotéis e datas.
+
+    Retorna (hotel_ids, datas, no_livro, canceladas): a curva completa, para poucos hotéis
+    (filtre as reservas antes); tabela() exporta só PONTOS_ANTECEDENCIA de todos.
+    """
+    colunas = _colunas(reservas, max_antecedencia)
+    hotel_ids = np.unique(colunas[0])
+    inicio, n_dias, args, cancelada = _argumentos(*colunas, hotel_ids)
+    n = (len(hotel_ids), n_dias, max_antecedencia)
+    datas = np.arange(inicio, inicio + n_dias).astype("datetime64[D]")
+    return (hotel_ids, datas, no_livro(pickup(*args, ~cancelada, *n)), no_livro(pickup(*args, cancelada, *n)))
+
+def tabela(reservas, pontos=PONTOS_ANTECEDENCIA, max_antecedencia=MAX_ANTECEDENCIA):
+    """PickupHotelDia: uma linha por hotel x data de estadia x antecedência em `pontos`."""
+    pontos = np.sort(np.asarray(pontos))
+    if (pontos > max_antecedencia).any():
+        raise ValueError(f"Antecedências acima de {max_antecedencia}: {pontos[pontos > max_antecedencia].tolist()}")
+    colunas = _colunas(reservas, max_antecedencia)
+    ordem = np.argsort(colunas[0], kind="stable")
+    colunas = [c[ordem] for c in colunas]
+    hotel_ids, cortes = np.unique(colunas[0], return_index=True)
+    cortes = np.r_[cortes, len(ordem)]
+    partes = {"HotelID": [], "DataEstadia": [], "DiariasNoLivro": [], "DiariasCanceladas": []}
+    for ini in range(0, len(hotel_ids), HOTEIS_POR_BLOCO):
+        hoteis = hotel_ids[ini:ini + HOTEIS_POR_BLOCO]
+        fatia = slice(cortes[ini], cortes[ini + len(hoteis)])
+        inicio, n_dias, args, cancelada = _argumentos(*(c[fatia] for c in colunas), hoteis)
+        n = (len(hoteis), n_dias, pontos, max_antecedencia)
+        partes["HotelID"].append(np.repeat(hoteis, n_dias * len(pontos)))
+        partes["DataEstadia"].append(np.tile(np.repeat(np.arange(inicio, inicio + n_dias), len(pontos)), len(hoteis)))
+        partes["DiariasNoLivro"].append(no_livro_em(*args, ~cancelada, *n).ravel())
+        partes["DiariasCanceladas"].append(no_livro_em(*args, cancelada, *n).ravel())
+    df = pd.DataFrame({c: np.concatenate(v) if v else np.zeros(0, np.int64) for c, v in partes.items()})
+    df["DataEstadia"] = df["DataEstadia"].to_numpy().astype("datetime64[D]")
+    df.insert(2, "DiasAntecedencia", np.tile(pontos, len(df) // len(pontos)))
+    return tipar(df, "PickupHotelDia")
+
+# =========================
+# CURVAS DE RITMO E ANO ANTERIOR
+# =========================
+def curva(pick, hotel=None, de=None, ate=None):
+    """Curva de ritmo: diárias no livro por antecedência, somadas no período de estadia
+    [de, ate], com a mesma janela 364 dias antes (mesmo dia da semana) ao lado."""
+    df = pick if hotel is None else pick[pick["HotelID"] == hotel]
+    datas = df["DataEstadia"].to_numpy()
+    de = datas.min() if de is None else np.datetime64(de, "D")
+    ate = datas.max() if ate is None else np.datetime64(ate, "D")
+    def somar(ini, fim):
+        sel = df[(datas >= ini) & (datas <= fim)]
+        return sel.groupby("DiasAntecedencia")[["DiariasNoLivro", "DiariasCanceladas"]].sum()
+    atual = somar(de, ate)
+    anterior = somar(de - DIAS_ANO_ANTERIOR, ate - DIAS_ANO_ANTERIOR).add_suffix("AnoAnterior")
+    out = atual.join(anterior, how="left").fillna(0).astype(np.int64).sort_index(ascending=False)
+    ant = out["DiariasNoLivroAnoAnterior"]
+    out["VariacaoAnoAnterior"] = (out["DiariasNoLivro"] / ant.where(ant > 0) - 1).round(4)
+    return out.reset_index()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Tabela de pickup (no livro por antecedência) e curvas de ritmo.")
+    ap.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."), help="pasta de saída do gerador")
+    ap.add_argument("--saida", default=None, help="grava PickupHotelDia.csv nesta pasta")
+    ap.add_argument("--hotel", type=int, default=None)
+    ap.add_argument("--de", default=None, help="início do período de estadia da curva (AAAA-MM-DD)")
+    ap.add_argument("--ate", default=None, help="fim do período de estadia da curva (AAAA-MM-DD)")
+    args = ap.parse_args(argv)
+
+    from .escrita_csv import EscritorCSV
+    from .kpis import ler_tabela
+    t0 = time.perf_counter()
+    reservas = ler_tabela(args.origem, "Reservas", COLUNAS)
+    t1 = time.perf_counter()
+    df = tabela(reservas)
+    t2 = time.perf_counter()
+    print(f"Leitura: {t1 - t0:.3f}s | pickup de {len(reservas):,d} reservas: {t2 - t1:.3f}s "
+          f"({len(df):,d} linhas)", file=sys.stderr)
+    if args.saida:
+        escritor = EscritorCSV("PickupHotelDia", args.saida)
+        escritor.add(df)
+        print(f"PickupHotelDia -> {escritor.descricao()}", file=sys.stderr)
+    with pd.option_context("display.width", 200, "display.max_rows", 40):
+        print(curva(df, args.hotel, args.de, args.ate).to_string(index=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
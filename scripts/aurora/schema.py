@@ -0,0 +1,155 @@
+# =========================
+# ESQUEMA DAS TABELAS (lido do DDL)
+# =========================
+"""Tipos de coluna de cada tabela, extraídos de 03_CriaTabelas.sql (fonte única do esquema)."""
+
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DDL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "03_CriaTabelas.sql")
+
+# tipo: INT, DATE, DECIMAL, NVARCHAR, CHAR...; precisao/escala p/ DECIMAL; tamanho p/ textos
+Coluna = namedtuple("Coluna", ["nome", "tipo", "precisao", "escala", "tamanho"])
+
+_RE_TABELA = re.compile(r"CREATE\s+TABLE\s+(\w+)\s*\((.*?)\)\s*;", re.S | re.I)
+_RE_COLUNA = re.compile(r"^\s*(\w+)\s+(\w+)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?", re.I)
+
+@lru_cache(maxsize=None)
+def carregar_ddl(path=DDL_PATH):
+    """Retorna {tabela: [Coluna, ...]} na ordem do CREATE TABLE."""
+    with open(path, encoding="utf-8") as f:
+        ddl = f.read()
+    tabelas = {}
+    for nome, corpo in _RE_TABELA.findall(ddl):
+        colunas = []
+        for linha in corpo.splitlines():
+            linha = linha.split("--")[0].strip().rstrip(",")
+            if not linha or linha.upper().startswith(("PRIMARY KEY", "FOREIGN KEY", "CONSTRAINT")):
+                continue
+            m = _RE_COLUNA.match(linha)
+            if not m:
+                continue
+            col, tipo, a, b = m.groups()
+            tipo = tipo.upper()
+            if tipo == "DECIMAL":
+                colunas.append(Coluna(col, tipo, int(a), int(b or 0), None))
+            else:
+                colunas.append(Coluna(col, tipo, None, None, int(a) if a else None))
+        tabelas[nome] = colunas
+    return tabelas
+
+# Restrições de uma tabela: chave primária (lista de colunas) e FKs (coluna, tabela, coluna)
+Restricoes = namedtuple("Restricoes", ["pk", "fks"])
+
+_RE_PK_TABELA = re.compile(r"^PRIMARY\s+KEY(?:\s+(?:NON)?CLUSTERED)?\s*\(([^)]*)\)", re.I)
+_RE_FK = re.compile(r"FOREIGN\s+KEY\s+REFERENCES\s+(\w+)\s*\(\s*(\w+)\s*\)", re.I)
+
+@lru_cache(maxsize=None)
+def restricoes_ddl(path=DDL_PATH):
+    """Retorna {tabela: Restricoes} com PK (inline ou de tabela) e FKs inline do DDL."""
+    with open(path, encoding="utf-8") as f:
+        ddl = f.read()
+    tabelas = {}
+    for nome, corpo in _RE_TABELA.findall(ddl):
+        pk, fks = [], []
+        for linha in corpo.splitlines():
+            linha = linha.split("--")[0].strip().rstrip(",")
+            m = _RE_PK_TABELA.match(linha)
+            if m:
+                pk = [c.strip() for c in m.group(1).split(",")]
+                continue
+            m = _RE_COLUNA.match(linha)
+            if not m or linha.upper().startswith(("FOREIGN KEY", "CONSTRAINT")):
+                continue
+            if re.search(r"\bPRIMARY\s+KEY\b", linha, re.I):
+                pk = [m.group(1)]
+            fk = _RE_FK.search(linha)
+            if fk:
+                fks.append((m.group(1), fk.group(1), fk.group(2)))
+        tabelas[nome] = Restricoes(pk, fks)
+    return tabelas
+
+def colunas_da_tabela(tabela):
+    """{coluna: Coluna} da tabela (vazio se a tabela não está no DDL)."""
+    return {c.nome: c for c in carregar_ddl().get(tabela, [])}
+
+# =========================
+# ESQUEMA COMPACTO EM MEMÓRIA
+# =========================
+# INT -> int32 (int16 nas colunas pequenas), DATE -> datetime64, DECIMAL(p,s) -> int64 em
+# unidades de 10^-s (centavos em DECIMAL(10,2)), enums/constantes/valores de pools -> category.
+# Texto só na escrita (para_texto).
+
+# Colunas de baixa cardinalidade: enums, constantes por linha e valores sorteados de pools
+COLUNAS_CATEGORIA = {
+    "Status", "Tipo", "FormaPagamento", "NomeCanal", "Categoria", "Cargo", "TipoMovimento",
+    "TipoEvento", "Motivo", "Nivel", "UF", "Pais", "Rede", "Genero", "Unidade", "Cidade",
+    "Nome", "Sobrenome", "Comentario", "RazaoSocial", "TipoQuarto",
+}
+
+# Colunas INT com valores pequenos (noites, notas, quantidades, ano/mês...)
+COLUNAS_INT16 = {"Noites", "Andar", "Capacidade", "Nota", "Quantidade", "TotalQuartos"}
+
+def _e_ano_mes(nome):
+    return nome.endswith("Ano") or nome.endswith("Mes")
+
+def tipar(df, tabela):
+    """Converte (no lugar) as colunas de um DataFrame recém-montado para o esquema compacto.
+
+    Valores DECIMAL entram em unidades naturais (reais, fatores) e saem como int64 escalado;
+    chame uma única vez por DataFrame. Retorna o próprio df.
+    """
+    cols = colunas_da_tabela(tabela)
+    for nome in df.columns:
+        col = cols.get(nome)
+        s = df[nome]
+        if nome.endswith("AnoMes") or nome in COLUNAS_CATEGORIA:
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                df[nome] = s.astype("category")
+        elif col is not None and col.tipo == "DATE":
+            df[nome] = pd.to_datetime(s).to_numpy().astype("datetime64[D]")
+        elif col is not None and col.tipo == "DECIMAL":
+            df[nome] = np.rint(s.to_numpy(dtype=np.float64) * 10 ** col.escala).astype(np.int64)
+        elif (col is not None and col.tipo == "INT") or _e_ano_mes(nome):
+            df[nome] = s.astype(np.int16 if nome in COLUNAS_INT16 or _e_ano_mes(nome) else np.int32)
+    return df
+
+def decimal_para_float(serie, tabela, nome):
+    """Valor natural (float) de uma coluna DECIMAL já tipada (int64 escalado)."""
+    return serie.to_numpy() / 10 ** colunas_da_tabela(tabela)[nome].escala
+
+def para_texto(df, tabela):
+    """Cópia rasa pronta para CSV: datas em ISO (YYYY-MM-DD) e DECIMAL de volta a float."""
+    cols = colunas_da_tabela(tabela)
+    out = df.copy(deep=False)
+    for nome in df.columns:
+        col = cols.get(nome)
+        s = df[nome]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            dias = s.to_numpy().astype("datetime64[D]")
+            txt = np.datetime_as_string(dias).astype(object)
+            txt[np.isnat(dias)] = None
+            out[nome] = txt
+        elif col is not None and col.tipo == "DECIMAL" and pd.api.types.is_integer_dtype(s):
+            # divisão exata -> mesmo float que round(x, escala): o CSV não muda
+            out[nome] = s.to_numpy() / 10 ** col.escala
+    return out
+
+def concatenar(partes):
+    """pd.concat dos chunks de uma tabela preservando category (une as categorias)."""
+    if not partes:
+        return pd.DataFrame()
+    colunas = {}
+    for nome in partes[0].columns:
+        series = [p[nome] for p in partes]
+        if isinstance(series[0].dtype, pd.CategoricalDtype):
+            colunas[nome] = pd.Series(union_categoricals(series), name=nome)
+        else:
+            colunas[nome] = pd.concat(series, ignore_index=True)
+    return pd.DataFrame(colunas)
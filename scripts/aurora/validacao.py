@@ -0,0 +1,312 @@
+# =========================
+# VALIDAÇÃO DE INTEGRIDADE (PK, FK E DATAS)
+# =========================
+"""Confere a saída do gerador contra as restrições de 03_CriaTabelas.sql e as regras de datas.
+
+Uso (a partir de scripts/):
+    python -m aurora.validacao --origem <pasta do gerador> [--amostras 5]
+
+Regras:
+- PK (inline ou de tabela) e FKs: lidas do DDL (schema.restricoes_ddl), para toda tabela
+  presente na origem.
+- UNICAS: chaves de negócio fora do DDL (um quarto por noite em OcupacaoDiaria).
+- DATAS: ordem entre colunas da mesma linha (reserva <= check-in < check-out...).
+- DATAS_PAI: ordem contra a linha pai (pagamento não antes do check-in da reserva...).
+- CONSISTENCIA: coluna repetida que precisa bater com a do pai (hotel do quarto, da reserva).
+- Noites = DataCheckOut - DataCheckIn e estadias confirmadas sem sobreposição no mesmo quarto.
+
+Tudo em operações vetorizadas: chaves compostas viram um int64 (códigos das colunas
+combinados) e a unicidade sai de um sort (ou de uma passada, se já vier ordenada); FKs e
+buscas no pai usam uma tabela de posições indexada pela chave (IDs densos) ou searchsorted.
+Cada violação traz a contagem e algumas linhas de exemplo. A origem é o dict de frames do
+gerador ou a pasta de saída (Parquet quando houver, senão CSV), lendo só as colunas usadas.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from .escrita_csv import arquivos_csv
+from .kpis import ler_tabela
+from .schema import restricoes_ddl
+
+Violacao = namedtuple("Violacao", ["tabela", "regra", "linhas", "amostra"])
+
+# chaves únicas que o DDL não declara: (tabela, colunas)
+UNICAS = [
+    ("OcupacaoDiaria", ["QuartoID", "Data"]),
+]
+# (tabela, coluna anterior, coluna posterior, estrito)
+DATAS = [
+    ("Reservas", "DataReserva", "DataCheckIn", False),
+    ("Reservas", "DataCheckIn", "DataCheckOut", True),
+    ("Clientes", "DataNascimento", "DataCadastro", True),
+    ("Manutencoes", "DataInicio", "DataFim", False),
+    ("Eventos", "DataInicio", "DataFim", False),
+]
+# (tabela, coluna, chave, tabela pai, coluna do pai): coluna >= coluna do pai
+DATAS_PAI = [
+    ("Pagamentos", "DataPagamento", "ReservaID", "Reservas", "DataCheckIn"),
+    ("Feedback", "DataFeedback", "ReservaID", "Reservas", "DataCheckOut"),
+    ("Reclamacoes", "DataReclamacao", "ReservaID", "Reservas", "DataCheckOut"),
+]
+# (tabela, coluna, chave, tabela pai, coluna do pai): coluna == coluna do pai
+CONSISTENCIA = [
+    ("Reservas", "HotelID", "QuartoID", "Quartos", "HotelID"),
+    ("OcupacaoDiaria", "HotelID", "QuartoID", "Quartos", "HotelID"),
+    ("Manutencoes", "HotelID", "QuartoID", "Quartos", "HotelID"),
+    ("Reclamacoes", "HotelID", "ReservaID", "Reservas", "HotelID"),
+    ("MovimentosEstoque", "HotelID", "ProdutoID", "EstoqueProdutos", "HotelID"),
+]
+COLUNAS_ESTADIA = ["QuartoID", "DataCheckIn", "DataCheckOut", "Noites", "Status"]
+
+# =========================
+# OPERAÇÕES VETORIZADAS
+# =========================
+def _codigos(s):
+    """Códigos int64 >= 0 de uma coluna e a quantidade de valores possíveis."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy().astype(np.int64), max(len(s.cat.categories), 1)
+    v = s.to_numpy()
+    if v.dtype.kind in "iumM":
+        v = v.astype(np.int64) if v.dtype.kind != "M" else v.astype("datetime64[D]").astype(np.int64)
+        if len(v) == 0:
+            return v, 1
+        menor = v.min()
+        return v - menor, int(v.max() - menor) + 1
+    codigos, unicos = pd.factorize(s)
+    return codigos.astype(np.int64), max(len(unicos), 1)
+
+def chave(df, colunas):
+    """Chave int64 por linha que identifica a combinação das colunas (códigos combinados)."""
+    k, total = np.zeros(len(df), dtype=np.int64), 1
+    for c in colunas:
+        codigos, n = _codigos(df[c])
+        if total * n >= 2 ** 62:  # não cabe: reduz a chave acumulada a códigos densos
+            k, unicos = pd.factorize(k)
+            total = max(len(unicos), 1)
+        k, total = k * n + codigos, total * n
+    return k
+
+def duplicadas(k, limite=None):
+    """(nº de linhas com chave repetida, posições das cópias das `limite` primeiras chaves repetidas).
+
+    A contagem sai do sort; só as chaves de exemplo são localizadas (isin com milhões de
+    chaves repetidas custaria mais que o sort).
+    """
+    vazio = np.zeros(0, dtype=np.int64)
+    if len(k) < 2 or (k[1:] > k[:-1]).all():
+        return 0, vazio
+    ks = np.sort(k)
+    igual = ks[1:] == ks[:-1]
+    if not igual.any():
+        return 0, vazio
+    total = int((np.r_[igual, False] | np.r_[False, igual]).sum())
+    repetidas = np.unique(ks[1:][igual])
+    return total, np.flatnonzero(np.isin(k, repetidas[:limite]))
+
+class Indice:
+    """Posição de cada chave do pai: tabela direta para IDs densos, senão busca binária."""
+    def __init__(self, chaves):
+        self.chaves = np.asarray(chaves).astype(np.int64)
+        self.menor = int(self.chaves.min()) if len(self.chaves) else 0
+        faixa = int(self.chaves.max()) - self.menor + 1 if len(self.chaves) else 0
+        self.tabela = None
+        if faixa <= 4 * len(self.chaves) + 1_000_000:
+            self.tabela = np.full(faixa + 1, -1, dtype=np.int64)
+            self.tabela[self.chaves - self.menor] = np.arange(len(self.chaves))
+        else:
+            self.ordem = np.argsort(self.chaves, kind="stable")
+
+    def posicoes(self, valores):
+        """Posição no pai de cada valor (-1 se não existe)."""
+        v = np.asarray(valores).astype(np.int64)
+        if self.tabela is not None:
+            rel = v - self.menor
+            fora = (rel < 0) | (rel >= len(self.tabela) - 1)
+            return np.where(fora, -1, self.tabela[np.where(fora, len(self.tabela) - 1, rel)])
+        if len(self.chaves) == 0:
+            return np.full(len(v), -1, dtype=np.int64)
+        p = np.minimum(np.searchsorted(self.chaves, v, sorter=self.ordem), len(self.chaves) - 1)
+        pos = self.ordem[p]
+        return np.where(self.chaves[pos] == v, pos, -1)
+
+def estadias_sobrepostas(quarto, entrada, saida):
+    """Posições das estadias que começam antes da saída de outra anterior no mesmo quarto."""
+    q = np.asarray(quarto).astype(np.int64)
+    ini = np.asarray(entrada).astype("datetime64[D]").astype(np.int64)
+    fim = np.asarray(saida).astype("datetime64[D]").astype(np.int64)
+    if len(q) < 2:
+        return np.zeros(0, dtype=np.int64)
+    # ordem por (quarto, entrada) em uma chave int64 só
+    ordem = np.argsort((q - q.min()) * (ini.max() - ini.min() + 1) + (ini - ini.min()))
+    q, ini, fim = q[ordem], ini[ordem], fim[ordem]
+    # maior saída até a linha anterior, reiniciando a cada quarto (o quarto domina a soma)
+    base = fim.min()
+    passo = fim.max() - base + 1
+    acum = np.maximum.accumulate((q - q[0]) * passo + (fim - base))
+    saida_anterior = np.r_[np.iinfo(np.int64).min, acum[:-1] - (q[1:] - q[0]) * passo + base]
+    mesmo_quarto = np.r_[False, q[1:] == q[:-1]]
+    return np.sort(ordem[mesmo_quarto & (ini < saida_anterior)])
+
+# =========================
+# VALIDAÇÃO
+# =========================
+def _disponivel(origem, tabela):
+    if isinstance(origem, dict):
+        return tabela in origem
+    return os.path.exists(os.path.join(origem, f"{tabela}.parquet")) or bool(arquivos_csv(origem, tabela))
+
+def _colunas_usadas(restricoes, tabelas):
+    usadas = {t: set() for t in tabelas}
+    def usar(t, *cols):
+        if t in usadas:
+            usadas[t].update(cols)
+    for t in tabelas:
+        pk, fks = restricoes[t]
+        usar(t, *pk)
+        for col, ref, ref_col in fks:
+            usar(t, col)
+            usar(ref, ref_col)
+    for t, cols in UNICAS:
+        usar(t, *cols)
+    for t, a, b, _ in DATAS:
+        usar(t, a, b)
+    for t, col, k, pai, col_pai in DATAS_PAI + CONSISTENCIA:
+        usar(t, col, k)
+        usar(pai, k, col_pai)
+    usar("Reservas", *COLUNAS_ESTADIA)
+    return usadas
+
+class Validador:
+    """Roda as regras sobre a origem e acumula as violações (com `amostras` linhas de exemplo)."""
+    def __init__(self, origem, amostras=5, etapas=None):
+        self.origem, self.amostras, self.etapas = origem, amostras, etapas
+        self.restricoes = restricoes_ddl()
+        self.tabelas = [t for t in self.restricoes if _disponivel(origem, t)]
+        self.colunas = _colunas_usadas(self.restricoes, self.tabelas)
+        self.frames, self.indices = {}, {}
+        self.violacoes = []
+        self.verificadas = 0
+
+    def _medir(self, nome):
+        return self.etapas.medir(nome) if self.etapas else nullcontext({"linhas": 0, "bytes": 0})
+
+    def frame(self, tabela):
+        if tabela not in self.frames:
+            df = ler_tabela(self.origem, tabela)
+            self.frames[tabela] = df[[c for c in df.columns if c in self.colunas[tabela]]]
+        return self.frames[tabela]
+
+    def indice(self, tabela, coluna):
+        if (tabela, coluna) not in self.indices:
+            self.indices[tabela, coluna] = Indice(self.frame(tabela)[coluna].to_numpy())
+        return self.indices[tabela, coluna]
+
+    def _registrar(self, tabela, regra, linhas, total=None):
+        self.verificadas += 1
+        total = len(linhas) if total is None else total
+        if total:
+            amostra = self.frame(tabela).iloc[linhas[:self.amostras]]
+            self.violacoes.append(Violacao(tabela, regra, total, amostra))
+
+    def _tem(self, *tabelas_colunas):
+        return all(t in self.tabelas and c in self.colunas[t] for t, c in tabelas_colunas)
+
+    # ----- regras -----
+    def unicidade(self, tabela, colunas, regra):
+        total, linhas = duplicadas(chave(self.frame(tabela), colunas), max(self.amostras, 1))
+        self._registrar(tabela, regra, linhas, total)
+
+    def fk(self, tabela, coluna, ref, ref_col):
+        v = self.frame(tabela)[coluna]
+        pos = self.indice(ref, ref_col).posicoes(v.to_numpy())
+        self._registrar(tabela, f"FK {coluna} -> {ref}.{ref_col}", np.flatnonzero((pos < 0) & v.notna().to_numpy()))
+
+    def datas(self, tabela, a, b, estrito):
+        df = self.frame(tabela)
+        va, vb = df[a].to_numpy(), df[b].to_numpy()
+        ruins = (va >= vb) if estrito else (va > vb)
+        self._registrar(tabela, f"{a} {'<' if estrito else '<='} {b}", np.flatnonzero(ruins))
+
+    def contra_pai(self, tabela, coluna, k, pai, col_pai, igual):
+        df = self.frame(tabela)
+        pos = self.indice(pai, k).posicoes(df[k].to_numpy())
+        achou = pos >= 0
+        v = df[coluna].to_numpy()[achou]
+        p = self.frame(pai)[col_pai].to_numpy()[pos[achou]]
+        ruins = (v != p) if igual else (v < p)
+        regra = f"{coluna} {'=' if igual else '>='} {pai}.{col_pai} (por {k})"
+        self._registrar(tabela, regra, np.flatnonzero(achou)[ruins])
+
+    def estadias(self):
+        df = self.frame("Reservas")
+        noites = (df["DataCheckOut"].to_numpy() - df["DataCheckIn"].to_numpy()).astype("timedelta64[D]").astype(np.int64)
+        self._registrar("Reservas", "Noites = DataCheckOut - DataCheckIn",
+                        np.flatnonzero(noites != df["Noites"].to_numpy()))
+        conf = np.flatnonzero((df["Status"] == "Confirmada").to_numpy())
+        sobre = estadias_sobrepostas(df["QuartoID"].to_numpy()[conf], df["DataCheckIn"].to_numpy()[conf],
+                                     df["DataCheckOut"].to_numpy()[conf])
+        self._registrar("Reservas", "confirmadas sem sobreposição no mesmo quarto", conf[sobre])
+
+    def executar(self):
+        for t in self.tabelas:
+            with self._medir(f"validacao:{t}") as reg:
+                pk, fks = self.restricoes[t]
+                if pk:
+                    self.unicidade(t, pk, f"PK ({', '.join(pk)})")
+                for col, ref, ref_col in fks:
+                    if ref in self.tabelas:
+                        self.fk(t, col, ref, ref_col)
+                for tabela, cols in UNICAS:
+                    if tabela == t:
+                        self.unicidade(t, cols, f"única ({', '.join(cols)})")
+                for tabela, a, b, estrito in DATAS:
+                    if tabela == t and self._tem((t, a), (t, b)):
+                        self.datas(t, a, b, estrito)
+                for regras, igual in ((DATAS_PAI, False), (CONSISTENCIA, True)):
+                    for tabela, col, k, pai, col_pai in regras:
+                        if tabela == t and self._tem((t, col), (t, k), (pai, k), (pai, col_pai)):
+                            self.contra_pai(t, col, k, pai, col_pai, igual)
+                if t == "Reservas" and self._tem(*(("Reservas", c) for c in COLUNAS_ESTADIA)):
+                    self.estadias()
+                reg["linhas"] += len(self.frame(t))
+        return self.violacoes
+
+def validar(origem, amostras=5, etapas=None):
+    """Lista de Violacao (vazia se a saída passa em todas as regras)."""
+    return Validador(origem, amostras, etapas).executar()
+
+def relatorio(violacoes, amostras=True):
+    """Texto com uma linha por regra violada e, opcionalmente, as linhas de exemplo."""
+    if not violacoes:
+        return "Nenhuma violação."
+    out = []
+    for v in violacoes:
+        out.append(f"[{v.tabela}] {v.regra}: {v.linhas:,d} linhas")
+        if amostras:
+            out.append("    " + v.amostra.to_string().replace("\n", "\n    "))
+    return "\n".join(out)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Valida PKs, FKs e datas da saída do gerador.")
+    ap.add_argument("--origem", default=os.environ.get("AURORA_OUTPUT_DIR", "."), help="pasta de saída do gerador")
+    ap.add_argument("--amostras", type=int, default=5, help="linhas de exemplo por violação")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    v = Validador(args.origem, args.amostras)
+    v.executar()
+    print(relatorio(v.violacoes, args.amostras > 0))
+    print(f"{v.verificadas} regras em {len(v.tabelas)} tabelas, {len(v.violacoes)} violadas "
+          f"({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    return 1 if v.violacoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())